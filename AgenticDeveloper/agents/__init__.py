@@ -1,8 +1,13 @@
 from .base import BaseAgent, AgentConfig
 from .backtester import BacktesterAgent
+from .backtest_scheduler import BacktestScheduler, BacktestJob
+from .parameter_sweep import ParameterSweep
 
 __all__ = [
     'BaseAgent',
     'AgentConfig',
-    'BacktesterAgent'
+    'BacktesterAgent',
+    'BacktestScheduler',
+    'BacktestJob',
+    'ParameterSweep'
 ]
\ No newline at end of file
@@ -1,9 +1,18 @@
+import asyncio
+import hashlib
 import json
 import os
 import glob
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from .base import BaseAgent
+from AgenticDeveloper.tools.backtest_analytics import compute_analytics, format_analytics
+from AgenticDeveloper.tools.backtest_results import LOWER_IS_BETTER, format_table, load_statistics
+from AgenticDeveloper.tools.order_events import summarize_order_events
+
+ANALYSIS_FILE = "BacktestAnalyzerAgent_analysis.json"
+BATCH_SUMMARY_FILE = "BacktestAnalyzerAgent_batch_summary.json"
+DEFAULT_COMPARISON_METRICS = ["Sharpe Ratio", "Compounding Annual Return", "Drawdown", "Net Profit", "Win Rate", "Total Orders"]
 
 class BacktestAnalyzerAgent(BaseAgent):
     """Agent responsible for analyzing backtest results and providing improvement suggestions"""
@@ -11,13 +20,14 @@ class BacktestAnalyzerAgent(BaseAgent):
     def __init__(self, config_path: str = "../config/system_config.yaml", config: Optional[Dict] = None):
         super().__init__(config_path=config_path, config=config)
         
-    async def run(self, backtest_dir: str) -> Dict[str, Any]:
+    async def run(self, backtest_dir: str, input_hash: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyze results for a specific backtest
         
         Args:
             backtest_dir: Path to the specific backtest directory 
                          (e.g., "Strategies/SMAStrategy/backtests/2025-03-26_11-34-48")
+            input_hash: Precomputed input_hash(backtest_dir), computed here if not given
         
         Returns:
             Dictionary containing analysis results and suggestions
@@ -27,27 +37,181 @@ class BacktestAnalyzerAgent(BaseAgent):
         # Verify backtest directory exists
         if not os.path.exists(backtest_dir):
             raise ValueError(f"Backtest directory not found: {backtest_dir}")
+        if input_hash is None:
+            input_hash = await asyncio.to_thread(self.input_hash, backtest_dir)
             
-        # Load backtest results
-        results = self._load_backtest_results(backtest_dir)
+        # Load backtest results (off the event loop: order-event files can be large)
+        results = await asyncio.to_thread(self._load_backtest_results, backtest_dir)
         self.log_progress("Loaded backtest results, analyzing...")
         
         # Analyze results using LLM
         analysis = await self._analyze_results(results)
         
-        # Store analysis
+        # Store analysis (a fallback from an unparseable reply gets no input_hash, so batch runs retry it)
         analysis_output = {
             "timestamp": datetime.now().isoformat(),
             "backtest_path": backtest_dir,
+            "input_hash": None if self._is_fallback(analysis) else input_hash,
             "analysis": analysis
         }
         
-        output_file = os.path.join(backtest_dir, "BacktestAnalyzerAgent_analysis.json")
+        output_file = os.path.join(backtest_dir, ANALYSIS_FILE)
         with open(output_file, 'w') as f:
             json.dump(analysis_output, f, indent=2)
             
         self.log_progress(f"Analysis complete and stored in: {output_file}")
         return analysis_output
+
+    async def run_batch(self, strategy_dir: str, force: bool = False,
+                        max_concurrent: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Analyze every backtest of a strategy and compare them
+        
+        Args:
+            strategy_dir: Strategy project folder (or its backtests folder)
+            force: Re-analyze backtests whose stored analysis is up to date
+            max_concurrent: Analyses in flight at once (default: agents.backtest_analyzer.batch.max_concurrent,
+                            falling back to system.max_concurrent_agents)
+        
+        Returns:
+            The comparative summary, also stored in <backtests>/BacktestAnalyzerAgent_batch_summary.json
+        """
+        backtests_root = strategy_dir if os.path.basename(os.path.normpath(strategy_dir)) == "backtests" \
+            else os.path.join(strategy_dir, "backtests")
+        if not os.path.isdir(backtests_root):
+            raise ValueError(f"Backtests directory not found: {backtests_root}")
+        folders = sorted(
+            path for path in glob.glob(os.path.join(backtests_root, "*"))
+            if os.path.isdir(path) and os.path.exists(os.path.join(path, "results.json"))
+        )
+        if max_concurrent is None:
+            max_concurrent = self._batch_config().get(
+                "max_concurrent", self.config.get("system", {}).get("max_concurrent_agents", 1)
+            )
+        semaphore = asyncio.Semaphore(max(1, int(max_concurrent)))
+        self.log_progress(f"Batch analysis of {len(folders)} backtests in {backtests_root}")
+
+        async def analyze(folder: str) -> Dict[str, Any]:
+            entry = {"backtest_path": folder, "run_name": os.path.basename(folder)}
+            try:
+                input_hash = await asyncio.to_thread(self.input_hash, folder)
+                existing = None if force else self._load_analysis(folder)
+                if existing is not None and existing.get("input_hash") == input_hash \
+                        and not self._is_fallback(existing.get("analysis", {})):
+                    entry.update(status="up_to_date", analysis=existing.get("analysis", {}))
+                    return entry
+                # Only the analyses themselves (and their LLM calls) are bounded
+                async with semaphore:
+                    output = await self.run(folder, input_hash=input_hash)
+                entry.update(status="analyzed", analysis=output["analysis"])
+            except Exception as e:
+                self.log_progress(f"Analysis of {folder} failed: {e}", level="error")
+                entry.update(status="failed", error=str(e))
+            return entry
+
+        entries = await asyncio.gather(*(analyze(folder) for folder in folders))
+        summary = self._compare_backtests(backtests_root, list(entries))
+
+        output_file = os.path.join(backtests_root, BATCH_SUMMARY_FILE)
+        with open(output_file, 'w') as f:
+            json.dump(summary, f, indent=2)
+        self.log_progress(
+            f"Batch analysis complete ({summary['analyzed']} analyzed, {summary['up_to_date']} up to date, "
+            f"{len(summary['failed'])} failed), summary stored in: {output_file}"
+        )
+        return summary
+
+    def input_hash(self, backtest_dir: str) -> str:
+        """Hash of everything an analysis depends on: the result files, the strategy code and the analyzer settings"""
+        digest = hashlib.sha256()
+        analyzer_config = {
+            key: value for key, value in self.config.get("agents", {}).get("backtest_analyzer", {}).items()
+            if key != "batch"
+        }
+        digest.update(json.dumps(analyzer_config, sort_keys=True, default=str).encode("utf-8"))
+        paths = sorted(
+            path for path in glob.glob(os.path.join(backtest_dir, "*.json"))
+            if not os.path.basename(path).startswith("BacktestAnalyzerAgent_")
+        )
+        paths.append(os.path.join(backtest_dir, "code", "main.py"))
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            digest.update(os.path.relpath(path, backtest_dir).encode("utf-8"))
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+        return digest.hexdigest()
+
+    def _batch_config(self) -> Dict[str, Any]:
+        return self.config.get("agents", {}).get("backtest_analyzer", {}).get("batch", {})
+
+    @staticmethod
+    def _load_analysis(backtest_dir: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(backtest_dir, ANALYSIS_FILE), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _is_fallback(analysis: Dict[str, Any]) -> bool:
+        """Whether an analysis is _parse_llm_response's fallback for a reply that was not JSON"""
+        return any(isinstance(section, dict) and set(section) == {"error"} for section in analysis.values())
+
+    def _compare_backtests(self, backtests_root: str, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Rank the backtests by a metric and pick the best one per metric, alongside each run's assessment"""
+        batch_config = self._batch_config()
+        metrics = batch_config.get("metrics", DEFAULT_COMPARISON_METRICS)
+        rank_by = batch_config.get("rank_by", "Sharpe Ratio")
+
+        backtests = []
+        for entry in entries:
+            statistics = load_statistics(entry["backtest_path"])
+            analysis = entry.get("analysis") or {}
+            suggestions = analysis.get("improvement_suggestions", {})
+            backtests.append({
+                "run_name": entry["run_name"],
+                "backtest_path": entry["backtest_path"],
+                "status": entry["status"],
+                "metrics": {metric: statistics.get(metric) for metric in metrics},
+                "overall_assessment": analysis.get("strategy_analysis", {}).get("overall_assessment"),
+                "suggestions": sum(len(items) for items in suggestions.values() if isinstance(items, list)),
+                **({"error": entry["error"]} if "error" in entry else {}),
+            })
+
+        def numeric(backtest: Dict[str, Any], metric: str) -> Optional[float]:
+            value = backtest["metrics"].get(metric)
+            return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+        def rank_value(backtest: Dict[str, Any]) -> float:
+            value = numeric(backtest, rank_by)
+            if value is None:
+                return float("-inf")
+            return -value if rank_by in LOWER_IS_BETTER else value
+
+        backtests.sort(key=rank_value, reverse=True)
+        best = {}
+        for metric in metrics:
+            candidates = [b for b in backtests if numeric(b, metric) is not None]
+            if candidates:
+                pick = min if metric in LOWER_IS_BETTER else max
+                winner = pick(candidates, key=lambda b: numeric(b, metric))
+                best[metric] = {"run_name": winner["run_name"], "value": numeric(winner, metric)}
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "backtests_path": backtests_root,
+            "rank_by": rank_by,
+            "analyzed": sum(1 for e in entries if e["status"] == "analyzed"),
+            "up_to_date": sum(1 for e in entries if e["status"] == "up_to_date"),
+            "failed": [e["run_name"] for e in entries if e["status"] == "failed"],
+            "best": best,
+            "backtests": backtests,
+            "table": format_table(
+                [{"run_name": b["run_name"], **b["metrics"]} for b in backtests], ["run_name"] + metrics
+            ),
+        }
         
     def _load_backtest_results(self, backtest_dir: str) -> Dict[str, Any]:
         """Load all relevant backtest data for analysis"""
@@ -73,12 +237,18 @@ class BacktestAnalyzerAgent(BaseAgent):
                 self.log_progress(f"Warning: Summary file not found: {summary_path}", level="warning")
                 
             try:
-                with open(orders_path, 'r') as f:
-                    results["orders"] = json.load(f)
-                    self.log_progress("Loaded order events data")
+                # Streamed: the events themselves are not kept, only per-trade aggregates
+                results["order_summary"] = summarize_order_events(orders_path, include_trades=True)
+                self.log_progress("Summarized order events data")
             except FileNotFoundError:
                 self.log_progress(f"Warning: Order events file not found: {orders_path}", level="warning")
                 
+        # Trade and series analytics for the prompt; the closed-trade records are only needed here
+        order_summary = results.get("order_summary", {})
+        results["analytics"] = compute_analytics(
+            backtest_dir, order_summary=order_summary, trades=order_summary.pop("closed_trades", None)
+        )
+
         # Load strategy code from code directory
         code_path = os.path.join(backtest_dir, "code", "main.py")
         try:
@@ -97,7 +267,8 @@ class BacktestAnalyzerAgent(BaseAgent):
         
         try:
             # Get LLM analysis
-            response = await self.llm.ainvoke(prompt)
+            # An unparseable reply is not cached, so re-analyzing asks the model again
+            response = await self.llm.ainvoke(prompt, validate=self._is_parseable)
             self.log_progress("Received LLM response, parsing JSON...")
             
             # Parse JSON from response
@@ -111,6 +282,14 @@ class BacktestAnalyzerAgent(BaseAgent):
     def _create_analysis_prompt(self, results: Dict[str, Any]) -> str:
         """Create a detailed prompt for the LLM to analyze backtest results"""
         metrics = results["metrics"]
+        analyzer_config = self.config.get("agents", {}).get("backtest_analyzer", {})
+        analytics = format_analytics(
+            results.get("analytics") or {}, max_tokens=analyzer_config.get("analytics_max_tokens", 600)
+        )
+        analytics_section = (
+            f"\nDetailed analytics (use these for the trade, drawdown and execution assessments):\n{analytics}\n"
+            if analytics else ""
+        )
         
         prompt = f"""As a quantitative trading expert, analyze these backtest results and return your analysis in JSON format.
 
@@ -158,22 +337,30 @@ Analyze these metrics:
 - Trading: {metrics['Win Rate']}% win rate, {metrics['Loss Rate']}% loss rate, {metrics['Total Orders']} trades
 - Market: Alpha {metrics['Alpha']}, Beta {metrics['Beta']}, Information Ratio {metrics['Information Ratio']}
 - Risk metrics: Std Dev {metrics['Annual Standard Deviation']}, Tracking Error {metrics['Tracking Error']}, Treynor {metrics['Treynor Ratio']}, Turnover {metrics['Portfolio Turnover']}%
-
+{analytics_section}
 Provide detailed, quantitative analysis in your JSON response. Ensure all suggestions are specific and actionable."""
         return prompt
         
+    @staticmethod
+    def _extract_json(response: str) -> Any:
+        """The JSON object in an LLM response, ignoring any preamble or thinking around it"""
+        start_idx = response.find('{')
+        if start_idx != -1:
+            response = response[start_idx:]
+            end_idx = response.rfind('}') + 1
+            response = response[:end_idx]
+        return json.loads(response)
+
+    def _is_parseable(self, response: str) -> bool:
+        try:
+            return isinstance(self._extract_json(response), dict)
+        except ValueError:
+            return False
+
     def _parse_llm_response(self, response: str) -> Dict[str, Any]:
         """Parse the LLM's response into structured format"""
         try:
-            # Find JSON content (remove any preamble or thinking)
-            start_idx = response.find('{')
-            if start_idx != -1:
-                response = response[start_idx:]
-                end_idx = response.rfind('}') + 1
-                response = response[:end_idx]
-                
-            # Parse JSON
-            analysis = json.loads(response)
+            analysis = self._extract_json(response)
             
             # Log structure for debugging
             self.log_progress(f"Successfully parsed JSON with keys: {list(analysis.keys())}")
@@ -0,0 +1,209 @@
+import asyncio
+import glob
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .backtester import BacktesterAgent
+from AgenticDeveloper.tools.backtest_dedup import BacktestResultCache, get_backtest_result_cache, strategy_fingerprint
+
+
+class BacktestJob:
+    """A submitted backtest. Await the job (or ``job.task``) for the BacktesterAgent result dict."""
+
+    def __init__(self, job_id: str, strategy_path: str, output_dir: str, task: asyncio.Task):
+        self.job_id = job_id
+        self.strategy_path = strategy_path
+        self.output_dir = output_dir
+        self.task = task
+
+    @property
+    def done(self) -> bool:
+        return self.task.done()
+
+    def cancel(self) -> bool:
+        return self.task.cancel()
+
+    def __await__(self):
+        return self.task.__await__()
+
+
+class BacktestScheduler:
+    """
+    Runs many Lean backtests concurrently through a shared BacktesterAgent.
+
+    At most ``max_concurrent`` backtests run at once (default: tools.lean_cli.max_concurrent_backtests,
+    falling back to system.max_concurrent_agents, capped at the CPU count); further submissions wait
+    their turn. Every job writes to its own output folder so concurrent runs of the same project
+    never share results, and a strategy file other than main.py (e.g. strategy_v1_0_1.py) is run
+    from its own temporary copy of the project with that file as main.py. Cancelling a job that is
+    already running stops its Lean process.
+
+    With a result cache (tools.lean_cli.reuse_results), a job whose code is semantically identical
+    to an earlier successful backtest (same normalized code, project config and mode, see
+    tools.backtest_dedup) returns that backtest's result, marked 'cached', instead of running Lean;
+    identical jobs submitted together run once, and share the result even if it failed.
+    """
+
+    def __init__(self, backtester: Optional[BacktesterAgent] = None, max_concurrent: Optional[int] = None,
+                 result_cache: Optional[BacktestResultCache] = None):
+        self.backtester = backtester or BacktesterAgent()
+        lean_config = self.backtester.config.get("tools", {}).get("lean_cli", {})
+        if max_concurrent is None:
+            max_concurrent = lean_config.get(
+                "max_concurrent_backtests", self.backtester.config.get("system", {}).get("max_concurrent_agents", 1)
+            )
+        self.max_concurrent = max(1, min(int(max_concurrent), os.cpu_count() or 1))
+        if result_cache is None and lean_config.get("reuse_results", False):
+            result_cache = get_backtest_result_cache(lean_config)
+        self.result_cache = result_cache
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight: Dict[str, Tuple[asyncio.Task, str]] = {}
+        self.jobs: Dict[str, BacktestJob] = {}
+
+    def submit(self, strategy_path: str, mode: str = "local", output_dir: Optional[str] = None,
+               code: Optional[str] = None, project_config: Optional[Dict] = None, **run_kwargs: Any) -> BacktestJob:
+        """
+        Queue a backtest and return its job immediately (must be called from a running event loop).
+        If code or project_config is given, the job runs on a copy of the project using that
+        code as main.py and/or with project_config merged into its config.json.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        job_id = uuid.uuid4().hex[:8]
+        if output_dir is None:
+            output_dir = self._default_output_dir(strategy_path, job_id)
+        task = asyncio.get_running_loop().create_task(
+            self._run_job(strategy_path, job_id, mode, output_dir, run_kwargs, code, project_config)
+        )
+        job = BacktestJob(job_id, strategy_path, output_dir, task)
+        self.jobs[job_id] = job
+        return job
+
+    async def _run_job(self, strategy_path: str, job_id: str, mode: str, output_dir: str, run_kwargs: Dict,
+                       code: Optional[str] = None, project_config: Optional[Dict] = None) -> Dict:
+        if self.result_cache is None or mode == "smoke":
+            return await self._run_backtest(strategy_path, job_id, mode, output_dir, run_kwargs, code, project_config)
+
+        fingerprint = self.fingerprint(strategy_path, mode, code, project_config)
+        while True:
+            cached = self.result_cache.get(fingerprint)
+            if cached is not None:
+                return {**cached["result"], "cached": True, "reused_from": cached["strategy_path"]}
+            if fingerprint not in self._in_flight:
+                break
+            # An identical job is running: wait for it (without taking a slot) and reuse its result
+            leader, leader_path = self._in_flight[fingerprint]
+            await asyncio.wait({leader})
+            if not leader.cancelled() and leader.exception() is None:
+                result = leader.result()
+                if not result.get("backtest_successful"):
+                    # The same code and config fail the same way: share the failure rather than rerun it
+                    return {**result, "reused_from": leader_path}
+            # Otherwise the leader was cancelled or raised: check again, the first waiter to get here runs it
+
+        self._in_flight[fingerprint] = (asyncio.current_task(), strategy_path)
+        try:
+            result = await self._run_backtest(strategy_path, job_id, mode, output_dir, run_kwargs, code, project_config)
+        finally:
+            if self._in_flight.get(fingerprint, (None,))[0] is asyncio.current_task():
+                del self._in_flight[fingerprint]
+        if result.get("backtest_successful") and not result.get("timed_out"):
+            self.result_cache.put(fingerprint, strategy_path, result)
+        return result
+
+    def fingerprint(self, strategy_path: str, mode: str = "local", code: Optional[str] = None,
+                    project_config: Optional[Dict] = None) -> str:
+        """strategy_fingerprint of what a job would run: its code and the project config.json it would use"""
+        strategy_file = strategy_path if os.path.isfile(strategy_path) else os.path.join(strategy_path, "main.py")
+        if code is None:
+            with open(strategy_file, "r") as f:
+                code = f.read()
+        return strategy_fingerprint(code, self.project_config(strategy_file, project_config), mode)
+
+    async def _run_backtest(self, strategy_path: str, job_id: str, mode: str, output_dir: str, run_kwargs: Dict,
+                            code: Optional[str] = None, project_config: Optional[Dict] = None) -> Dict:
+        async with self._semaphore:
+            workspace = None
+            if code is not None or project_config is not None:
+                strategy_file = strategy_path if os.path.isfile(strategy_path) else os.path.join(strategy_path, "main.py")
+                workspace = self.materialize_project(strategy_file, job_id, code=code, config=project_config)
+            elif os.path.isfile(strategy_path) and os.path.basename(strategy_path) != "main.py":
+                workspace = self.materialize_project(strategy_path, job_id)
+            try:
+                return await self.backtester.run(workspace or strategy_path, mode=mode, output_dir=output_dir, **run_kwargs)
+            finally:
+                if workspace:
+                    shutil.rmtree(workspace, ignore_errors=True)
+
+    @staticmethod
+    def materialize_project(strategy_file: str, job_id: str, code: Optional[str] = None,
+                            config: Optional[Dict] = None) -> str:
+        """
+        Create an isolated Lean project for one job under <project>/.jobs/<job_id>, using
+        strategy_file (or the given code) as main.py and the project's config.json
+        (with config merged over it). Returns the new project directory.
+        """
+        project_dir = os.path.dirname(os.path.abspath(strategy_file))
+        workspace = os.path.join(project_dir, ".jobs", job_id)
+        os.makedirs(workspace, exist_ok=True)
+        project_config = BacktestScheduler.project_config(strategy_file, config)
+        # Copied ids would make Lean treat the copy as the original project
+        project_config.pop("cloud-id", None)
+        project_config.pop("local-id", None)
+        with open(os.path.join(workspace, "config.json"), "w") as f:
+            json.dump(project_config, f, indent=4)
+        if code is None:
+            shutil.copyfile(strategy_file, os.path.join(workspace, "main.py"))
+        else:
+            with open(os.path.join(workspace, "main.py"), "w") as f:
+                f.write(code)
+        return workspace
+
+    @staticmethod
+    def project_config(strategy_file: str, config: Optional[Dict] = None) -> Dict:
+        """The project's config.json with config merged over it"""
+        project_config = {}
+        config_path = os.path.join(os.path.dirname(os.path.abspath(strategy_file)), "config.json")
+        if os.path.exists(config_path):
+            with open(config_path, "r") as f:
+                project_config = json.load(f)
+        for key, value in (config or {}).items():
+            if isinstance(value, dict) and isinstance(project_config.get(key), dict):
+                # e.g. "parameters": only the given parameters are overridden
+                project_config[key] = {**project_config[key], **value}
+            else:
+                project_config[key] = value
+        return project_config
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        return job.cancel() if job else False
+
+    def cancel_all(self) -> None:
+        for job in self.jobs.values():
+            job.cancel()
+
+    async def gather(self, jobs: Optional[List[BacktestJob]] = None) -> List[Any]:
+        """Wait for jobs (default: all submitted). Cancelled or failed jobs yield their exception."""
+        jobs = list(self.jobs.values()) if jobs is None else jobs
+        return await asyncio.gather(*(job.task for job in jobs), return_exceptions=True)
+
+    async def run_many(self, strategy_paths: List[str], mode: str = "local", **run_kwargs: Any) -> Dict[str, Any]:
+        """Backtest every path concurrently and return {strategy_path: result}"""
+        jobs = [self.submit(path, mode=mode, **run_kwargs) for path in strategy_paths]
+        results = await self.gather(jobs)
+        return {job.strategy_path: result for job, result in zip(jobs, results)}
+
+    async def run_versions(self, strategy_dir: str, pattern: str = "strategy_v*.py", **run_kwargs: Any) -> Dict[str, Any]:
+        """Backtest every strategy version file in a strategy folder concurrently"""
+        return await self.run_many(sorted(glob.glob(os.path.join(strategy_dir, pattern))), **run_kwargs)
+
+    @staticmethod
+    def _default_output_dir(strategy_path: str, job_id: str) -> str:
+        project_dir = strategy_path if os.path.isdir(strategy_path) else os.path.dirname(strategy_path)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        return os.path.join(project_dir, "backtests", f"{timestamp}_{job_id}")
@@ -1,26 +1,50 @@
 import asyncio
+import io
+import json
 import os
 import re
+import shutil
+import signal
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from .base import BaseAgent
+from AgenticDeveloper.tools.lean_log_parser import ErrorBlockParser, follow_file, parse_file
+from AgenticDeveloper.tools.market_data import get_market_data_cache
+from AgenticDeveloper.tools.smoke_backtest import SmokeBacktester
+
+OUTPUT_FOLDER_PATTERN = r"output is stored in\s*'([^']+)'"
+# Max bytes buffered for a single line of Lean CLI output
+STREAM_LIMIT = 1024 * 1024
+# Output that means the algorithm cannot run, used when fail-fast is enabled
+DEFAULT_FATAL_PATTERNS = [r"SyntaxError", r"IndentationError", r"Traceback \(most recent call last\)", r"Runtime Error"]
 
 class BacktesterAgent(BaseAgent):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, config_path: Optional[str] = None, config: Optional[Dict] = None):
+        super().__init__(config_path, config)
 
-    async def run(self, strategy_path: str, mode: str = "local") -> Dict:
+    async def run(self, strategy_path: str, mode: str = "local", fail_fast: Optional[bool] = None,
+                  output_dir: Optional[str] = None) -> Dict:
         """
         Run a backtest for the given strategy.
-        mode: 'local', 'cloud', or 'random_data'
-        Returns: dict with 'folder_path', 'backtest_successful', and 'errors'
+        mode: 'local', 'cloud', 'random_data' or 'smoke' (quick check against synthetic data in a child process, see _run_smoke)
+        fail_fast: stop Lean as soon as a fatal error is seen (defaults to tools.lean_cli.fail_fast)
+        output_dir: directory Lean writes results to (defaults to Lean's timestamped backtests folder)
+        The run is killed after tools.lean_cli.timeout seconds.
+        Returns: dict with 'folder_path', 'backtest_successful', 'errors', 'aborted' and 'timed_out'
         """
         self.log_progress(f"Starting backtest for {strategy_path} in mode: {mode}")
+        if mode == "smoke":
+            return await self._run_smoke(strategy_path)
+        lean_config = self.config.get("tools", {}).get("lean_cli", {})
+        if fail_fast is None:
+            fail_fast = lean_config.get("fail_fast", True)
 
         # Build command
         if mode == "local":
             command = f"lean backtest '{strategy_path}'"
+            if output_dir:
+                command += f" --output '{output_dir}'"
         elif mode == "cloud":
             raise NotImplementedError("Cloud backtesting is not implemented yet.")
         elif mode == "random_data":
@@ -30,33 +54,36 @@ class BacktesterAgent(BaseAgent):
 
         self.log_progress(f"Running command: {command}")
 
-        # Run command
+        # Run command in its own process group so the whole Lean process tree can be stopped
         process = await asyncio.create_subprocess_shell(
             command,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
-            cwd="."
+            cwd=".",
+            limit=STREAM_LIMIT,
+            start_new_session=True
         )
-        stdout, stderr = await process.communicate()
-        stdout_str = stdout.decode() if stdout else ""
-        stderr_str = stderr.decode() if stderr else ""
-
-        self.log_progress(f"CLI stdout:\n{stdout_str}")
-        self.log_progress(f"CLI stderr:\n{stderr_str}")
-
-        # Parse output directory from CLI output or error output
-        folder_path = None
-        pattern = r"output is stored in\s*'([^']+)'"
-        for output in (stdout_str, stderr_str):
-            match = re.search(pattern, output, re.DOTALL | re.IGNORECASE)
-            if match:
-                folder_path = match.group(1)
-                break
+        outcome = await self._stream_backtest(
+            process,
+            timeout=lean_config.get("timeout"),
+            fatal_patterns=lean_config.get("fatal_error_patterns", DEFAULT_FATAL_PATTERNS) if fail_fast else None,
+            grace_period=float(lean_config.get("fail_fast_grace_period", 2)),
+            output_dir=output_dir
+        )
+        folder_path = outcome["folder_path"]
  
         errors = []
         backtest_successful = False
-        if folder_path and os.path.exists(folder_path):
-            backtest_successful, errors = self.backtest_success_check(folder_path=folder_path, console_output=stdout_str)
+        if outcome["aborted"] or outcome["timed_out"]:
+            errors = outcome["console_errors"] + (outcome["log_errors"] or [])
+            if outcome["timed_out"]:
+                errors.append(f"Backtest timed out after {lean_config.get('timeout')} seconds")
+            elif not errors:
+                errors = ["Backtest aborted after a fatal error"]
+        elif folder_path and os.path.exists(folder_path):
+            backtest_successful, errors = self.backtest_success_check(
+                folder_path=folder_path, console_errors=outcome["console_errors"], log_errors=outcome["log_errors"]
+            )
         else:
             backtest_successful = False
             errors = ["Backtest output folder not found"]
@@ -64,16 +91,208 @@ class BacktesterAgent(BaseAgent):
         return {
             "folder_path": folder_path,
             "backtest_successful": backtest_successful,
-            "errors": errors
+            "errors": errors,
+            "aborted": outcome["aborted"],
+            "timed_out": outcome["timed_out"]
+        }
+
+    async def _run_smoke(self, strategy_path: str) -> Dict:
+        """
+        Run the strategy in a child process against stubbed QCAlgorithm APIs and synthetic bars
+        (tools.smoke_backtest). Catches syntax and runtime errors in seconds without Lean;
+        it says nothing about performance. The result has the same keys as a Lean run
+        ('folder_path' is None) plus 'warnings' and 'stats'.
+        """
+        tools_config = self.config.get("tools", {})
+        smoke_config = tools_config.get("smoke_backtest", {})
+        if os.path.isdir(strategy_path):
+            strategy_path = os.path.join(strategy_path, "main.py")
+        # Project parameters from config.json, as Lean would pass them to GetParameter
+        parameters = {}
+        project_config_path = os.path.join(os.path.dirname(strategy_path), "config.json")
+        if os.path.exists(project_config_path):
+            with open(project_config_path, "r") as f:
+                parameters = json.load(f).get("parameters", {})
+        market_data = None
+        if smoke_config.get("use_market_data", True):
+            market_data = get_market_data_cache(tools_config.get("market_data", {}))
+        tester = SmokeBacktester(
+            bars=smoke_config.get("bars", 300),
+            history_bars=smoke_config.get("history_bars", 300),
+            seed=smoke_config.get("seed", 0),
+            market_data=market_data
+        )
+        timeout = smoke_config.get("timeout", 30)
+        # A child process, killed on timeout: a thread running an endless loop could not be stopped
+        outcome = await asyncio.to_thread(tester.run_isolated, strategy_path, parameters, timeout)
+
+        for error in outcome["errors"]:
+            self.log_progress(f"Smoke test error:\n{error}", level="warning")
+        return {
+            "folder_path": None,
+            "backtest_successful": outcome["success"],
+            "errors": outcome["errors"],
+            "aborted": False,
+            "timed_out": outcome["timed_out"],
+            "warnings": outcome["warnings"],
+            "stats": outcome["stats"]
+        }
+
+    async def _stream_backtest(self, process: asyncio.subprocess.Process, timeout: Optional[float] = None,
+                               fatal_patterns: Optional[List[str]] = None, grace_period: float = 2,
+                               output_dir: Optional[str] = None) -> Dict:
+        """
+        Consume the Lean CLI output line by line while the backtest runs.
+        Console errors are parsed from stdout as it arrives, and once the output folder
+        is announced (or straight away if output_dir is given) its log.txt is tailed and
+        parsed as Lean writes it.
+
+        If fatal_patterns is given, the first output or log line matching one of them
+        aborts the run: Lean gets grace_period seconds to finish printing the error and
+        is then terminated. The process is also terminated after timeout seconds.
+
+        Returns a dict with 'folder_path', 'console_errors', 'log_errors' (None if the
+        log was never followed), 'aborted' and 'timed_out'.
+        """
+        fatal = re.compile("|".join(fatal_patterns), re.IGNORECASE) if fatal_patterns else None
+        abort = asyncio.Event()
+
+        def check_fatal(text: str):
+            if fatal is not None and not abort.is_set() and fatal.search(text):
+                self.log_progress(f"Fatal error detected, aborting backtest: {text.strip()}", level="warning")
+                abort.set()
+
+        def on_log_error(block: str):
+            self.log_progress(f"Error in backtest log:\n{block}", level="warning")
+            check_fatal(block)
+
+        console_parser = ErrorBlockParser(
+            mode="console",
+            on_error=lambda block: self.log_progress(f"Error in Lean output:\n{block}", level="warning")
+        )
+        log_parser = ErrorBlockParser(mode="log", on_error=on_log_error)
+        stop_following = asyncio.Event()
+        state = {"folder_path": None, "follower": None}
+
+        def follow(folder_path: str):
+            state["folder_path"] = folder_path
+            state["follower"] = asyncio.create_task(follow_file(
+                os.path.join(folder_path, "log.txt"), log_parser, stop_following
+            ))
+
+        if output_dir:
+            follow(output_dir)
+
+        async def pump(stream: asyncio.StreamReader, name: str, parser: Optional[ErrorBlockParser]):
+            previous = ""
+            async for raw in stream:
+                line = raw.decode(errors="replace")
+                self.log_progress(f"CLI {name}: {line.rstrip()}")
+                if parser is not None:
+                    parser.feed_line(line)
+                check_fatal(line)
+                if state["folder_path"] is None:
+                    # The path may be printed on the line after the announcement
+                    match = re.search(OUTPUT_FOLDER_PATTERN, previous + line, re.DOTALL | re.IGNORECASE)
+                    if match:
+                        follow(match.group(1))
+                previous = line
+
+        pumps = asyncio.gather(
+            pump(process.stdout, "stdout", console_parser),
+            pump(process.stderr, "stderr", None)
+        )
+        exited = asyncio.create_task(process.wait())
+        aborted = asyncio.create_task(abort.wait())
+        timed_out = False
+        try:
+            done, _ = await asyncio.wait({exited, aborted}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if exited not in done:
+                if aborted in done:
+                    # Let Lean finish writing the traceback before stopping it
+                    done, _ = await asyncio.wait({exited}, timeout=grace_period)
+                else:
+                    timed_out = True
+                    self.log_progress(f"Backtest exceeded timeout of {timeout} seconds, stopping Lean", level="warning")
+                if exited not in done:
+                    await self._terminate(process, output_dir=state["folder_path"])
+            await pumps
+        except asyncio.CancelledError:
+            # Don't leave Lean running when the backtest is cancelled
+            await self._terminate(process, output_dir=state["folder_path"])
+            pumps.cancel()
+            exited.cancel()
+            raise
+        finally:
+            aborted.cancel()
+            stop_following.set()
+            if state["follower"] is not None:
+                await state["follower"]
+
+        log_errors = None
+        if state["follower"] is not None and os.path.exists(os.path.join(state["folder_path"], "log.txt")):
+            log_errors = log_parser.errors
+        return {
+            "folder_path": state["folder_path"],
+            "console_errors": console_parser.close(),
+            "log_errors": log_errors,
+            "aborted": abort.is_set(),
+            "timed_out": timed_out
         }
 
-    def backtest_success_check(self, folder_path: str, console_output: str = "") -> (bool, list):
+    async def _terminate(self, process: asyncio.subprocess.Process, kill_after: float = 10,
+                         output_dir: Optional[str] = None):
+        """
+        Stop the backtest's process group. SIGINT comes first because the Lean CLI handles it by
+        killing its Docker container, which SIGTERM/SIGKILL would leave running; it escalates to
+        SIGTERM and then SIGKILL if the CLI does not exit. Any container still mounting
+        output_dir is then stopped with docker.
+        """
+        for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(process.pid, sig)
+            except ProcessLookupError:
+                break
+            try:
+                await asyncio.wait_for(process.wait(), kill_after)
+                break
+            except asyncio.TimeoutError:
+                continue
+        if output_dir:
+            await self._stop_containers(output_dir)
+
+    async def _stop_containers(self, output_dir: str, timeout: float = 60):
+        """Best effort: docker stop the running containers that bind-mount output_dir (Lean's /Results)"""
+        if shutil.which("docker") is None:
+            return
+        try:
+            ps = await asyncio.create_subprocess_exec(
+                "docker", "ps", "-q", "--filter", f"volume={os.path.realpath(output_dir)}",
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+            )
+            stdout, _ = await asyncio.wait_for(ps.communicate(), timeout)
+            container_ids = stdout.decode().split()
+            if not container_ids:
+                return
+            self.log_progress(f"Stopping Lean container(s) {', '.join(container_ids)}", level="warning")
+            stop = await asyncio.create_subprocess_exec(
+                "docker", "stop", *container_ids, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+            )
+            await asyncio.wait_for(stop.wait(), timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            self.log_progress(f"Could not stop the Lean container for {output_dir}: {e}", level="warning")
+
+    def backtest_success_check(self, folder_path: str, console_output: str = "",
+                               console_errors: Optional[List[str]] = None,
+                               log_errors: Optional[List[str]] = None) -> (bool, list):
         """
         Checks if the backtest was successful by analyzing console output, failed data requests, and log errors.
+        Errors already parsed while streaming can be passed in via console_errors/log_errors.
         Returns (success: bool, errors: list)
         """
         # First, check console output for errors
-        console_errors = self.check_errors_in_console_output(console_output)
+        if console_errors is None:
+            console_errors = self.check_errors_in_console_output(console_output)
         if console_errors:
             return False, console_errors
 
@@ -82,9 +301,11 @@ class BacktesterAgent(BaseAgent):
         # Only if console output is clean, check other error sources
         errors += self.check_for_failed_data_requests(folder_path)
 
-        print(f"Checking backtest logs for errors in {folder_path}")
-        errors += self.check_backtest_logs_for_errors(folder_path)
-        print(f"Finished Checking backtest logs for errors in {folder_path}")
+        if log_errors is None:
+            print(f"Checking backtest logs for errors in {folder_path}")
+            log_errors = self.check_backtest_logs_for_errors(folder_path)
+            print(f"Finished Checking backtest logs for errors in {folder_path}")
+        errors += log_errors
 
         success = len(errors) == 0
         return success, errors
@@ -94,54 +315,22 @@ class BacktesterAgent(BaseAgent):
         Parse the Lean CLI console output and extract error messages.
         Returns a list of errors (empty if none).
         """
-        errors = []
-        lines = console_output.splitlines()
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            if ("error" in line.lower()) or ("syntaxerror" in line.lower()) or ("traceback" in line.lower()):
-                error_block = [line.rstrip()]
-                i += 1
-                # Capture indented traceback/code lines
-                while i < len(lines) and (lines[i].startswith(" ") or lines[i].startswith("\t") or lines[i].startswith("***") or lines[i].strip() == ""):
-                    error_block.append(lines[i].rstrip())
-                    i += 1
-                errors.append("\n".join(error_block))
-            else:
-                i += 1
-        return errors
+        parser = ErrorBlockParser(mode="console")
+        parser.feed_lines(io.StringIO(console_output))
+        return parser.close()
 
 
     def check_backtest_logs_for_errors(self, folder_path: str) -> list:
         """
         Parse the backtest log.txt and extract multi-line error blocks.
+        The file is streamed line by line rather than read into memory.
         Returns a list of errors (empty if none).
         """
-        import os
-
         log_path = os.path.join(folder_path, "log.txt")
         if not os.path.exists(log_path):
             return ["log.txt not found"]
 
-        errors = []
-        with open(log_path, "r") as f:
-            lines = f.readlines()
-
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            if "ERROR" in line.upper():
-                error_block = [line.rstrip()]
-                i += 1
-                # Capture indented traceback lines
-                while i < len(lines) and (lines[i].startswith(" ") or lines[i].startswith("\t")):
-                    error_block.append(lines[i].rstrip())
-                    i += 1
-                errors.append("\n".join(error_block))
-            else:
-                i += 1
-
-        return errors
+        return parse_file(log_path, mode="log")
 
 
     def check_for_failed_data_requests(self, folder_path: str) -> list:
@@ -9,29 +9,55 @@ from langchain_ollama import OllamaLLM
 from langchain_openai import OpenAI
 from pydantic import BaseModel, Field
 from openai import OpenAI as OpenAIClient
-import concurrent.futures
+from openai import AsyncOpenAI as AsyncOpenAIClient
+import httpx
+from .llm_cache import CachedLLM, get_response_cache
 import asyncio
+import copy
+import json
+import threading
+import weakref
 from dotenv import load_dotenv
 load_dotenv()
 
 
 class OpenRouterLLMWrapper:
-    def __init__(self, api_key: str, model: str, temperature: float = 0.7, max_tokens: int = 4000, timeout: int = 60):
+    """Thin wrapper around the OpenAI SDK pointed at OpenRouter.
+
+    ``invoke`` uses a blocking client. ``ainvoke`` uses an ``AsyncOpenAI`` client
+    backed by a pooled ``httpx.AsyncClient`` that is shared by every wrapper on the
+    same event loop, so many agent calls can be in flight without tying up threads.
+    Set ``async_native=False`` to fall back to running the blocking client in the
+    default executor.
+    """
+
+    BASE_URL = "https://openrouter.ai/api/v1"
+    EXTRA_HEADERS = {
+        "HTTP-Referer": "https://your-site-url.com",
+        "X-Title": "Your Site Name",
+    }
+
+    # One pooled async client per (event loop, api key, pool settings)
+    _async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, AsyncOpenAIClient]]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, api_key: str, model: str, temperature: float = 0.7, max_tokens: int = 4000, timeout: int = 60,
+                 async_native: bool = True, pool: Optional[Dict] = None):
+        self.api_key = api_key
         self.client = OpenAIClient(
-            base_url="https://openrouter.ai/api/v1",
+            base_url=self.BASE_URL,
             api_key=api_key,
+            timeout=timeout,
         )
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.timeout = timeout
+        self.async_native = async_native
+        self.pool = pool or {}
 
-    def invoke(self, prompt: str) -> str:
-        response = self.client.chat.completions.create(
-            extra_headers={
-                "HTTP-Referer": "https://your-site-url.com",
-                "X-Title": "Your Site Name",
-            },
+    def _request_kwargs(self, prompt: str) -> Dict[str, Any]:
+        return dict(
+            extra_headers=self.EXTRA_HEADERS,
             extra_body={},
             model=self.model,
             temperature=self.temperature,
@@ -40,26 +66,65 @@ class OpenRouterLLMWrapper:
                 {"role": "user", "content": prompt}
             ]
         )
+
+    def invoke(self, prompt: str) -> str:
+        response = self.client.chat.completions.create(**self._request_kwargs(prompt))
         return response.choices[0].message.content
 
-    async def ainvoke(self, prompt: str) -> str:
-        loop = asyncio.get_event_loop()
-        def sync_call():
-            response = self.client.chat.completions.create(
-                extra_headers={
-                    "HTTP-Referer": "https://your-site-url.com",
-                    "X-Title": "Your Site Name",
-                },
-                extra_body={},
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+    def _get_async_client(self) -> AsyncOpenAIClient:
+        """Return the pooled async client for the running event loop, creating it on first use.
+
+        httpx connection pools are bound to the loop they were created on, so each loop
+        (e.g. every ``asyncio.run``) gets its own pool.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self.pool
+        key = (
+            self.api_key,
+            int(pool.get("max_connections", 100)),
+            int(pool.get("max_keepalive_connections", 20)),
+            float(pool.get("keepalive_expiry", 30)),
+            float(pool.get("connect_timeout", 10)),
+            float(self.timeout),
+        )
+        clients = self._async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=key[1],
+                    max_keepalive_connections=key[2],
+                    keepalive_expiry=key[3],
+                ),
+                timeout=httpx.Timeout(key[5], connect=key[4]),
+            )
+            client = AsyncOpenAIClient(
+                base_url=self.BASE_URL,
+                api_key=self.api_key,
+                timeout=self.timeout,
+                http_client=http_client,
             )
-            return response.choices[0].message.content
-        return await loop.run_in_executor(None, sync_call)
+            clients[key] = client
+        return client
+
+    async def ainvoke(self, prompt: str) -> str:
+        if not self.async_native:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.invoke, prompt)
+
+        client = self._get_async_client()
+        response = await client.chat.completions.create(
+            timeout=self.timeout,
+            **self._request_kwargs(prompt)
+        )
+        return response.choices[0].message.content
+
+    @classmethod
+    async def aclose_pool(cls) -> None:
+        """Close the pooled async clients belonging to the running event loop"""
+        clients = cls._async_clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            await client.close()
 
 
 # Configure logging
@@ -74,48 +139,137 @@ class AgentConfig(BaseModel):
     tools: List[str] = Field(default_factory=list, description="List of tools available to the agent")
     max_iterations: int = Field(default=5, description="Maximum number of iterations for the agent")
     
+_config_cache: Dict[str, Dict] = {}
+_llm_registry: Dict[str, Any] = {}
+_registry_lock = threading.RLock()
+
+
 class BaseAgent(ABC):
-    """Base agent class that all other agents will inherit from"""
+    """Base agent class that all other agents will inherit from.
+
+    Configuration and the LLM client are created lazily on first access and shared
+    process-wide: YAML files are parsed once per path, and LLM clients are kept in a
+    registry keyed by provider and provider settings, so constructing agents is cheap
+    and a pipeline of agents shares one client (and one health check).
+    """
     
     def __init__(self, config_path: Optional[str] = None, config: Optional[Dict] = None):
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.config = config if config is not None else self._load_config(config_path)
-        self.llm = self._initialize_llm()
-        self.tools = self._initialize_tools()
-        self.max_iterations = self.config.get("max_iterations", 5)
+        self._config_path = config_path
+        self._config = config
+        self._llm = None
+        self._tools = None
+
+    @property
+    def config(self) -> Dict:
+        if self._config is None:
+            self._config = self._load_config(self._config_path)
+        return self._config
+
+    @config.setter
+    def config(self, value: Dict) -> None:
+        self._config = value
+
+    @property
+    def llm(self) -> BaseLLM:
+        if self._llm is None:
+            self._llm = self._get_shared_llm()
+        return self._llm
+
+    @llm.setter
+    def llm(self, value: BaseLLM) -> None:
+        self._llm = value
+
+    @property
+    def tools(self) -> Dict[str, Any]:
+        if self._tools is None:
+            self._tools = self._initialize_tools()
+        return self._tools
+
+    @property
+    def max_iterations(self) -> int:
+        return self.config.get("max_iterations", 5)
+
+    @classmethod
+    def clear_shared_state(cls) -> None:
+        """Drop cached configs and LLM clients (e.g. after editing the config file)"""
+        with _registry_lock:
+            _config_cache.clear()
+            _llm_registry.clear()
         
-    def _load_config(self, config_path: str) -> Dict:
-        """Load configuration from yaml file"""
+    def _load_config(self, config_path: Optional[str]) -> Dict:
+        """Load configuration from yaml file, parsing each file only once per process"""
         if config_path is None:
             # Get the path to config relative to this file
             config_path = str(Path(__file__).parent.parent / "config" / "system_config.yaml")
             
         try:
             abs_path = str(Path(config_path).resolve())
-            with open(abs_path, 'r') as f:
-                config = yaml.safe_load(f)
-                return config
+            with _registry_lock:
+                if abs_path not in _config_cache:
+                    with open(abs_path, 'r') as f:
+                        _config_cache[abs_path] = yaml.safe_load(f)
+                return copy.deepcopy(_config_cache[abs_path])
         except Exception as e:
             self.logger.error(f"Failed to load config from {config_path}: {str(e)}")
             raise
+
+    def _get_shared_llm(self) -> BaseLLM:
+        """Return the registry LLM for this agent's provider settings, creating it once"""
+        llm_config = self.config.get("llm", {})
+        provider = llm_config.get("provider", "ollama")
+        key = json.dumps(
+            [provider, llm_config.get(provider, {}), llm_config.get("cache", {})],
+            sort_keys=True,
+            default=str
+        )
+        with _registry_lock:
+            if key not in _llm_registry:
+                _llm_registry[key] = self._initialize_llm()
+            return _llm_registry[key]
             
     def _initialize_llm(self) -> BaseLLM:
         """Initialize LLM based on configuration"""
         llm_config = self.config.get("llm", {})
         provider = llm_config.get("provider", "ollama")
+        provider_config = llm_config.get(provider, {})
         
         if provider == "ollama":
-            return self._initialize_ollama(llm_config.get("ollama", {}))
+            llm = self._initialize_ollama(provider_config)
         elif provider == "openai":
-            return self._initialize_openai(llm_config.get("openai", {}))
+            llm = self._initialize_openai(provider_config)
         elif provider == "openrouter":
-            return self._initialize_openrouter(llm_config.get("openrouter", {}))
+            llm = self._initialize_openrouter(provider_config)
         else:
             raise ValueError(f"Unsupported LLM provider: {provider}")
+
+        return self._wrap_with_cache(llm, provider, provider_config, llm_config.get("cache", {}))
+
+    def _wrap_with_cache(self, llm: BaseLLM, provider: str, provider_config: Dict, cache_config: Dict) -> CachedLLM:
+        """Wrap the LLM with the persistent response cache.
+
+        Caching can be turned off with ``llm.cache.enabled: false`` or by setting the
+        ``LLM_CACHE_DISABLED`` environment variable (e.g. for non-deterministic runs).
+        The LLM is wrapped either way, so agents can always pass ``use_cache`` and
+        ``validate`` to ``invoke``/``ainvoke``.
+        """
+        enabled = cache_config.get("enabled", False) and not os.getenv("LLM_CACHE_DISABLED")
+        return CachedLLM(
+            llm,
+            get_response_cache(cache_config) if enabled else None,
+            provider=provider,
+            model=provider_config.get("model", ""),
+            temperature=provider_config.get("temperature"),
+            max_tokens=provider_config.get("max_tokens")
+        )
             
     def _initialize_ollama(self, config: Dict) -> BaseLLM:
         """Initialize Ollama LLM with validation and availability check.
 
+        The availability check is a lightweight request to the Ollama HTTP API rather
+        than a generation call, and runs once per shared client (see ``_get_shared_llm``).
+        Set ``health_check: false`` in the ollama config to skip it.
+
         Args:
             config (Dict): Configuration dictionary for Ollama settings
 
@@ -143,8 +297,10 @@ class BaseAgent(ABC):
                 timeout=timeout
             )
             
-            # Test if LLM is responsive
-            llm.invoke("test")  # This will raise an exception if Ollama is not available
+            # Test if Ollama is reachable
+            if config.get("health_check", True):
+                response = httpx.get(f"{base_url}/api/tags", timeout=min(timeout, 10))
+                response.raise_for_status()
             return llm
             
         except Exception as e:
@@ -176,7 +332,9 @@ class BaseAgent(ABC):
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
-            timeout=timeout
+            timeout=timeout,
+            async_native=config.get("async_native", True),
+            pool=config.get("pool", {})
         )
         
     def _initialize_tools(self) -> Dict[str, Any]:
@@ -0,0 +1,209 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+class LLMResponseCache:
+    """Disk-backed, content-addressed store of LLM responses.
+
+    Entries live in a single SQLite file keyed by the SHA-256 of the provider,
+    model, sampling settings and prompt. Entries older than ``max_age_seconds``
+    are treated as misses, and the least recently used entries are evicted once
+    ``max_entries`` or ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000, max_bytes: int = 200 * 1024 * 1024,
+                 max_age_seconds: Optional[float] = 7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(provider: str, model: str, temperature: Any, max_tokens: Any, prompt: str) -> str:
+        """Hash the request parameters and prompt into a cache key"""
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        raw = "\x1f".join([str(provider), str(model), str(temperature), str(max_tokens), prompt_hash])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.max_age_seconds and now - row[1] > self.max_age_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        if self.max_age_seconds:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.max_age_seconds,))
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall()
+        stale = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            stale.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": count, "bytes": total}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedLLM:
+    """Wraps any LLM exposing ``invoke``/``ainvoke`` with an ``LLMResponseCache``.
+
+    Pass ``use_cache=False`` to a single call, or set ``enabled = False`` on the
+    wrapper, to always hit the underlying model (e.g. for non-deterministic runs).
+    Pass ``validate`` to only cache responses the caller can use: a response it
+    rejects is not stored, and a cached one it rejects is dropped and requested
+    again. ``invalidate(prompt)`` drops a cached response after the fact.
+    Without a cache the wrapper is a pass-through with the same call signature.
+    Every other attribute is forwarded to the wrapped LLM.
+    """
+
+    def __init__(self, llm: Any, cache: Optional[LLMResponseCache], provider: str, model: str,
+                 temperature: Any = None, max_tokens: Any = None, enabled: bool = True):
+        self.llm = llm
+        self.cache = cache
+        self.provider = provider
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.enabled = enabled
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def _key(self, prompt: str) -> str:
+        return self.cache.make_key(self.provider, self.model, self.temperature, self.max_tokens, prompt)
+
+    def _cached(self, key: str, validate: Optional[Callable[[str], bool]]) -> Optional[str]:
+        cached = self.cache.get(key)
+        if cached is not None and validate is not None and not validate(cached):
+            self.logger.debug(f"Dropping rejected cached response for {self.provider}/{self.model}")
+            self.cache.delete(key)
+            return None
+        if cached is not None:
+            self.logger.debug(f"LLM cache hit for {self.provider}/{self.model}")
+        return cached
+
+    def _store(self, key: str, response: Any, validate: Optional[Callable[[str], bool]]) -> None:
+        if isinstance(response, str) and (validate is None or validate(response)):
+            self.cache.put(key, response)
+
+    def invoke(self, prompt: str, use_cache: bool = True, validate: Optional[Callable[[str], bool]] = None) -> str:
+        if not (self.enabled and use_cache and self.cache is not None):
+            return self.llm.invoke(prompt)
+        key = self._key(prompt)
+        cached = self._cached(key, validate)
+        if cached is not None:
+            return cached
+        response = self.llm.invoke(prompt)
+        self._store(key, response, validate)
+        return response
+
+    async def ainvoke(self, prompt: str, use_cache: bool = True,
+                      validate: Optional[Callable[[str], bool]] = None) -> str:
+        if not (self.enabled and use_cache and self.cache is not None):
+            return await self.llm.ainvoke(prompt)
+        key = self._key(prompt)
+        cached = self._cached(key, validate)
+        if cached is not None:
+            return cached
+        response = await self.llm.ainvoke(prompt)
+        self._store(key, response, validate)
+        return response
+
+    def invalidate(self, prompt: str) -> None:
+        """Drop the cached response to prompt, so the next call asks the model again"""
+        if self.cache is not None:
+            self.cache.delete(self._key(prompt))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.llm, name)
+
+
+_caches: Dict[str, LLMResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(config: Dict) -> LLMResponseCache:
+    """Return the process-wide ``LLMResponseCache`` for the configured path.
+
+    Relative paths are resolved against the AgenticDeveloper package directory.
+    """
+    path = config.get("path", "llm_cache/responses.sqlite")
+    if not os.path.isabs(path):
+        path = str(Path(__file__).parent.parent / path)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = LLMResponseCache(
+                path,
+                max_entries=int(config.get("max_entries", 5000)),
+                max_bytes=int(config.get("max_bytes", 200 * 1024 * 1024)),
+                max_age_seconds=config.get("max_age_seconds", 7 * 24 * 3600)
+            )
+            _caches[path] = cache
+        return cache
@@ -0,0 +1,275 @@
+import ast
+import csv
+import itertools
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .backtest_scheduler import BacktestScheduler
+from AgenticDeveloper.tools.backtest_results import LOWER_IS_BETTER, load_statistics
+from AgenticDeveloper.tools.market_data import MarketDataCache, get_market_data_cache
+from AgenticDeveloper.tools.vector_backtest import LOWER_IS_BETTER as SCREEN_LOWER_IS_BETTER, VectorBacktester
+
+# "SMA:1:0" -> positional argument 1 of the first call to SMA
+CALL_BINDING = re.compile(r"^(\w+):(\d+)(?::(\d+))?$")
+DEFAULT_SWEEP_METRICS = ["Sharpe Ratio", "Compounding Annual Return", "Drawdown", "Net Profit", "Total Orders"]
+# VectorBacktester signals a sweep can be pre-screened with, and the grid arguments each takes in order
+SCREEN_MODELS = {"sma_crossover": ("fast", "slow"), "momentum": ("lookback", "threshold")}
+
+
+def parameter_grid(parameters: Dict[str, Iterable[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of parameter values: {"a": [1, 2], "b": [3]} -> [{"a": 1, "b": 3}, {"a": 2, "b": 3}]"""
+    names = list(parameters)
+    return [dict(zip(names, values)) for values in itertools.product(*(list(parameters[name]) for name in names))]
+
+
+def _literal_node(node: ast.AST) -> bool:
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, (int, float, str, bool))
+    return isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)) and _literal_node(node.operand)
+
+
+def find_parameter_literals(code: str, name: str, binding: Optional[str] = None) -> List[ast.AST]:
+    """
+    The literal nodes a parameter controls in the strategy code.
+
+    By default these are literals assigned to ``self.<name>`` or ``<name>`` and literals
+    passed as keyword argument ``<name>=``. A binding of the form "Call:index[:occurrence]"
+    selects positional argument ``index`` of calls to ``Call`` instead (all calls, or only
+    the given occurrence in source order), e.g. "SMA:1:0" for the fast SMA period.
+    """
+    tree = ast.parse(code)
+    nodes = []
+    if binding:
+        match = CALL_BINDING.match(binding)
+        if not match:
+            raise ValueError(f"Invalid binding for {name}: {binding!r} (expected 'Call:index[:occurrence]')")
+        function, index = match.group(1), int(match.group(2))
+        occurrence = int(match.group(3)) if match.group(3) is not None else None
+        calls = [
+            node for node in ast.walk(tree)
+            if isinstance(node, ast.Call) and (
+                (isinstance(node.func, ast.Attribute) and node.func.attr == function)
+                or (isinstance(node.func, ast.Name) and node.func.id == function)
+            )
+        ]
+        calls.sort(key=lambda node: (node.lineno, node.col_offset))
+        if occurrence is not None:
+            calls = calls[occurrence:occurrence + 1]
+        nodes = [call.args[index] for call in calls if len(call.args) > index and _literal_node(call.args[index])]
+    else:
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value is not None and _literal_node(node.value):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    if (isinstance(target, ast.Name) and target.id == name) or (
+                        isinstance(target, ast.Attribute) and target.attr == name
+                        and isinstance(target.value, ast.Name) and target.value.id == "self"
+                    ):
+                        nodes.append(node.value)
+            elif isinstance(node, ast.keyword) and node.arg == name and _literal_node(node.value):
+                nodes.append(node.value)
+    return nodes
+
+
+def apply_parameters(code: str, parameters: Dict[str, Any], bindings: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Rewrite the literals controlled by each parameter (see find_parameter_literals).
+    Returns {"code": new code, "unbound": [parameters with no literal in the code]}.
+    """
+    bindings = bindings or {}
+    lines = code.splitlines(keepends=True)
+    replacements = []
+    unbound = []
+    for name, value in parameters.items():
+        nodes = find_parameter_literals(code, name, bindings.get(name))
+        if not nodes:
+            unbound.append(name)
+        replacements += [(node, repr(value)) for node in nodes]
+
+    # Replace from the end so earlier offsets stay valid
+    replacements.sort(key=lambda item: (item[0].lineno, item[0].col_offset), reverse=True)
+    for node, text in replacements:
+        if node.lineno != node.end_lineno:
+            raise ValueError(f"Cannot rewrite multi-line literal at line {node.lineno}")
+        line = lines[node.lineno - 1]
+        # AST offsets are in UTF-8 bytes
+        encoded = line.encode("utf-8")
+        lines[node.lineno - 1] = (
+            encoded[:node.col_offset].decode("utf-8") + text + encoded[node.end_col_offset:].decode("utf-8")
+        )
+    return {"code": "".join(lines), "unbound": unbound}
+
+
+def reads_project_parameter(code: str, name: str) -> bool:
+    """Whether the code reads ``name`` with GetParameter/get_parameter"""
+    return re.search(r"(?:GetParameter|get_parameter)\(\s*['\"]" + re.escape(name) + r"['\"]", code) is not None
+
+
+class ParameterSweep:
+    """
+    Grid search over strategy parameters on top of BacktestScheduler.
+
+    Each parameter set runs on its own materialized copy of the project: literals the
+    parameters control are rewritten in the code (see find_parameter_literals), and every
+    parameter is also written to the copy's config.json "parameters" so strategies that read
+    them with GetParameter work unchanged. Parameter sets that already ran successfully are
+    reused through the scheduler's result cache (tools.lean_cli.reuse_results), which keys
+    them on the normalized code, project config and mode. Results are written as a CSV
+    comparison table sorted by the ranking metric.
+
+    Large grids can be pre-screened with VectorBacktester on the closes in the market data
+    cache (see prescreen) so only the most promising parameter sets are sent to Lean.
+    """
+
+    def __init__(self, scheduler: Optional[BacktestScheduler] = None, market_data: Optional[MarketDataCache] = None):
+        self.scheduler = scheduler or BacktestScheduler()
+        self._market_data = market_data
+        sweep_config = self.scheduler.backtester.config.get("agents", {}).get("backtester", {}).get("sweep", {})
+        self.metrics = sweep_config.get("metrics", DEFAULT_SWEEP_METRICS)
+        self.rank_by = sweep_config.get("rank_by", "Sharpe Ratio")
+
+    async def run(self, strategy_path: str, parameters: Union[Dict[str, Iterable[Any]], List[Dict[str, Any]]],
+                  bindings: Optional[Dict[str, str]] = None, mode: str = "local",
+                  table_path: Optional[str] = None, prescreen: Optional[Dict[str, Any]] = None,
+                  **run_kwargs: Any) -> List[Dict[str, Any]]:
+        """
+        Backtest every parameter set concurrently.
+        parameters: a grid ({name: values}) or an explicit list of parameter sets
+        bindings: optional {name: "Call:index[:occurrence]"} for literals that are call arguments
+        prescreen: optional {"keep": n, **prescreen() arguments}; only the n best parameter sets
+            of the vectorized screen are backtested, the others get status 'screened out'
+        Returns one row per parameter set (parameters, status, cached, metrics), best first,
+        and writes them to table_path (default: <project>/sweeps/<timestamp>.csv). Rows served
+        from the scheduler's result cache are marked 'cached'.
+        """
+        strategy_file = strategy_path if os.path.isfile(strategy_path) else os.path.join(strategy_path, "main.py")
+        with open(strategy_file, "r") as f:
+            base_code = f.read()
+        parameter_sets = parameter_grid(parameters) if isinstance(parameters, dict) else list(parameters)
+
+        scores, selected = None, list(range(len(parameter_sets)))
+        if prescreen:
+            settings = dict(prescreen)
+            keep = settings.pop("keep")
+            by = settings.get("by", "sharpe")
+            scores = self.prescreen(parameter_sets, **settings)
+            ranked = sorted((k for k, score in enumerate(scores) if score is not None),
+                            key=scores.__getitem__, reverse=by not in SCREEN_LOWER_IS_BETTER)
+            selected = sorted(ranked[:keep])
+
+        codes = []
+        for params in parameter_sets:
+            applied = apply_parameters(base_code, params, bindings)
+            missing = [name for name in applied["unbound"] if not reads_project_parameter(base_code, name)]
+            if missing:
+                raise ValueError(f"Parameters not found in {strategy_file}: {', '.join(missing)}")
+            codes.append(applied["code"])
+
+        jobs = []
+        for k in selected:
+            project_parameters = {name: str(value) for name, value in parameter_sets[k].items()}
+            jobs.append(self.scheduler.submit(
+                strategy_file, mode=mode, code=codes[k],
+                project_config={"parameters": project_parameters}, **run_kwargs
+            ))
+
+        results = dict(zip(selected, await self.scheduler.gather(jobs)))
+        rows = []
+        for k, params in enumerate(parameter_sets):
+            result = results.get(k)
+            if k not in results:
+                row = self._row(params, {"params": params, "metrics": {}}, cached=False)
+                row["status"] = "screened out"
+            elif isinstance(result, BaseException):
+                entry = {"params": params, "backtest_successful": False, "errors": [repr(result)], "metrics": {}}
+                row = self._row(params, entry, cached=False)
+            else:
+                row = self._row(params, self._entry(params, result), cached=bool(result.get("cached")))
+            if scores is not None:
+                row[f"screen_{by}"] = scores[k]
+            rows.append(row)
+
+        rows.sort(key=self._rank_value, reverse=True)
+        self.write_table(rows, table_path or os.path.join(
+            os.path.dirname(os.path.abspath(strategy_file)), "sweeps", f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.csv"
+        ))
+        return rows
+
+    @property
+    def market_data(self) -> MarketDataCache:
+        if self._market_data is None:
+            config = self.scheduler.backtester.config.get("tools", {}).get("market_data", {})
+            self._market_data = get_market_data_cache(config)
+        return self._market_data
+
+    def prescreen(self, parameter_sets: List[Dict[str, Any]], model: str, symbols: List[str],
+                  names: Optional[Dict[str, str]] = None, by: str = "sharpe", resolution: str = "daily",
+                  start=None, end=None, fee_rate: float = 0.0, **model_kwargs: Any) -> List[Optional[float]]:
+        """
+        Score parameter sets with a VectorBacktester signal (SCREEN_MODELS) that approximates
+        the strategy, on the closes of symbols in the market data cache.
+        names maps the model's grid arguments to sweep parameter names where they differ,
+        e.g. {"threshold": "momentum_threshold"}; other parameters don't change the score.
+        model_kwargs go to the model (weight, tolerance).
+        Returns the ``by`` metric per parameter set, None where the model has no score
+        (e.g. fast >= slow).
+        """
+        if model not in SCREEN_MODELS:
+            raise ValueError(f"Unknown screen model {model!r} (expected one of {', '.join(SCREEN_MODELS)})")
+        arguments = SCREEN_MODELS[model]
+        names = {argument: (names or {}).get(argument, argument) for argument in arguments}
+        for params in parameter_sets:
+            missing = [name for name in names.values() if name not in params]
+            if missing:
+                raise ValueError(f"The {model} screen needs parameters {', '.join(missing)}")
+
+        _, closes = self.market_data.closes(symbols, resolution, start, end)
+        grid = [sorted({params[names[argument]] for params in parameter_sets}) for argument in arguments]
+        result = getattr(VectorBacktester(fee_rate=fee_rate), model)(closes, *grid, **model_kwargs)
+        metric = {
+            tuple(params[argument] for argument in arguments): float(value)
+            for params, value in zip(result.params, result.metrics[by]) if value == value  # NaN has no score
+        }
+        return [metric.get(tuple(params[names[argument]] for argument in arguments)) for params in parameter_sets]
+
+    def _entry(self, params: Dict[str, Any], result: Dict) -> Dict:
+        metrics = {}
+        if result.get("folder_path") and os.path.isdir(result["folder_path"]):
+            metrics = load_statistics(result["folder_path"])
+        elif result.get("stats"):
+            # Smoke runs only report activity counts
+            metrics = {"Total Orders": result["stats"].get("orders"), "Final Value": result["stats"].get("final_value")}
+        return {
+            "params": params,
+            "backtest_successful": result.get("backtest_successful", False),
+            "errors": result.get("errors", [])[:3],
+            "folder_path": result.get("folder_path"),
+            "metrics": metrics,
+        }
+
+    def _row(self, params: Dict[str, Any], entry: Dict, cached: bool) -> Dict[str, Any]:
+        row = dict(params)
+        row["status"] = "ok" if entry.get("backtest_successful") else "failed"
+        row["cached"] = cached
+        for metric in self.metrics:
+            row[metric] = entry.get("metrics", {}).get(metric)
+        row["folder_path"] = entry.get("folder_path")
+        return row
+
+    def _rank_value(self, row: Dict[str, Any]):
+        value = row.get(self.rank_by)
+        if row["status"] != "ok" or not isinstance(value, (int, float)):
+            return float("-inf")
+        return -value if self.rank_by in LOWER_IS_BETTER else value
+
+    @staticmethod
+    def write_table(rows: List[Dict[str, Any]], path: str) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
@@ -4,6 +4,8 @@ import asyncio
 from typing import List, Dict, Optional
 from tqdm.asyncio import tqdm
 from AgenticDeveloper.tools.web_tools import ArxivSearchTool, PDFHandler, HTMLHandler
+from AgenticDeveloper.tools.text_chunker import TextChunker
+from AgenticDeveloper.tools.idea_store import IdeaStore
 from AgenticDeveloper.agents.base import BaseAgent
 
 class IdeaResearcherAgent(BaseAgent):
@@ -17,149 +19,241 @@ class IdeaResearcherAgent(BaseAgent):
         if not os.path.exists(self.ideas_dump_path):
             with open(self.ideas_dump_path, "w") as f:
                 json.dump({}, f)
+        self._idea_store = None
+
+    @property
+    def idea_store(self) -> IdeaStore:
+        """Append-only idea log stored next to ``ideas_dump_path`` (``.jsonl``)"""
+        log_path = os.path.splitext(self.ideas_dump_path)[0] + ".jsonl"
+        if self._idea_store is None or self._idea_store.log_path != log_path:
+            self._idea_store = IdeaStore(log_path, legacy_json_path=self.ideas_dump_path)
+        return self._idea_store
 
     async def run(self, query: str = "momentum trading", max_results: int = 3):
         await self.search_and_process(query, max_results)
 
     async def search_and_process(self, query: str, max_results: int = 6):
+        """Search arXiv and run new papers through a staged download → extract → analyze pipeline.
+
+        Each stage has its own worker pool (``agents.researcher.pipeline``) and the
+        stages are linked by bounded queues, so downloads overlap with analysis of
+        earlier papers while a slow stage applies back-pressure to the ones before it.
+        A failure on one paper is logged and does not stop the others.
+        """
         papers = await self.arxiv_tool.search(query, max_results)
+        pipeline = self.config.get("agents", {}).get("researcher", {}).get("pipeline", {})
+        queue_size = max(1, int(pipeline.get("queue_size", 4)))
 
-        # Load existing ideas to skip duplicates
-        try:
-            with open(self.ideas_dump_path, "r") as f:
-                existing_ideas = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            existing_ideas = {}
-
-        existing_urls = set()
-        for idea in existing_ideas.values():
-            src = idea.get("source", {})
-            url = src.get("url", "")
-            if url:
-                existing_urls.add(url)
+        download_queue: asyncio.Queue = asyncio.Queue()
+        extract_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        analyze_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
 
+        queued_urls = set()
         for paper in papers:
-            if paper["pdf_url"] in existing_urls:
+            if self.idea_store.has_url(paper["pdf_url"]) or paper["pdf_url"] in queued_urls:
                 print(f"[ResearchAgent] Skipping already processed paper: {paper['title']}")
                 continue
+            queued_urls.add(paper["pdf_url"])
+            download_queue.put_nowait(paper)
 
+        async def download(paper: Dict):
             pdf_path = await self.pdf_handler.download_pdf(paper["pdf_url"], "AgenticDeveloper/research_ideas")
-            if pdf_path:
-                text = self.pdf_handler.extract_text(pdf_path)
-            else:
-                text = ""
+            await extract_queue.put((paper, pdf_path))
+
+        async def extract(item: tuple):
+            paper, pdf_path = item
+            text = await self.pdf_handler.aextract_text(pdf_path) if pdf_path else ""
+            await analyze_queue.put((paper, pdf_path, text))
 
+        async def analyze(item: tuple):
+            paper, pdf_path, text = item
             # Extract multiple ideas from the paper
             ideas = await self._analyze_resource(text, paper)
+            self._save_ideas(ideas, paper, pdf_path)
+
+        stages = [
+            (download_queue, download, int(pipeline.get("download_workers", 4))),
+            (extract_queue, extract, int(pipeline.get("extract_workers", 2))),
+            (analyze_queue, analyze, int(pipeline.get("analyze_workers", 2))),
+        ]
+        workers = [
+            asyncio.create_task(self._pipeline_worker(queue, handler))
+            for queue, handler, count in stages
+            for _ in range(max(1, count))
+        ]
+        try:
+            # Items only move forward, so once a queue drains every item is in a later stage
+            for queue, _, _ in stages:
+                await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await self.pdf_handler.close()
+
+        self.export_ideas()
 
-            for idea_name, (desc, pseudo) in ideas.items():
-                self._save_idea(idea_name, paper, desc, pseudo, pdf_path)
+    async def _pipeline_worker(self, queue: asyncio.Queue, handler):
+        while True:
+            item = await queue.get()
+            try:
+                await handler(item)
+            except Exception as e:
+                paper = item[0] if isinstance(item, tuple) else item
+                self.log_progress(f"Failed to process paper {paper.get('title', '')}: {e}", level="error")
+            finally:
+                queue.task_done()
 
     async def _analyze_resource(self, text: str, paper: Dict) -> Dict[str, tuple]:
-        chunks = [text[i:i+1000] for i in range(0, len(text), 1000)]
+        """Analyze all chunks of a resource concurrently and merge the extracted ideas.
+
+        At most ``agents.researcher.chunk_concurrency`` chunks are analyzed at once.
+        Ideas are merged in chunk order; when several chunks yield the same idea name
+        the earliest chunk wins.
+        """
+        chunks = self._chunk_text(text)
+        concurrency = int(self.config.get("agents", {}).get("researcher", {}).get("chunk_concurrency", 8))
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        progress = tqdm(total=len(chunks), desc=f"Analyzing {paper.get('title', '')}")
+
+        async def analyze(chunk: str) -> Dict[str, tuple]:
+            async with semaphore:
+                try:
+                    return await self._analyze_chunk(chunk, paper)
+                finally:
+                    progress.update(1)
+
+        try:
+            results = await asyncio.gather(*(analyze(chunk) for chunk in chunks))
+        finally:
+            progress.close()
+
         ideas = {}
+        for chunk_ideas in results:
+            for idea_name, idea in chunk_ideas.items():
+                ideas.setdefault(idea_name, idea)
+        return ideas
 
-        for chunk in tqdm(chunks, desc=f"Analyzing {paper.get('title', '')}"):
-            prompt = (
-                "Extract all distinct trading strategies or ideas from the following text. "
-                "For each, provide:\n"
-                "- A clear, detailed, actionable description\n"
-                "- Step-by-step pseudocode including:\n"
-                "  * Universe selection\n"
-                "  * Entry and exit criteria\n"
-                "  * Risk management rules\n"
-                "  * Parameter suggestions\n"
-                "Text:\n"
-                f"{chunk[:1000]}"
+    def _chunk_text(self, text: str) -> List[str]:
+        """Split text into chunks sized to the configured model's context window.
+
+        The chunk budget is the model's ``context_window`` minus its ``max_tokens``
+        response budget and a reserve for the prompt, capped at ``max_chunk_tokens``.
+        """
+        chunking = self.config.get("agents", {}).get("researcher", {}).get("chunking", {})
+        llm_config = self.config.get("llm", {})
+        provider_config = llm_config.get(llm_config.get("provider", "ollama"), {})
+        context_window = int(provider_config.get("context_window", chunking.get("context_window", 8192)))
+        budget = context_window - int(provider_config.get("max_tokens", 1000)) - int(chunking.get("prompt_reserve_tokens", 300))
+        budget = max(256, min(budget, int(chunking.get("max_chunk_tokens", 4000))))
+        chunker = TextChunker(
+            max_tokens=budget,
+            overlap_tokens=int(chunking.get("overlap_tokens", 100)),
+            chars_per_token=float(chunking.get("chars_per_token", 4.0))
+        )
+        return chunker.chunk(text)
+
+    async def _analyze_chunk(self, chunk: str, paper: Dict) -> Dict[str, tuple]:
+        ideas = {}
+        prompt = (
+            "Extract all distinct trading strategies or ideas from the following text. "
+            "For each, provide:\n"
+            "- A clear, detailed, actionable description\n"
+            "- Step-by-step pseudocode including:\n"
+            "  * Universe selection\n"
+            "  * Entry and exit criteria\n"
+            "  * Risk management rules\n"
+            "  * Parameter suggestions\n"
+            "Text:\n"
+            f"{chunk}"
+        )
+
+        # Simulate LLM response
+        response = f"Summary of chunk: {chunk[:30]}... pseudo code: pass"
+
+        # Post-process: if response is generic, simulate retry with refined prompt
+        if "description of idea" in response.lower() or "pass" in response:
+            refined_prompt = (
+                "Your previous answer was too vague. Please extract concrete, detailed trading ideas "
+                "and provide specific, step-by-step pseudocode implementations."
+            )
+            # Simulate improved response
+            response = (
+                "Idea: Mid-cap momentum strategy\n"
+                "Description: Select KOSPI 100-50 mid-cap stocks. Rank by 6-month past returns. "
+                "Go long top 20%, short bottom 20%. Hold for 3 months. Rebalance monthly. "
+                "Avoid KOSPI 50 large caps to improve alpha.\n"
+                "Pseudocode:\n"
+                "def midcap_momentum():\n"
+                "    universe = get_kospi_200()\n"
+                "    midcaps = filter_market_cap(universe, rank_range=(50,100))\n"
+                "    ranked = rank_by_past_return(midcaps, lookback=126)\n"
+                "    longs = top_percentile(ranked, 20)\n"
+                "    shorts = bottom_percentile(ranked, 20)\n"
+                "    portfolio = long_short(longs, shorts)\n"
+                "    hold(portfolio, 63)\n"
+                "    rebalance_monthly()\n"
+                "\n"
+                "Idea: Liquidity-based strategy\n"
+                "Description: In KOSPI 200 excluding KOSPI 50, rank stocks by average daily turnover. "
+                "Go long lowest 20% liquidity, short highest 20%. Hold 3 months, rebalance monthly. "
+                "Low liquidity stocks tend to outperform.\n"
+                "Pseudocode:\n"
+                "def liquidity_strategy():\n"
+                "    universe = get_kospi_200()\n"
+                "    ex_largecaps = exclude_kospi_50(universe)\n"
+                "    ranked = rank_by_liquidity(ex_largecaps, lookback=126)\n"
+                "    longs = bottom_percentile(ranked, 20)\n"
+                "    shorts = top_percentile(ranked, 20)\n"
+                "    portfolio = long_short(longs, shorts)\n"
+                "    hold(portfolio, 63)\n"
+                "    rebalance_monthly()\n"
             )
 
-            # Simulate LLM response
-            response = f"Summary of chunk: {chunk[:30]}... pseudo code: pass"
-
-            # Post-process: if response is generic, simulate retry with refined prompt
-            if "description of idea" in response.lower() or "pass" in response:
-                refined_prompt = (
-                    "Your previous answer was too vague. Please extract concrete, detailed trading ideas "
-                    "and provide specific, step-by-step pseudocode implementations."
-                )
-                # Simulate improved response
-                response = (
-                    "Idea: Mid-cap momentum strategy\n"
-                    "Description: Select KOSPI 100-50 mid-cap stocks. Rank by 6-month past returns. "
-                    "Go long top 20%, short bottom 20%. Hold for 3 months. Rebalance monthly. "
-                    "Avoid KOSPI 50 large caps to improve alpha.\n"
-                    "Pseudocode:\n"
-                    "def midcap_momentum():\n"
-                    "    universe = get_kospi_200()\n"
-                    "    midcaps = filter_market_cap(universe, rank_range=(50,100))\n"
-                    "    ranked = rank_by_past_return(midcaps, lookback=126)\n"
-                    "    longs = top_percentile(ranked, 20)\n"
-                    "    shorts = bottom_percentile(ranked, 20)\n"
-                    "    portfolio = long_short(longs, shorts)\n"
-                    "    hold(portfolio, 63)\n"
-                    "    rebalance_monthly()\n"
-                    "\n"
-                    "Idea: Liquidity-based strategy\n"
-                    "Description: In KOSPI 200 excluding KOSPI 50, rank stocks by average daily turnover. "
-                    "Go long lowest 20% liquidity, short highest 20%. Hold 3 months, rebalance monthly. "
-                    "Low liquidity stocks tend to outperform.\n"
-                    "Pseudocode:\n"
-                    "def liquidity_strategy():\n"
-                    "    universe = get_kospi_200()\n"
-                    "    ex_largecaps = exclude_kospi_50(universe)\n"
-                    "    ranked = rank_by_liquidity(ex_largecaps, lookback=126)\n"
-                    "    longs = bottom_percentile(ranked, 20)\n"
-                    "    shorts = top_percentile(ranked, 20)\n"
-                    "    portfolio = long_short(longs, shorts)\n"
-                    "    hold(portfolio, 63)\n"
-                    "    rebalance_monthly()\n"
-                )
-
-            # Parse ideas from response (simulate parsing)
-            if "midcap_momentum" in response:
-                ideas[f"{paper.get('title', 'Untitled')} Mid-Cap Momentum"] = (
-                    "Select KOSPI 100-50 mid-cap stocks. Rank by 6-month past returns. Go long top 20%, short bottom 20%. Hold for 3 months. Rebalance monthly. Avoid KOSPI 50 large caps to improve alpha.",
-                    "def midcap_momentum():\n    universe = get_kospi_200()\n    midcaps = filter_market_cap(universe, rank_range=(50,100))\n    ranked = rank_by_past_return(midcaps, lookback=126)\n    longs = top_percentile(ranked, 20)\n    shorts = bottom_percentile(ranked, 20)\n    portfolio = long_short(longs, shorts)\n    hold(portfolio, 63)\n    rebalance_monthly()"
-                )
-            if "liquidity_strategy" in response:
-                ideas[f"{paper.get('title', 'Untitled')} Liquidity Strategy"] = (
-                    "In KOSPI 200 excluding KOSPI 50, rank stocks by average daily turnover. Go long lowest 20% liquidity, short highest 20%. Hold 3 months, rebalance monthly. Low liquidity stocks tend to outperform.",
-                    "def liquidity_strategy():\n    universe = get_kospi_200()\n    ex_largecaps = exclude_kospi_50(universe)\n    ranked = rank_by_liquidity(ex_largecaps, lookback=126)\n    longs = bottom_percentile(ranked, 20)\n    shorts = top_percentile(ranked, 20)\n    portfolio = long_short(longs, shorts)\n    hold(portfolio, 63)\n    rebalance_monthly()"
-                )
-
-            tqdm.write(response[:60])  # Print snippet of response
-            await asyncio.sleep(0.1)  # Simulate async LLM call
+        # Parse ideas from response (simulate parsing)
+        if "midcap_momentum" in response:
+            ideas[f"{paper.get('title', 'Untitled')} Mid-Cap Momentum"] = (
+                "Select KOSPI 100-50 mid-cap stocks. Rank by 6-month past returns. Go long top 20%, short bottom 20%. Hold for 3 months. Rebalance monthly. Avoid KOSPI 50 large caps to improve alpha.",
+                "def midcap_momentum():\n    universe = get_kospi_200()\n    midcaps = filter_market_cap(universe, rank_range=(50,100))\n    ranked = rank_by_past_return(midcaps, lookback=126)\n    longs = top_percentile(ranked, 20)\n    shorts = bottom_percentile(ranked, 20)\n    portfolio = long_short(longs, shorts)\n    hold(portfolio, 63)\n    rebalance_monthly()"
+            )
+        if "liquidity_strategy" in response:
+            ideas[f"{paper.get('title', 'Untitled')} Liquidity Strategy"] = (
+                "In KOSPI 200 excluding KOSPI 50, rank stocks by average daily turnover. Go long lowest 20% liquidity, short highest 20%. Hold 3 months, rebalance monthly. Low liquidity stocks tend to outperform.",
+                "def liquidity_strategy():\n    universe = get_kospi_200()\n    ex_largecaps = exclude_kospi_50(universe)\n    ranked = rank_by_liquidity(ex_largecaps, lookback=126)\n    longs = bottom_percentile(ranked, 20)\n    shorts = top_percentile(ranked, 20)\n    portfolio = long_short(longs, shorts)\n    hold(portfolio, 63)\n    rebalance_monthly()"
+            )
+
+        tqdm.write(response[:60])  # Print snippet of response
+        await asyncio.sleep(0.1)  # Simulate async LLM call
 
         return ideas
 
-    def _save_idea(self, idea_name: str, paper: Dict, summary: str, pseudo_code: str, pdf_path: Optional[str]):
-        # Load existing ideas
-        try:
-            with open(self.ideas_dump_path, "r") as f:
-                ideas = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            ideas = {}
-
-        # Update with new idea
-        ideas[idea_name] = {
-            "description": summary,
-            "pseudo_code": pseudo_code,
-            "source": {
-                "title": paper.get("title", "Untitled"),
-                "authors": paper.get("authors", []),
-                "url": paper.get("pdf_url", ""),
-                "local_pdf_path": pdf_path
-            },
-            "learnings_from_testing": []
+    def _save_ideas(self, ideas: Dict[str, tuple], paper: Dict, pdf_path: Optional[str]):
+        """Append all ideas extracted from one paper to the idea store in a single write"""
+        source = {
+            "title": paper.get("title", "Untitled"),
+            "authors": paper.get("authors", []),
+            "url": paper.get("pdf_url", ""),
+            "local_pdf_path": pdf_path
         }
+        records = [
+            (idea_name, {
+                "description": summary,
+                "pseudo_code": pseudo_code,
+                "source": source,
+                "learnings_from_testing": []
+            })
+            for idea_name, (summary, pseudo_code) in ideas.items()
+        ]
+        saved = self.idea_store.upsert_many(records)
+        print(f"[ResearchAgent] Saved {saved} ideas from: {source['title']}")
 
-        # Save updated ideas atomically
-        tmp_path = self.ideas_dump_path + ".tmp"
-        with open(tmp_path, "w") as f:
-            json.dump(ideas, f, indent=2)
-        os.replace(tmp_path, self.ideas_dump_path)
-
-        abs_path = os.path.abspath(self.ideas_dump_path)
+    def export_ideas(self):
+        """
+        Compact the idea log and write it out in the research_ideas.json format. Edits made to
+        research_ideas.json since the last export are merged into the log first, not overwritten.
+        """
+        self.idea_store.merge_json(self.ideas_dump_path)
+        self.idea_store.compact()
+        self.idea_store.export_json(self.ideas_dump_path)
         abs_path = os.path.abspath(self.ideas_dump_path)
-        print(f"[ResearchAgent] Research ideas saved at: {abs_path}")
-        print(f"[ResearchAgent] Research ideas content:\n{json.dumps(ideas, indent=2)}")
\ No newline at end of file
+        print(f"[ResearchAgent] {len(self.idea_store)} research ideas saved at: {abs_path}")
@@ -1,9 +1,11 @@
 import os
-import json
-from datetime import datetime
-from typing import Optional, Dict, Any
+import asyncio
+import shutil
+import uuid
+from typing import Optional, Dict, Any, List, Tuple
 
 from .base import BaseAgent
+from AgenticDeveloper.tools.version_store import get_version_store
 
 class StrategyDeveloperAgent(BaseAgent):
     """
@@ -13,19 +15,55 @@ class StrategyDeveloperAgent(BaseAgent):
 
     def __init__(self, config_path: Optional[str] = None, config: Optional[Dict] = None):
         super().__init__(config_path, config)
+        self._backtester = None
+        self._scheduler = None
+        self._scheduler_loop = None
+
+    @property
+    def backtester(self):
+        """BacktesterAgent reused across attempts, sharing this agent's config"""
+        if self._backtester is None:
+            from AgenticDeveloper.agents.backtester import BacktesterAgent
+            self._backtester = BacktesterAgent(config=self.config)
+        return self._backtester
+
+    def _get_scheduler(self):
+        """
+        BacktestScheduler for this agent's Lean runs on the running event loop, so strategies
+        developed concurrently (arun_many, develop_candidates) share one backtest limit
+        """
+        from AgenticDeveloper.agents.backtest_scheduler import BacktestScheduler
+
+        loop = asyncio.get_running_loop()
+        if self._scheduler is None or self._scheduler_loop is not loop:
+            self._scheduler = BacktestScheduler(self.backtester)
+            self._scheduler_loop = loop
+        return self._scheduler
 
     def run(self, instructions: str, strategy_dir: str, previous_strategy_path: str = None) -> str:
+        """
+        Synchronous entry point: runs arun in a new event loop.
+        From async code (e.g. alongside IdeaResearcherAgent or BacktestAnalyzerAgent) await arun instead.
+        """
+        return asyncio.run(self.arun(instructions, strategy_dir, previous_strategy_path))
+
+    async def arun_many(self, tasks: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Develop several strategies concurrently, e.g. [{"instructions": ..., "strategy_dir": ...}, ...].
+        LLM calls and backtests of different strategies overlap; Lean runs share the scheduler's limit.
+        Returns the arun result (or the exception) of each task, in order.
+        """
+        return await asyncio.gather(*(self.arun(**task) for task in tasks), return_exceptions=True)
+
+    async def arun(self, instructions: str, strategy_dir: str, previous_strategy_path: str = None) -> str:
         """
         Main entry point to generate or modify a strategy based on instructions.
         Optionally provide a previous strategy file path to include its code in the prompt.
         Returns the path to the saved strategy file.
         """
-        import asyncio
-        from AgenticDeveloper.agents.backtester import BacktesterAgent
-
         base_instruction = 'Write Quantconnect Lean compatible code in python, that does the follwing:'
         instructions = base_instruction + instructions + ' | Do not forget to check your code and debug it before you return it.'
-        self._create_project_if_needed(strategy_dir)
+        await asyncio.to_thread(self._create_project_if_needed, strategy_dir)
 
         previous_code = ""
         if previous_strategy_path and os.path.exists(previous_strategy_path):
@@ -53,15 +91,20 @@ class StrategyDeveloperAgent(BaseAgent):
                 if previous_code:
                     prompt += f"\n\nHere is the previous strategy code:\n{previous_code}"
 
-            # Generate strategy code
-            extracted_code, full_response = self.generate_strategy_code(prompt)
+            candidates = int(self.config.get("agents", {}).get("strategy_developer", {}).get("candidates", 1))
+            if candidates > 1:
+                # Best-of-N: generate, check and backtest several candidates concurrently
+                final_path, extracted_code, result = await self.develop_candidates(prompt, strategy_dir, candidates)
+            else:
+                # Generate strategy code
+                extracted_code, full_response = await self.agenerate_strategy_code(prompt)
 
-            # Save strategy version (overwrite or new version)
-            final_path = self.save_strategy_version(extracted_code, strategy_dir, llm_full_response=full_response)
-            print(f"[StrategyDeveloperAgent] Saved strategy version at: {final_path}")
+                # Save strategy version (overwrite or new version)
+                final_path = self.save_strategy_version(extracted_code, strategy_dir, llm_full_response=full_response)
+                print(f"[StrategyDeveloperAgent] Saved strategy version at: {final_path}")
 
-            # Run backtest
-            result = self.test_generated_code(final_path)
+                # Run backtest
+                result = await self.atest_generated_code(final_path)
             print({'result':result})
 
             if result.get("backtest_successful"):
@@ -77,103 +120,188 @@ class StrategyDeveloperAgent(BaseAgent):
             for err in errors:
                 print(f" - {err}")
 
+        # One full rewrite per run, for readers of the old version_history.json format
+        get_version_store(strategy_dir).export_json()
         return final_path
 
     def test_generated_code(self, python_file_path: str) -> dict:
+        """Synchronous version of atest_generated_code"""
+        return asyncio.run(self.atest_generated_code(python_file_path))
+
+    async def atest_generated_code(self, python_file_path: str) -> dict:
         """
-        Run a lean backtest on the specified python file.
+        Run a lean backtest on the specified python file (through the shared BacktestScheduler).
+        The code is first checked statically (see validate_code) and, if
+        agents.strategy_developer.smoke_test is enabled, smoke-tested in-process; Lean is
+        only run when those pass.
         Returns a dict with backtest results.
         """
-        import asyncio
-        from AgenticDeveloper.agents.backtester import BacktesterAgent
+        with open(python_file_path, "r") as f:
+            validation = await self.validate_code(f.read(), os.path.basename(python_file_path))
+        if not validation["backtest_successful"]:
+            return validation
 
-        backtester = BacktesterAgent()
-        result = asyncio.run(backtester.run(python_file_path))
-        return result
+        if self.config.get("agents", {}).get("strategy_developer", {}).get("smoke_test", True):
+            smoke_result = await self.backtester.run(python_file_path, mode="smoke")
+            if not smoke_result["backtest_successful"]:
+                return smoke_result
 
+        return await self._get_scheduler().submit(python_file_path)
 
-    def generate_strategy_code(self, instructions: str) -> (str):
+    async def develop_candidates(self, prompt: str, strategy_dir: str, n: int) -> Tuple[str, str, Dict]:
         """
-        Generate QuantConnect Lean strategy code from instructions using LLM.
-        Returns a tuple: (extracted_code, full_response)
+        Best-of-N: request n candidates from the LLM concurrently, check them all in parallel
+        (compile, plus a smoke test if agents.strategy_developer.smoke_test is enabled) and
+        backtest only the passing ones with Lean, concurrently through the agent's BacktestScheduler.
+        Passing candidates are saved as strategy versions; of the successful backtests the one
+        with the best agents.strategy_developer.rank_by statistic wins. If no candidate passes
+        its checks, the first one is saved so its errors can drive the next attempt.
+        Returns (path, code, result) of the chosen candidate.
         """
-        import re
+        from AgenticDeveloper.tools.backtest_dedup import normalize_strategy_code
+        from AgenticDeveloper.tools.backtest_results import load_statistics
+
+        # Only the first request may be served from the response cache, the rest must be fresh samples
+        responses = await asyncio.gather(
+            *(self.agenerate_strategy_code(prompt, use_cache=(i == 0)) for i in range(n)), return_exceptions=True
+        )
+        # Candidates that differ only in comments, docstrings or formatting are checked once
+        candidates: List[Tuple[str, str]] = []
+        seen = set()
+        for response in responses:
+            if isinstance(response, BaseException):
+                print(f"[StrategyDeveloperAgent] Candidate generation failed: {response}")
+                continue
+            normalized = normalize_strategy_code(response[0])
+            if normalized not in seen:
+                seen.add(normalized)
+                candidates.append(response)
+        if not candidates:
+            raise ValueError("LLM did not return a valid python code block for any candidate.")
+
+        checks = await asyncio.gather(*(self.check_candidate(code, strategy_dir) for code, _ in candidates))
+        passing = [(candidate, check) for candidate, check in zip(candidates, checks) if check["backtest_successful"]]
+        print(f"[StrategyDeveloperAgent] {len(passing)} of {len(candidates)} distinct candidates passed the checks")
+        if not passing:
+            code, response = candidates[0]
+            path = self.save_strategy_version(code, strategy_dir, llm_full_response=response)
+            return path, code, checks[0]
+
+        saved = [
+            (self.save_strategy_version(code, strategy_dir, llm_full_response=response), code)
+            for (code, response), _ in passing
+        ]
+        results = await self._get_scheduler().run_many([path for path, _ in saved])
+
+        rank_by = self.config.get("agents", {}).get("strategy_developer", {}).get("rank_by", "Sharpe Ratio")
+        best = None
+        for path, code in saved:
+            result = results[path]
+            if isinstance(result, BaseException):
+                result = {"folder_path": None, "backtest_successful": False, "errors": [repr(result)]}
+            score = float("-inf")
+            if result.get("backtest_successful"):
+                value = load_statistics(result["folder_path"]).get(rank_by) if result.get("folder_path") else None
+                score = value if isinstance(value, (int, float)) else float("-inf")
+            print(f"[StrategyDeveloperAgent] Candidate {path}: successful={result.get('backtest_successful')} {rank_by}={score}")
+            # Successful runs always beat failed ones; ties keep the earlier candidate
+            key = (bool(result.get("backtest_successful")), score)
+            if best is None or key > best[0]:
+                best = (key, path, code, result)
+        return best[1], best[2], best[3]
+
+    async def check_candidate(self, code: str, strategy_dir: str) -> Dict:
+        """
+        Cheap checks of generated code before Lean: it must pass validate_code and, if
+        agents.strategy_developer.smoke_test is enabled, a smoke backtest run on a
+        temporary copy of the project. Returns a result dict like BacktesterAgent.run.
+        """
+        from AgenticDeveloper.agents.backtest_scheduler import BacktestScheduler
+
+        validation = await self.validate_code(code)
+        if not validation["backtest_successful"]:
+            return validation
+        if not self.config.get("agents", {}).get("strategy_developer", {}).get("smoke_test", True):
+            return validation
+
+        workspace = BacktestScheduler.materialize_project(
+            os.path.join(strategy_dir, "main.py"), f"candidate-{uuid.uuid4().hex[:8]}", code=code
+        )
+        try:
+            return await self.backtester.run(workspace, mode="smoke")
+        finally:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    async def validate_code(self, code: str, filename: str = "main.py") -> Dict:
+        """
+        Static checks of generated code (tools.code_validator): syntax, a QCAlgorithm subclass
+        with Initialize, undefined names and attributes against the Lean API, and mixed
+        PascalCase/snake_case API usage. With agents.strategy_developer.validate disabled only
+        compilation is checked. Returns a result dict like BacktesterAgent.run; when the code
+        fails, its errors are followed by the warnings so both reach the retry prompt.
+        """
+        from AgenticDeveloper.tools.code_validator import get_lean_api_surface, validate_strategy_code
 
+        if self.config.get("agents", {}).get("strategy_developer", {}).get("validate", True):
+            api_config = self.config.get("tools", {}).get("code_validator", {})
+            # The first call may parse the quantconnect-stubs, which takes a few seconds
+            api = await asyncio.to_thread(get_lean_api_surface, api_config)
+            outcome = validate_strategy_code(code, filename, api=api)
+        else:
+            try:
+                compile(code, filename, "exec")
+                outcome = {"success": True, "errors": [], "warnings": []}
+            except SyntaxError as e:
+                outcome = {"success": False, "errors": [f"{filename}:{e.lineno}: SyntaxError: {e.msg}"], "warnings": []}
+
+        for warning in outcome["warnings"]:
+            print(f"[StrategyDeveloperAgent] Validation warning: {warning}")
+        errors = outcome["errors"] + outcome["warnings"] if not outcome["success"] else []
+        return {"folder_path": None, "backtest_successful": outcome["success"], "errors": errors,
+                "aborted": False, "timed_out": False, "warnings": outcome["warnings"]}
+
+    async def agenerate_strategy_code(self, instructions: str, use_cache: bool = True) -> Tuple[str, str]:
+        """
+        Generate QuantConnect Lean strategy code from instructions using the LLM.
+        Returns a tuple: (extracted_code, full_response). With use_cache=False the response cache
+        is bypassed, so concurrent calls with the same prompt return independent samples.
+        """
         max_attempts = 3
-        attempt = 0
-
-        while attempt < max_attempts:
-            attempt += 1
-            prompt = self._create_strategy_prompt(instructions)
-            response = self.llm.invoke(prompt)
-
-            # Extract python code block
-            code_blocks = re.findall(r"```python(.*?)```", response, re.DOTALL | re.IGNORECASE)
-            if code_blocks:
-                code = code_blocks[0].strip()
+        prompt = self._create_strategy_prompt(instructions)
+        for attempt in range(1, max_attempts + 1):
+            # A response without code is not cached, so a retry asks the model again
+            response = await self.llm.ainvoke(
+                prompt, use_cache=use_cache, validate=lambda text: self._extract_code(text) is not None
+            )
+            code = self._extract_code(response)
+            if code is not None:
                 return code, response
-            else:
-                print(f"[StrategyDeveloperAgent] No python code block found in LLM response, retrying ({attempt}/{max_attempts})...")
+            print(f"[StrategyDeveloperAgent] No python code block found in LLM response, retrying ({attempt}/{max_attempts})...")
 
         raise ValueError("LLM did not return a valid python code block after multiple attempts.")
 
+    @staticmethod
+    def _extract_code(response: str) -> Optional[str]:
+        """The first ```python block of an LLM response, or None"""
+        import re
+
+        code_blocks = re.findall(r"```python(.*?)```", response, re.DOTALL | re.IGNORECASE)
+        return code_blocks[0].strip() if code_blocks else None
+
     def save_strategy_version(self, strategy_code: str, strategy_dir: str, llm_full_response: str = None) -> str:
         """
         Save the generated strategy code with a new version number.
-        Also update version_history.json metadata.
-        """
-        os.makedirs(strategy_dir, exist_ok=True)
-        version = self._get_new_version(strategy_dir)
-        filename = f"strategy_v{version}.py"
-        path = os.path.join(strategy_dir, filename)
-        with open(path, "w") as f:
-            f.write(strategy_code)
-
-        # Update version history metadata
-        history_path = os.path.join(strategy_dir, "version_history.json")
-        if os.path.exists(history_path):
-            with open(history_path, "r") as f:
-                history = json.load(f)
-        else:
-            history = []
-
-        entry = {
-            "version": version,
-            "file": filename,
-            "timestamp": datetime.now().isoformat(),
-            "description": "Generated by StrategyDeveloperAgent"
-        }
-        if llm_full_response:
-            entry["llm_full_response"] = llm_full_response
-
-        history.append(entry)
-
-        with open(history_path, "w") as f:
-            json.dump(history, f, indent=2)
-
-        return path
+        The version is appended to the strategy's VersionStore (version_history.jsonl, with the
+        LLM response stored compressed out of line); arun exports version_history.json when done.
+        """
+        entry = get_version_store(strategy_dir).add(strategy_code, llm_response=llm_full_response)
+        return entry["path"]
 
     def _get_new_version(self, strategy_dir: str) -> str:
         """
-        Determine the next version number based on existing files.
-        """
-        existing_versions = []
-        for fname in os.listdir(strategy_dir):
-            if fname.startswith("strategy_v") and fname.endswith(".py"):
-                try:
-                    ver = fname[len("strategy_v"):-3]
-                    existing_versions.append(ver)
-                except:
-                    continue
-        # Sort versions
-        if not existing_versions:
-            return "1_0_0"
-        else:
-            # Assuming semantic versioning major_minor_patch with underscores
-            latest = sorted(existing_versions, key=lambda s: list(map(int, s.split('_'))))[-1]
-            major, minor, patch = map(int, latest.split('_'))
-            patch += 1
-            return f"{major}_{minor}_{patch}"
+        Determine the next version number from the strategy's VersionStore.
+        """
+        return get_version_store(strategy_dir).next_version()
 
     def _create_project_if_needed(self, strategy_dir: str):
         """
@@ -9,6 +9,7 @@ setup(
         "langchain-core>=0.1.0",
         "langchain-community>=0.0.10",
         "openai>=1.12.0",
+        "httpx>=0.25.0",
         "ollama>=0.1.6",
         "python-dotenv>=1.0.0",
         "pydantic>=2.5.0",
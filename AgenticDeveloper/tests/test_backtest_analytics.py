@@ -0,0 +1,91 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.backtest_analyzer import BacktestAnalyzerAgent
+from tools.backtest_analytics import compute_analytics, format_analytics, load_charts
+
+METRICS = {name: "1" for name in [
+    "Compounding Annual Return", "Net Profit", "Drawdown", "Sharpe Ratio", "Sortino Ratio", "Win Rate", "Loss Rate",
+    "Total Orders", "Alpha", "Beta", "Information Ratio", "Annual Standard Deviation", "Tracking Error",
+    "Treynor Ratio", "Portfolio Turnover"]}
+
+
+def epoch(day):
+    return int(pd.Timestamp(day).timestamp())
+
+
+@pytest.fixture
+def backtest_dir(tmp_path):
+    days = pd.bdate_range("2021-01-01", "2022-06-30")
+    equity = 100000 * np.exp(np.cumsum(np.random.default_rng(3).normal(0.0004, 0.01, len(days))))
+    equity[100:130] *= 0.85  # a visible drawdown that recovers
+    charts = {
+        "Strategy Equity": {"series": {"Equity": {"values": [
+            [epoch(d), v, v, v, v] for d, v in zip(days, equity)
+        ]}}},
+        "Exposure": {"series": {
+            "Equity - Long Ratio": {"values": [{"x": epoch(d), "y": 0.5 if i % 2 else 0} for i, d in enumerate(days)]},
+        }},
+        "Portfolio Turnover": {"series": {"Portfolio Turnover": {"values": [[epoch(d), 0.02] for d in days]}}},
+    }
+    (tmp_path / "1710.json").write_text(json.dumps({"charts": charts}))
+    (tmp_path / "results.json").write_text(json.dumps({"metrics": METRICS}))
+    events = []
+    for i, day in enumerate(pd.bdate_range("2021-02-01", periods=20, freq="7B")):
+        direction = "buy" if i % 2 == 0 else "sell"
+        price = 100 + (i % 4)
+        events.append({"symbolValue": "SPY", "status": "filled", "direction": direction,
+                       "fillQuantity": 10 if direction == "buy" else -10, "fillPrice": price, "time": epoch(day)})
+    (tmp_path / "1710-order-events.json").write_text(json.dumps(events))
+    return tmp_path
+
+
+def test_load_charts_handles_both_value_formats(backtest_dir):
+    charts = load_charts(str(backtest_dir))
+    assert len(charts["Strategy Equity"]["Equity"]) == len(pd.bdate_range("2021-01-01", "2022-06-30"))
+    assert charts["Exposure"]["Equity - Long Ratio"].iloc[1] == 0.5
+
+
+def test_compute_analytics(backtest_dir):
+    from tools.order_events import summarize_order_events
+    summary = summarize_order_events(str(backtest_dir / "1710-order-events.json"), include_trades=True)
+    analytics = compute_analytics(str(backtest_dir), order_summary=summary, trades=summary.pop("closed_trades"))
+
+    drawdown = analytics["drawdown"]
+    assert drawdown["max"] <= -0.1
+    assert drawdown["worst_periods"][0]["depth"] == drawdown["max"]
+    assert drawdown["rolling"]["worst"] == pytest.approx(drawdown["max"], abs=0.05)
+
+    monthly = analytics["monthly_returns"]
+    assert sorted(monthly["table"]) == [2021, 2022]
+    assert monthly["table"][2022][6:] == [None] * 6
+
+    trades = analytics["trades"]
+    assert trades["trades"] == 10
+    assert [b["trades"] for b in trades["duration_buckets"]] == [0, 0, 10, 0, 0]
+    assert analytics["exposure"]["invested_fraction"] == pytest.approx(0.5, abs=0.01)
+    assert analytics["turnover"]["mean"] == pytest.approx(0.02)
+
+
+def test_format_analytics_respects_token_budget(backtest_dir):
+    analytics = compute_analytics(str(backtest_dir))
+    full = format_analytics(analytics, max_tokens=10000)
+    assert "Drawdown: max" in full and "\n2021 " in full and "\n2022 " in full and "Portfolio turnover" in full
+
+    small = format_analytics(analytics, max_tokens=150)
+    assert len(small) / 4 <= 150
+    # Older monthly rows and low-priority sections go first; drawdown stays
+    assert "Drawdown: max" in small and "\n2021 " not in small and "\n2022 " in small
+    assert format_analytics({}) == ""
+
+
+def test_analyzer_prompt_includes_analytics(backtest_dir):
+    agent = BacktestAnalyzerAgent(config={"agents": {"backtest_analyzer": {"analytics_max_tokens": 400}}})
+    results = agent._load_backtest_results(str(backtest_dir))
+    assert results["order_summary"]["trades"] == 10
+    assert "closed_trades" not in results["order_summary"]
+    prompt = agent._create_analysis_prompt(results)
+    assert "Detailed analytics" in prompt and "Trades: 10 closed" in prompt
@@ -0,0 +1,147 @@
+import asyncio
+import json
+
+import pytest
+
+from agents.backtest_analyzer import ANALYSIS_FILE, BATCH_SUMMARY_FILE, BacktestAnalyzerAgent
+from agents.llm_cache import CachedLLM, LLMResponseCache
+
+METRIC_NAMES = [
+    "Compounding Annual Return", "Net Profit", "Drawdown", "Sharpe Ratio", "Sortino Ratio", "Win Rate", "Loss Rate",
+    "Total Orders", "Alpha", "Beta", "Information Ratio", "Annual Standard Deviation", "Tracking Error",
+    "Treynor Ratio", "Portfolio Turnover"]
+
+ANALYSIS = {
+    "metrics_analysis": {},
+    "trade_analysis": {},
+    "strategy_analysis": {"overall_assessment": "fine"},
+    "improvement_suggestions": {"performance": ["a", "b"], "risk_management": ["c"]},
+}
+
+
+class FakeLLM:
+    def __init__(self, delay=0.02, reply=None):
+        self.delay = delay
+        self.reply = json.dumps(ANALYSIS) if reply is None else reply
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ainvoke(self, prompt, use_cache=True, validate=None):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return self.reply
+
+
+def make_backtest(root, name, sharpe, drawdown):
+    folder = root / "backtests" / name
+    (folder / "code").mkdir(parents=True)
+    metrics = {metric: "1" for metric in METRIC_NAMES}
+    metrics.update({"Sharpe Ratio": str(sharpe), "Drawdown": f"{drawdown}%"})
+    (folder / "results.json").write_text(json.dumps({"metrics": metrics}))
+    (folder / "code" / "main.py").write_text(f"# {name}\n")
+    return folder
+
+
+@pytest.fixture
+def strategy_dir(tmp_path):
+    make_backtest(tmp_path, "2025-01-01_00-00-00", 0.5, 10)
+    make_backtest(tmp_path, "2025-01-02_00-00-00", 1.5, 25)
+    make_backtest(tmp_path, "2025-01-03_00-00-00", 1.0, 5)
+    (tmp_path / "backtests" / "empty").mkdir()
+    return tmp_path
+
+
+def make_agent(max_concurrent=2):
+    agent = BacktestAnalyzerAgent(config={"agents": {"backtest_analyzer": {"batch": {"max_concurrent": max_concurrent}}}})
+    agent.llm = FakeLLM()
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_run_batch_bounds_concurrency_and_compares(strategy_dir):
+    agent = make_agent(max_concurrent=2)
+    summary = await agent.run_batch(str(strategy_dir))
+
+    assert agent.llm.calls == 3 and agent.llm.max_in_flight == 2
+    assert summary["analyzed"] == 3 and summary["up_to_date"] == 0 and summary["failed"] == []
+    assert [b["run_name"] for b in summary["backtests"]] == [
+        "2025-01-02_00-00-00", "2025-01-03_00-00-00", "2025-01-01_00-00-00"]
+    assert summary["best"]["Sharpe Ratio"] == {"run_name": "2025-01-02_00-00-00", "value": 1.5}
+    assert summary["best"]["Drawdown"] == {"run_name": "2025-01-03_00-00-00", "value": 5.0}
+    assert summary["backtests"][0]["suggestions"] == 3
+    assert summary["table"].splitlines()[1].startswith("2025-01-02_00-00-00")
+    stored = json.loads((strategy_dir / "backtests" / BATCH_SUMMARY_FILE).read_text())
+    assert stored["best"] == summary["best"]
+
+
+@pytest.mark.asyncio
+async def test_run_batch_skips_up_to_date_analyses(strategy_dir):
+    await make_agent().run_batch(str(strategy_dir))
+
+    agent = make_agent()
+    summary = await agent.run_batch(str(strategy_dir / "backtests"))
+    assert agent.llm.calls == 0 and summary["up_to_date"] == 3
+
+    # Changed results invalidate only that backtest's analysis
+    changed = strategy_dir / "backtests" / "2025-01-01_00-00-00"
+    results = json.loads((changed / "results.json").read_text())
+    results["metrics"]["Sharpe Ratio"] = "2.0"
+    (changed / "results.json").write_text(json.dumps(results))
+    summary = await agent.run_batch(str(strategy_dir))
+    assert agent.llm.calls == 1 and summary["analyzed"] == 1 and summary["up_to_date"] == 2
+    assert summary["backtests"][0]["run_name"] == "2025-01-01_00-00-00"
+    assert "input_hash" in json.loads((changed / ANALYSIS_FILE).read_text())
+
+    summary = await agent.run_batch(str(strategy_dir), force=True)
+    assert agent.llm.calls == 4 and summary["analyzed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_run_batch_records_failures(strategy_dir):
+    (strategy_dir / "backtests" / "2025-01-03_00-00-00" / "results.json").write_text(json.dumps({"metrics": {}}))
+    summary = await make_agent().run_batch(str(strategy_dir))
+    assert summary["failed"] == ["2025-01-03_00-00-00"] and summary["analyzed"] == 2
+    failed = next(b for b in summary["backtests"] if b["status"] == "failed")
+    assert "error" in failed
+
+
+@pytest.mark.asyncio
+async def test_run_batch_retries_unparseable_analyses(strategy_dir):
+    agent = make_agent()
+    agent.llm.reply = "I cannot answer in JSON today"
+    summary = await agent.run_batch(str(strategy_dir))
+    assert summary["analyzed"] == 3
+    stored = json.loads((strategy_dir / "backtests" / "2025-01-01_00-00-00" / ANALYSIS_FILE).read_text())
+    assert stored["input_hash"] is None
+    assert stored["analysis"]["metrics_analysis"] == {"error": "Failed to parse metrics analysis"}
+
+    # The fallback analyses are not up to date: the next batch asks the LLM again
+    agent = make_agent()
+    summary = await agent.run_batch(str(strategy_dir))
+    assert agent.llm.calls == 3 and summary["analyzed"] == 3 and summary["up_to_date"] == 0
+
+    summary = await agent.run_batch(str(strategy_dir))
+    assert agent.llm.calls == 3 and summary["up_to_date"] == 3
+
+
+@pytest.mark.asyncio
+async def test_unparseable_replies_are_not_served_from_the_response_cache(strategy_dir, tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm_cache" / "responses.sqlite"))
+    model = FakeLLM(reply="I cannot answer in JSON today")
+    agent = make_agent()
+    agent.llm = CachedLLM(model, cache, provider="fake", model="fake")
+    await agent.run_batch(str(strategy_dir))
+    assert cache.stats()["entries"] == 0
+
+    # The retry reaches the model, and its parseable replies are cached as usual
+    model.reply = json.dumps(ANALYSIS)
+    summary = await agent.run_batch(str(strategy_dir))
+    assert model.calls == 6 and summary["analyzed"] == 3
+    stored = json.loads((strategy_dir / "backtests" / "2025-01-01_00-00-00" / ANALYSIS_FILE).read_text())
+    assert stored["analysis"] == ANALYSIS and stored["input_hash"]
+    assert cache.stats()["entries"] == 3
+    cache.close()
@@ -0,0 +1,50 @@
+from tools.backtest_dedup import BacktestResultCache, normalize_strategy_code, strategy_fingerprint
+
+CODE = '''
+from AlgorithmImports import *
+
+class Momentum(QCAlgorithm):
+    """Buys SPY"""
+
+    def Initialize(self):
+        self.SetStartDate(2020, 1, 1)
+        self.AddEquity("SPY")
+'''
+
+REFORMATTED = '''from AlgorithmImports import *
+class Momentum(QCAlgorithm):
+    # no docstring, different spacing
+    def Initialize( self ):
+        self.SetStartDate(2020,1,1)   # start
+
+
+        self.AddEquity('SPY')
+'''
+
+
+def test_formatting_comments_and_docstrings_do_not_change_the_fingerprint():
+    assert normalize_strategy_code(CODE) == normalize_strategy_code(REFORMATTED)
+    config = {"parameters": {"fast": "10"}, "local-id": 1, "cloud-id": 2}
+    assert strategy_fingerprint(CODE, config) == strategy_fingerprint(REFORMATTED, {"parameters": {"fast": "10"}})
+
+
+def test_code_config_date_range_and_mode_change_the_fingerprint():
+    base = strategy_fingerprint(CODE, {"parameters": {"fast": "10"}})
+    assert strategy_fingerprint(CODE.replace("2020", "2021"), {"parameters": {"fast": "10"}}) != base
+    assert strategy_fingerprint(CODE.replace("SPY", "QQQ"), {"parameters": {"fast": "10"}}) != base
+    assert strategy_fingerprint(CODE, {"parameters": {"fast": "20"}}) != base
+    assert strategy_fingerprint(CODE, {"parameters": {"fast": "10"}}, mode="cloud") != base
+    # Unparsable code falls back to its text
+    assert normalize_strategy_code("def broken(:\n") == "def broken(:"
+
+
+def test_result_cache_persists_and_drops_deleted_folders(tmp_path):
+    folder = tmp_path / "backtests" / "run"
+    folder.mkdir(parents=True)
+    path = str(tmp_path / "cache.jsonl")
+    BacktestResultCache(path).put("k", "strategy_v1_0_0.py", {"folder_path": str(folder), "backtest_successful": True})
+
+    cache = BacktestResultCache(path)
+    assert cache.get("k")["result"]["folder_path"] == str(folder)
+    folder.rmdir()
+    assert cache.get("k") is None
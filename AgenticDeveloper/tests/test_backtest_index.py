@@ -0,0 +1,94 @@
+import json
+import os
+import time
+
+import pytest
+
+from tools.backtest_index import BacktestIndex, get_backtest_index, update_backtest_index
+from tools.backtest_results import load_statistics, parse_statistic
+
+
+def make_run(project, name, sharpe, code="# v1", summary=True):
+    folder = project / "backtests" / name
+    (folder / "code").mkdir(parents=True)
+    (folder / "code" / "main.py").write_text(code)
+    statistics = {"Sharpe Ratio": str(sharpe), "Drawdown": "10.5%", "Net Profit": "$1,250.50", "Start Equity": "100000"}
+    filename = "1710-summary.json" if summary else "1710.json"
+    (folder / filename).write_text(json.dumps({"statistics": statistics}))
+    return folder
+
+
+@pytest.fixture
+def strategies(tmp_path):
+    project = tmp_path / "Strategies" / "AgenticDev" / "Momentum"
+    project.mkdir(parents=True)
+    (project / "strategy_v1_0_0.py").write_text("# v1")
+    (project / "strategy_v1_0_1.py").write_text("# v2")
+    make_run(project, "2025-01-01_10-00-00", 0.5)
+    make_run(project, "2025-01-02_10-00-00", 1.5, code="# v2")
+    make_run(project, "2025-01-03_10-00-00", 0.9, code="# v2", summary=False)
+    other = tmp_path / "Strategies" / "SMA"
+    make_run(other, "2025-01-01_09-00-00", 2.0, code="# unknown")
+    return tmp_path / "Strategies"
+
+
+def test_parse_statistic():
+    assert parse_statistic("12.5%") == 12.5
+    assert parse_statistic("$1,250.50") == 1250.5
+    assert parse_statistic("-0.3") == -0.3
+    assert parse_statistic("N/A") == "N/A"
+
+
+def test_load_statistics_prefers_summary(tmp_path):
+    (tmp_path / "1710.json").write_text(json.dumps({"statistics": {"Sharpe Ratio": "1"}}))
+    (tmp_path / "1710-summary.json").write_text(json.dumps({"statistics": {"Sharpe Ratio": "2"}}))
+    assert load_statistics(str(tmp_path)) == {"Sharpe Ratio": 2.0}
+    assert load_statistics(str(tmp_path / "missing")) == {}
+
+
+def test_index_and_query(strategies, tmp_path):
+    index = BacktestIndex(str(tmp_path / "index.sqlite"))
+    assert index.update(str(strategies)) == {"added": 4, "updated": 0, "removed": 0, "unchanged": 0}
+
+    top = index.top("Sharpe Ratio", 2)
+    assert [(row["strategy"], row["value"]) for row in top] == [("SMA", 2.0), (os.path.join("AgenticDev", "Momentum"), 1.5)]
+    assert top[1]["version"] == "strategy_v1_0_1.py"
+
+    versions = index.top("Sharpe Ratio", 10, versions_only=True)
+    assert [(row["version"], row["value"]) for row in versions] == [("strategy_v1_0_1.py", 1.5), ("strategy_v1_0_0.py", 0.5)]
+    assert index.top("Drawdown", strategy="SMA")[0]["value"] == 10.5
+
+    run = index.get(str(strategies / "SMA" / "backtests" / "2025-01-01_09-00-00"))
+    assert run["statistics"]["Net Profit"] == 1250.5 and run["backtest_id"] == "1710"
+
+
+def test_update_is_incremental(strategies, tmp_path):
+    index = BacktestIndex(str(tmp_path / "index.sqlite"))
+    index.update(str(strategies))
+    assert index.update(str(strategies))["unchanged"] == 4
+
+    folder = strategies / "SMA" / "backtests" / "2025-01-01_09-00-00"
+    summary = folder / "1710-summary.json"
+    summary.write_text(json.dumps({"statistics": {"Sharpe Ratio": "3.0"}}))
+    later = time.time() + 10
+    os.utime(summary, (later, later))
+    for path in (strategies / "AgenticDev" / "Momentum" / "backtests").iterdir():
+        if path.name.startswith("2025-01-01"):
+            for child in sorted(path.rglob("*"), reverse=True):
+                child.unlink() if child.is_file() else child.rmdir()
+            path.rmdir()
+
+    assert index.update(str(strategies)) == {"added": 0, "updated": 1, "removed": 1, "unchanged": 2}
+    assert index.top("Sharpe Ratio", 1)[0]["value"] == 3.0
+    assert len(index.runs()) == 3
+    assert index.query("SELECT COUNT(*) AS n FROM metrics WHERE folder_path = ?", [str(folder)])[0]["n"] == 1
+
+    # A fresh instance reuses the stored index
+    assert BacktestIndex(str(tmp_path / "index.sqlite")).update(str(strategies))["unchanged"] == 3
+
+
+def test_update_backtest_index_uses_strategies_root(strategies, tmp_path):
+    config = {"path": str(tmp_path / "config_index.sqlite"), "strategies_root": str(strategies)}
+    assert update_backtest_index(config) == {"added": 4, "updated": 0, "removed": 0, "unchanged": 0}
+    assert get_backtest_index(config).top("Sharpe Ratio", 1)[0]["strategy"] == "SMA"
+    get_backtest_index(config).close()
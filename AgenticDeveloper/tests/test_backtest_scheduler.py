@@ -0,0 +1,143 @@
+import json
+import asyncio
+import os
+import pytest
+from agents.backtest_scheduler import BacktestScheduler
+
+
+class FakeBacktester:
+    def __init__(self, delay=0.05):
+        self.config = {"tools": {"lean_cli": {"max_concurrent_backtests": 2}}}
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.calls = []
+
+    async def run(self, strategy_path, mode="local", output_dir=None, **kwargs):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        main_py = os.path.join(strategy_path, "main.py")
+        code = open(main_py).read() if os.path.isdir(strategy_path) else None
+        self.calls.append((strategy_path, output_dir, code))
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return {"folder_path": output_dir, "backtest_successful": True, "errors": []}
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "config.json").write_text('{"parameters": {}, "local-id": 1}')
+    (tmp_path / "main.py").write_text("# main")
+    for i in range(4):
+        (tmp_path / f"strategy_v1_0_{i}.py").write_text(f"# version {i}")
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_versions_run_concurrently_in_isolated_projects(project, monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    backtester = FakeBacktester()
+    scheduler = BacktestScheduler(backtester, max_concurrent=2)
+    results = await scheduler.run_versions(str(project))
+
+    assert len(results) == 4
+    assert backtester.peak == 2
+    assert sorted(code for _, _, code in backtester.calls) == [f"# version {i}" for i in range(4)]
+    assert len({output_dir for _, output_dir, _ in backtester.calls}) == 4
+    # Temporary project copies are removed once each job finishes
+    assert os.listdir(project / ".jobs") == []
+
+
+@pytest.mark.asyncio
+async def test_cancel_queued_and_running_jobs(project):
+    scheduler = BacktestScheduler(FakeBacktester(delay=10), max_concurrent=1)
+    running = scheduler.submit(str(project))
+    queued = scheduler.submit(str(project))
+    await asyncio.sleep(0.01)
+    assert scheduler.cancel(queued.job_id)
+    running.cancel()
+    results = await scheduler.gather()
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+
+def test_materialize_project_merges_parameters(project):
+    (project / "config.json").write_text('{"parameters": {"fast": "10", "slow": "30"}, "cloud-id": 7}')
+    workspace = BacktestScheduler.materialize_project(
+        str(project / "main.py"), "job1", code="# swept", config={"parameters": {"fast": "5"}}
+    )
+    assert open(os.path.join(workspace, "main.py")).read() == "# swept"
+    config = json.load(open(os.path.join(workspace, "config.json")))
+    assert config == {"parameters": {"fast": "5", "slow": "30"}}
+
+
+@pytest.mark.asyncio
+async def test_identical_versions_reuse_one_backtest(project, tmp_path, monkeypatch):
+    from tools.backtest_dedup import BacktestResultCache
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    (project / "strategy_v1_0_0.py").write_text("x = 1\n")
+    (project / "strategy_v1_0_1.py").write_text("# same strategy, reformatted\nx  =  1\n")
+    (project / "strategy_v1_0_2.py").write_text("x = 2\n")
+    (project / "strategy_v1_0_3.py").write_text('"""docstring"""\nx = 1\n')
+    backtester = FakeBacktester()
+    run = backtester.run
+
+    async def run_with_output(strategy_path, mode="local", output_dir=None, **kwargs):
+        os.makedirs(output_dir)
+        return await run(strategy_path, mode=mode, output_dir=output_dir, **kwargs)
+
+    backtester.run = run_with_output
+    cache = BacktestResultCache(str(tmp_path / "cache" / "results.jsonl"))
+    scheduler = BacktestScheduler(backtester, max_concurrent=4, result_cache=cache)
+
+    results = await scheduler.run_versions(str(project))
+
+    # v1_0_1 and v1_0_3 waited for the identical v1_0_0 instead of taking a slot
+    assert len(backtester.calls) == 2
+    reused = [path for path, result in results.items() if result.get("cached")]
+    assert sorted(os.path.basename(path) for path in reused) == ["strategy_v1_0_1.py", "strategy_v1_0_3.py"]
+    first = results[str(project / "strategy_v1_0_0.py")]
+    assert all(results[path]["folder_path"] == first["folder_path"] for path in reused)
+
+    # A later scheduler serves repeats from the persisted cache
+    later = BacktestScheduler(backtester, result_cache=BacktestResultCache(cache.path))
+    result = await later.submit(str(project / "strategy_v1_0_3.py"))
+    assert result["cached"] and len(backtester.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_identical_jobs_after_leader_fails_or_is_cancelled(project, tmp_path, monkeypatch):
+    from tools.backtest_dedup import BacktestResultCache
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    backtester = FakeBacktester()
+    run = backtester.run
+    outcomes = [False, True]
+
+    async def run_with_output(strategy_path, mode="local", output_dir=None, **kwargs):
+        os.makedirs(output_dir)
+        result = await run(strategy_path, mode=mode, output_dir=output_dir, **kwargs)
+        return {**result, "backtest_successful": outcomes.pop(0), "errors": []}
+
+    backtester.run = run_with_output
+    cache = BacktestResultCache(str(tmp_path / "cache" / "results.jsonl"))
+    scheduler = BacktestScheduler(backtester, max_concurrent=4, result_cache=cache)
+    main_py = str(project / "main.py")
+
+    # The failing leader's result is shared: Lean ran once for the three jobs
+    results = await asyncio.gather(*(scheduler.submit(main_py) for _ in range(3)))
+    assert len(backtester.calls) == 1
+    assert [result["backtest_successful"] for result in results] == [False, False, False]
+    assert [result.get("reused_from") for result in results] == [None, main_py, main_py]
+
+    # A cancelled leader hands over to exactly one waiter; the others reuse its result
+    jobs = [scheduler.submit(main_py) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    jobs[0].cancel()
+    results = await scheduler.gather(jobs)
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert len(backtester.calls) == 3
+    assert results[1]["backtest_successful"] and not results[1].get("cached")
+    assert results[2]["cached"] and results[2]["folder_path"] == results[1]["folder_path"]
@@ -1,5 +1,6 @@
 import pytest
 import os
+import asyncio
 from agents.backtester import BacktesterAgent
 
 @pytest.fixture
@@ -9,4 +10,90 @@ def backtester_agent():
 @pytest.mark.asyncio
 async def test_run_backtest_local(backtester_agent):
     result = await backtester_agent.run("Strategies/AgenticDev/FirstAutoStrategy/strategy_v1_0_2.py", mode="local")
-    print({'result': result})
\ No newline at end of file
+    print({'result': result})
+
+@pytest.mark.asyncio
+async def test_stream_backtest_parses_output_and_log(backtester_agent, tmp_path):
+    folder = tmp_path / "backtests" / "run"
+    folder.mkdir(parents=True)
+    script = (
+        f"echo 'Backtest output is stored in'; echo \"'{folder}'\"; "
+        f"printf 'ERROR: bad data\\n  at line 3\\n' > '{folder}/log.txt'; "
+        "echo 'Traceback (most recent call last):'; echo '  File main.py'; echo 'finished'"
+    )
+    process = await asyncio.create_subprocess_shell(
+        script, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    outcome = await backtester_agent._stream_backtest(process)
+    assert outcome["folder_path"] == str(folder)
+    assert outcome["console_errors"] == ["Traceback (most recent call last):\n  File main.py"]
+    assert outcome["log_errors"] == ["ERROR: bad data\n  at line 3"]
+    assert not outcome["aborted"] and not outcome["timed_out"]
+
+
+async def start_shell(script):
+    return await asyncio.create_subprocess_shell(
+        script, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, start_new_session=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_backtest_aborts_on_fatal_error(backtester_agent):
+    process = await start_shell("echo 'Traceback (most recent call last):'; echo '  SyntaxError: bad'; sleep 30")
+    start = asyncio.get_running_loop().time()
+    outcome = await backtester_agent._stream_backtest(process, fatal_patterns=["SyntaxError"], grace_period=0.2)
+    assert asyncio.get_running_loop().time() - start < 10
+    assert outcome["aborted"]
+    assert outcome["console_errors"] == ["Traceback (most recent call last):\n  SyntaxError: bad"]
+
+
+@pytest.mark.asyncio
+async def test_stream_backtest_enforces_timeout(backtester_agent):
+    process = await start_shell("echo started; sleep 30")
+    outcome = await backtester_agent._stream_backtest(process, timeout=0.5)
+    assert outcome["timed_out"]
+    assert process.returncode is not None
+
+
+@pytest.mark.asyncio
+async def test_run_smoke_mode_reports_runtime_error(backtester_agent, tmp_path):
+    strategy = tmp_path / "main.py"
+    strategy.write_text(
+        "from AlgorithmImports import *\n"
+        "class Broken(QCAlgorithm):\n"
+        "    def Initialize(self):\n"
+        "        self.SetStartDate(2020, 1, 1)\n"
+        "        self.spy = self.AddEquity('SPY', Resolution.Daily).Symbol\n"
+        "    def OnData(self, data):\n"
+        "        self.SetHoldings(self.spy, 1 / 0)\n"
+    )
+    result = await backtester_agent.run(str(tmp_path), mode="smoke")
+    assert result["folder_path"] is None
+    assert not result["backtest_successful"]
+    assert "ZeroDivisionError" in result["errors"][0]
+    assert "line 7, in OnData" in result["errors"][0]
+
+
+@pytest.mark.asyncio
+async def test_terminate_interrupts_cli_then_stops_its_container(backtester_agent, tmp_path, monkeypatch):
+    # A fake docker that reports one container mounting the output folder
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    docker = bin_dir / "docker"
+    docker.write_text(f"#!/bin/sh\necho \"$@\" >> '{tmp_path}/docker.log'\n[ \"$1\" = ps ] && echo c0ffee\nexit 0\n")
+    docker.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    output_dir = tmp_path / "backtests" / "run"
+    output_dir.mkdir(parents=True)
+
+    # The Lean CLI stops its container on SIGINT, so that is what it gets first
+    process = await start_shell(
+        f"trap 'echo interrupted > \"{tmp_path}/signal\"; kill $!; exit 130' INT; "
+        "echo started; sleep 30 >/dev/null 2>&1 & wait"
+    )
+    await process.stdout.readline()
+    await backtester_agent._terminate(process, kill_after=5, output_dir=str(output_dir))
+    assert process.returncode == 130
+    assert (tmp_path / "signal").read_text() == "interrupted\n"
+    assert (tmp_path / "docker.log").read_text().splitlines() == [
+        f"ps -q --filter volume={os.path.realpath(output_dir)}", "stop c0ffee"]
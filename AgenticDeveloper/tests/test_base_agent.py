@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from agents.base import BaseAgent, OpenRouterLLMWrapper
+
+
+def _wrapper(**kwargs):
+    return OpenRouterLLMWrapper(api_key="test-key", model="test/model", **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_async_client_is_shared_within_loop():
+    pool = {"max_connections": 7, "max_keepalive_connections": 3}
+    first = _wrapper(pool=pool)._get_async_client()
+    second = _wrapper(pool=pool)._get_async_client()
+    assert first is second
+    await OpenRouterLLMWrapper.aclose_pool()
+
+
+def test_async_client_is_recreated_per_loop():
+    async def get_client():
+        client = _wrapper()._get_async_client()
+        await OpenRouterLLMWrapper.aclose_pool()
+        return client
+
+    assert asyncio.run(get_client()) is not asyncio.run(get_client())
+
+
+@pytest.mark.asyncio
+async def test_executor_fallback_when_not_async_native():
+    wrapper = _wrapper(async_native=False)
+    wrapper.invoke = lambda prompt: f"echo: {prompt}"
+    assert await wrapper.ainvoke("hi") == "echo: hi"
+
+
+class EchoAgent(BaseAgent):
+    async def run(self, prompt: str) -> str:
+        return await self.llm.ainvoke(prompt)
+
+
+def test_agents_share_config_and_llm(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setenv("LLM_CACHE_DISABLED", "1")
+    BaseAgent.clear_shared_state()
+    created = []
+    original = BaseAgent._initialize_llm
+
+    def counting_initialize(self):
+        created.append(self)
+        return original(self)
+
+    monkeypatch.setattr(BaseAgent, "_initialize_llm", counting_initialize)
+    first, second = EchoAgent(), EchoAgent()
+    assert not created
+    assert first.llm is second.llm
+    assert len(created) == 1
+    assert first.config == second.config
+    assert first.config is not second.config
+    BaseAgent.clear_shared_state()
@@ -0,0 +1,82 @@
+import importlib.util
+import json
+
+import pytest
+
+from tools.code_validator import LeanApiSurface, get_lean_api_surface, validate_strategy_code
+
+API = LeanApiSurface(
+    modules={"AlgorithmImports": {"QCAlgorithm", "Resolution", "SimpleMovingAverage", "timedelta"}},
+    algorithm_members={"initialize", "add_equity", "set_holdings", "portfolio", "sma", "set_start_date", "debug"},
+)
+
+VALID = """
+from AlgorithmImports import *
+
+class Momentum(QCAlgorithm):
+    def Initialize(self):
+        self.SetStartDate(2020, 1, 1)
+        self.symbol = self.AddEquity("SPY", Resolution.Daily).Symbol
+        self.fast = self.SMA(self.symbol, 10)
+        self.lookback = timedelta(days=5)
+
+    def OnData(self, data):
+        if not self.Portfolio.Invested and self.fast.IsReady:
+            self.SetHoldings(self.symbol, 1)
+            self.Rebalance([x for x in data.Keys])
+
+    def Rebalance(self, symbols):
+        for symbol in symbols:
+            self.Debug(str(symbol))
+"""
+
+
+def test_valid_code_passes():
+    assert validate_strategy_code(VALID, api=API) == {"success": True, "errors": [], "warnings": []}
+
+
+def test_syntax_error_reports_line():
+    result = validate_strategy_code("from AlgorithmImports import *\nclass A(QCAlgorithm):\n    def Initialize(self)\n", api=API)
+    assert not result["success"] and result["errors"][0].startswith("main.py:3: SyntaxError")
+
+
+def test_requires_algorithm_with_initialize():
+    result = validate_strategy_code("from AlgorithmImports import *\nclass A:\n    pass\n", api=API)
+    assert result["errors"] == ["main.py: no class derives from QCAlgorithm"]
+    result = validate_strategy_code("from AlgorithmImports import *\nclass A(QCAlgorithm):\n    def OnData(self, data):\n        pass\n", api=API)
+    assert result["errors"] == ["main.py:2: A does not define Initialize (or initialize)"]
+
+
+def test_undefined_names_and_attributes():
+    code = VALID.replace("Resolution.Daily", "Resolutions.Daily").replace("self.Debug(", "self.Debugg(")
+    result = validate_strategy_code(code, api=API)
+    assert not result["success"]
+    assert any("undefined name 'Resolutions'" in error for error in result["errors"])
+    assert any("no attribute 'Debugg'" in error for error in result["errors"])
+    # An unknown star import could provide any name, so names are not checked
+    result = validate_strategy_code(code.replace("from AlgorithmImports import *", "from mylib import *"), api=API)
+    assert not any("undefined name" in error for error in result["errors"])
+
+
+def test_mixed_api_style_is_a_warning():
+    code = VALID.replace("self.SetHoldings(", "self.set_holdings(")
+    result = validate_strategy_code(code, api=API)
+    assert result["success"]
+    assert "mixes PascalCase" in result["warnings"][0] and "set_holdings" in result["warnings"][0]
+
+
+def test_without_stubs_only_structure_is_checked(monkeypatch):
+    import tools.code_validator as code_validator
+    monkeypatch.setattr(code_validator, "get_lean_api_surface", lambda config=None: None)
+    result = validate_strategy_code(VALID.replace("Resolution.Daily", "Resolutions.Daily"))
+    assert result["success"] and "quantconnect-stubs" in result["warnings"][0]
+
+
+@pytest.mark.skipif(importlib.util.find_spec("AlgorithmImports") is None, reason="quantconnect-stubs not installed")
+def test_api_surface_from_stubs_is_cached(tmp_path):
+    path = tmp_path / "api.json"
+    surface = get_lean_api_surface({"api_cache": str(path)})
+    assert surface.is_algorithm_member("SetHoldings") and surface.is_algorithm_member("set_holdings")
+    assert {"QCAlgorithm", "Resolution", "SimpleMovingAverage", "timedelta"} <= surface.modules["AlgorithmImports"]
+    assert json.loads(path.read_text())["version"] == surface.version
+    assert validate_strategy_code(VALID, api=surface)["success"]
@@ -0,0 +1,67 @@
+import json
+from tools.idea_store import IdeaStore
+
+
+def idea(url: str, description: str = "desc") -> dict:
+    return {"description": description, "pseudo_code": "", "source": {"url": url}, "learnings_from_testing": []}
+
+
+def test_upserts_are_indexed_and_persisted(tmp_path):
+    log_path = str(tmp_path / "ideas.jsonl")
+    store = IdeaStore(log_path)
+    store.upsert_many([("a", idea("u1")), ("b", idea("u1"))])
+    store.upsert("a", idea("u2", "updated"))
+
+    reopened = IdeaStore(log_path)
+    assert reopened.get("a")["description"] == "updated"
+    assert reopened.find_by_url("u1") == ["b"]
+    assert reopened.has_url("u2")
+    assert not reopened.has_url("u3")
+
+
+def test_compact_and_export(tmp_path):
+    log_path = tmp_path / "ideas.jsonl"
+    store = IdeaStore(str(log_path))
+    store.upsert("a", idea("u1"))
+    store.upsert("a", idea("u1", "v2"))
+    store.compact()
+    assert len(log_path.read_text().splitlines()) == 1
+
+    json_path = tmp_path / "ideas.json"
+    store.export_json(str(json_path))
+    assert json.loads(json_path.read_text()) == {"a": idea("u1", "v2")}
+
+
+def test_imports_legacy_json(tmp_path):
+    legacy = tmp_path / "research_ideas.json"
+    legacy.write_text(json.dumps({"old": idea("u1")}))
+    store = IdeaStore(str(tmp_path / "research_ideas.jsonl"), legacy_json_path=str(legacy))
+    assert store.has_url("u1")
+    assert "old" in IdeaStore(str(tmp_path / "research_ideas.jsonl"))
+
+
+def test_edits_to_the_exported_json_are_merged(tmp_path):
+    log_path = str(tmp_path / "research_ideas.jsonl")
+    json_path = tmp_path / "research_ideas.json"
+    store = IdeaStore(log_path)
+    store.upsert_many([("a", idea("u1")), ("b", idea("u2"))])
+    store.export_json(str(json_path))
+
+    # Another tool records a learning in the JSON; meanwhile the store updates another idea
+    exported = json.loads(json_path.read_text())
+    exported["a"]["learnings_from_testing"].append("overfits after 2020")
+    exported["c"] = idea("u3")
+    json_path.write_text(json.dumps(exported))
+    store.upsert("b", idea("u2", "newer"))
+
+    assert store.merge_json(str(json_path)) == 2
+    store.export_json(str(json_path))
+    merged = json.loads(json_path.read_text())
+    assert merged["a"]["learnings_from_testing"] == ["overfits after 2020"]
+    assert merged["b"]["description"] == "newer" and "c" in merged
+    assert store.merge_json(str(json_path)) == 0
+
+    # Edits made while no store was open are merged when one is opened
+    merged["c"]["description"] = "edited"
+    json_path.write_text(json.dumps(merged))
+    assert IdeaStore(log_path, legacy_json_path=str(json_path)).get("c")["description"] == "edited"
@@ -0,0 +1,69 @@
+import asyncio
+import pytest
+from tools.lean_log_parser import ErrorBlockParser, follow_file, parse_file
+
+CONSOLE = """Starting backtest
+Traceback (most recent call last):
+  File "main.py", line 3
+    x = = 1
+*** SyntaxError: invalid syntax
+
+Done
+ERROR in data feed
+  detail
+"""
+
+
+def test_console_blocks():
+    errors = ErrorBlockParser(mode="console").feed_lines(CONSOLE.splitlines(True)).close()
+    assert errors == [
+        'Traceback (most recent call last):\n  File "main.py", line 3\n    x = = 1\n*** SyntaxError: invalid syntax\n',
+        "ERROR in data feed\n  detail",
+    ]
+
+
+def test_feed_handles_chunks_split_mid_line():
+    parser = ErrorBlockParser(mode="log")
+    for chunk in ["2024 ERR", "OR: bad\n  trace line\n2024 ok\n2024 Error", ": again"]:
+        parser.feed(chunk)
+    assert parser.close() == ["2024 ERROR: bad\n  trace line", "2024 Error: again"]
+
+
+def test_memory_is_bounded():
+    seen = []
+    parser = ErrorBlockParser(mode="log", max_errors=2, max_block_lines=3, on_error=seen.append)
+    for i in range(5):
+        parser.feed_lines([f"ERROR {i}"] + ["  more"] * 10)
+    parser.close()
+    assert len(parser.errors) == 2
+    assert parser.dropped_errors == 3
+    assert len(seen) == 5
+    assert parser.errors[0] == "ERROR 0\n  more\n  more"
+
+
+def test_parse_file(tmp_path):
+    log = tmp_path / "log.txt"
+    log.write_text("ok\nERROR x\n\tat y\nok\n")
+    assert parse_file(str(log)) == ["ERROR x\n\tat y"]
+
+
+@pytest.mark.asyncio
+async def test_follow_file_sees_errors_while_written(tmp_path):
+    log = tmp_path / "log.txt"
+    seen = []
+    parser = ErrorBlockParser(mode="log", on_error=seen.append)
+    stop = asyncio.Event()
+    follower = asyncio.create_task(follow_file(str(log), parser, stop, poll_interval=0.01))
+
+    with open(log, "w") as f:
+        f.write("ERROR early\nnext line\n")
+        f.flush()
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if seen:
+                break
+        assert seen == ["ERROR early"]
+        f.write("ERROR late\n")
+    stop.set()
+    await follower
+    assert parser.errors == ["ERROR early", "ERROR late"]
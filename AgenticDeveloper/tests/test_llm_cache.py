@@ -0,0 +1,95 @@
+import pytest
+from agents.llm_cache import CachedLLM, LLMResponseCache
+
+
+class CountingLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt: str) -> str:
+        self.calls += 1
+        return f"response {self.calls} to {prompt}"
+
+    async def ainvoke(self, prompt: str) -> str:
+        return self.invoke(prompt)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "responses.sqlite"), max_entries=2)
+    yield cache
+    cache.close()
+
+
+def test_repeated_prompt_is_served_from_cache(cache):
+    llm = CountingLLM()
+    cached = CachedLLM(llm, cache, provider="openrouter", model="m", temperature=0.7, max_tokens=100)
+    assert cached.invoke("a") == cached.invoke("a")
+    assert llm.calls == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_key_includes_sampling_settings(cache):
+    llm = CountingLLM()
+    CachedLLM(llm, cache, provider="openrouter", model="m", temperature=0.7).invoke("a")
+    CachedLLM(llm, cache, provider="openrouter", model="m", temperature=0.0).invoke("a")
+    assert llm.calls == 2
+
+
+def test_opt_out_bypasses_cache(cache):
+    llm = CountingLLM()
+    cached = CachedLLM(llm, cache, provider="openrouter", model="m")
+    cached.invoke("a")
+    cached.invoke("a", use_cache=False)
+    cached.enabled = False
+    cached.invoke("a")
+    assert llm.calls == 3
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    for key in ("k1", "k2"):
+        cache.put(key, key)
+    cache.get("k1")
+    cache.put("k3", "k3")
+    assert cache.get("k2") is None
+    assert cache.get("k1") == "k1"
+    assert cache.stats()["entries"] == 2
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "responses.sqlite"), max_age_seconds=-1)
+    cache.put("k", "v")
+    assert cache.get("k") is None
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_ainvoke_uses_cache(cache):
+    llm = CountingLLM()
+    cached = CachedLLM(llm, cache, provider="openrouter", model="m")
+    assert await cached.ainvoke("a") == await cached.ainvoke("a")
+    assert llm.calls == 1
+
+
+def test_rejected_responses_are_not_cached(cache):
+    llm = CountingLLM()
+    cached = CachedLLM(llm, cache, provider="openrouter", model="m")
+    usable = lambda response: "2" in response
+    assert cached.invoke("a", validate=usable) == "response 1 to a"
+    assert cached.invoke("a", validate=usable) == "response 2 to a"
+    assert cached.invoke("a", validate=usable) == "response 2 to a"
+    assert llm.calls == 2
+
+    cached.invalidate("a")
+    assert cached.invoke("a") == "response 3 to a"
+
+
+def test_rejected_cached_response_is_dropped(cache):
+    llm = CountingLLM()
+    cached = CachedLLM(llm, cache, provider="openrouter", model="m")
+    cached.invoke("a")
+    # A caller that cannot use the stored reply gets a fresh one, which replaces it
+    assert cached.invoke("a", validate=lambda response: "1" not in response) == "response 2 to a"
+    assert cached.invoke("a") == "response 2 to a"
+    assert llm.calls == 2
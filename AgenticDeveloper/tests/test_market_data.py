@@ -0,0 +1,114 @@
+import os
+import zipfile
+
+import numpy as np
+import pytest
+
+from tools.market_data import LeanDataImporter, MarketDataCache
+from tools.smoke_backtest import SmokeBacktester
+
+
+def write_daily_zip(folder, symbol, rows):
+    directory = folder / "equity" / "usa" / "daily"
+    directory.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(directory / f"{symbol}.zip", "w") as archive:
+        archive.writestr(f"{symbol}.csv", "".join(
+            f"{day} 00:00,{int(c * 10000)},{int(c * 10100)},{int(c * 9900)},{int(c * 10000)},{1000 + i}\n"
+            for i, (day, c) in enumerate(rows)
+        ))
+
+
+def test_write_load_and_merge(tmp_path):
+    cache = MarketDataCache(str(tmp_path / "cache"))
+    times = np.array(["2020-01-02", "2020-01-03", "2020-01-06"], dtype="datetime64[ns]")
+    closes = np.array([10.0, 11.0, 12.0])
+    cache.write("spy", "daily", times, closes, closes, closes, closes, [1, 2, 3])
+
+    data = cache.load("SPY", "daily")
+    assert isinstance(data.close, np.memmap)
+    np.testing.assert_array_equal(data.close, closes)
+
+    # New bars win on equal timestamps and the result stays sorted
+    cache.write("SPY", "daily", np.array(["2020-01-07", "2020-01-03"], dtype="datetime64[ns]"),
+                [13, 99], [13, 99], [13, 99], [13, 99], [4, 5])
+    data = cache.load("SPY", "daily", start="2020-01-03", end="2020-01-06")
+    np.testing.assert_array_equal(data.close, [99.0, 12.0])
+    assert cache.coverage("daily")["SPY"]["bars"] == 4
+    assert cache.coverage("daily")["SPY"]["end"].startswith("2020-01-07")
+
+    # A fresh instance reads the manifest written by the first
+    assert MarketDataCache(str(tmp_path / "cache")).symbols("daily") == ["SPY"]
+
+
+def test_closes_aligns_symbols(tmp_path):
+    cache = MarketDataCache(str(tmp_path))
+    a = np.array(["2020-01-02", "2020-01-03", "2020-01-06"], dtype="datetime64[ns]")
+    b = np.array(["2020-01-03", "2020-01-06", "2020-01-07"], dtype="datetime64[ns]")
+    cache.write("A", "daily", a, *[[1.0, 2.0, 3.0]] * 5)
+    cache.write("B", "daily", b, *[[10.0, 20.0, 30.0]] * 5)
+    times, matrix = cache.closes(["A", "B"])
+    assert list(times.astype("datetime64[D]").astype(str)) == ["2020-01-03", "2020-01-06"]
+    np.testing.assert_array_equal(matrix, [[2.0, 10.0], [3.0, 20.0]])
+    with pytest.raises(KeyError):
+        cache.closes(["A", "MISSING"])
+
+
+def test_lean_importer_is_incremental(tmp_path):
+    data_folder = tmp_path / "data"
+    write_daily_zip(data_folder, "aapl", [("20200102", 75.0875), ("20200103", 74.3575)])
+    cache = MarketDataCache(str(tmp_path / "cache"))
+    importer = LeanDataImporter(cache, str(data_folder))
+
+    assert importer.available_symbols() == ["AAPL"]
+    assert importer.import_all() == {"AAPL": 2}
+    data = cache.load("AAPL")
+    np.testing.assert_allclose(data.close, [75.0875, 74.3575])
+    np.testing.assert_allclose(data.high, [75.0875 * 1.01, 74.3575 * 1.01], rtol=1e-6)
+    assert cache.coverage("daily")["AAPL"]["source"]["path"] == os.path.join("equity", "usa", "daily", "aapl.zip")
+
+    assert importer.import_symbol("AAPL") == 0
+    write_daily_zip(data_folder, "aapl", [("20200102", 75.0875), ("20200103", 74.3575), ("20200106", 74.95)])
+    os.utime(data_folder / "equity" / "usa" / "daily" / "aapl.zip", (1, 1))
+    assert importer.import_symbol("AAPL") == 3
+    assert len(cache.load("AAPL")) == 3
+
+    with pytest.raises(FileNotFoundError):
+        importer.import_symbol("MSFT")
+
+
+def test_lean_importer_reads_minute_files(tmp_path):
+    directory = tmp_path / "data" / "equity" / "usa" / "minute" / "spy"
+    directory.mkdir(parents=True)
+    for day in ("20200102", "20200103"):
+        with zipfile.ZipFile(directory / f"{day}_trade.zip", "w") as archive:
+            archive.writestr(f"{day}_spy_minute_trade.csv", "34200000,3200000,3201000,3199000,3200500,500\n"
+                                                             "34260000,3200500,3202000,3200000,3201000,700\n")
+    cache = MarketDataCache(str(tmp_path / "cache"))
+    assert LeanDataImporter(cache, str(tmp_path / "data")).import_symbol("SPY", "minute") == 4
+    data = cache.load("SPY", "minute")
+    assert str(data.time[1]).startswith("2020-01-02T09:31")
+    np.testing.assert_allclose(data.close[:2], [320.05, 320.1])
+
+
+def test_smoke_backtester_replays_cached_closes(tmp_path):
+    cache = MarketDataCache(str(tmp_path))
+    times = np.arange(np.datetime64("2020-01-01"), np.datetime64("2020-03-01")).astype("datetime64[ns]")
+    closes = np.arange(len(times), dtype=float) + 100
+    cache.write("SPY", "daily", times, closes, closes, closes, closes, np.ones(len(times)))
+    code = (
+        "from AlgorithmImports import *\n"
+        "class A(QCAlgorithm):\n"
+        "    def Initialize(self):\n"
+        "        self.SetStartDate(2020, 2, 1)\n"
+        "        self.spy = self.AddEquity('SPY').Symbol\n"
+        "    def OnData(self, data):\n"
+        "        self.Debug(data.Bars[self.spy].Close)\n"
+    )
+    result = SmokeBacktester(bars=5, history_bars=10, market_data=cache).run_code(code)
+    assert result["success"], result["errors"]
+    assert result["stats"]["messages"] == [str(c) for c in closes[31:36]]
+
+    # Not enough cached history: falls back to synthetic bars with a warning
+    result = SmokeBacktester(bars=5, history_bars=60, market_data=cache).run_code(code)
+    assert result["success"]
+    assert result["warnings"] == ["Cached data for SPY does not cover the test window; using synthetic bars"]
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from tools.order_events import OrderEventAggregator, iter_json_array, iter_order_events, summarize_order_events
+
+DAY = 86400
+
+
+def event(order_id, status, direction, quantity, price, day, **extra):
+    return {"orderId": order_id, "symbolValue": extra.pop("symbol", "AAPL"), "status": status, "direction": direction,
+            "fillQuantity": quantity if direction == "buy" else -quantity, "fillPrice": price,
+            "orderFeeAmount": 1.0 if status == "filled" else 0, "time": day * DAY, **extra}
+
+
+EVENTS = [
+    event(1, "submitted", "buy", 0, 0, 0),
+    event(1, "filled", "buy", 10, 100.0, 0),
+    event(2, "filled", "sell", 10, 110.0, 3),                              # win +100, 3 days
+    event(3, "partiallyFilled", "buy", 5, 100.0, 5, limitPrice=99.0),
+    event(3, "filled", "buy", 5, 102.0, 5, limitPrice=99.0),               # avg 101
+    event(4, "filled", "sell", 20, 96.0, 6),                               # loss -50, flips short 10 @ 96
+    event(5, "filled", "buy", 10, 98.0, 8),                                # loss -20, 2 days
+    event(6, "filled", "buy", 1, 50.0, 9, symbol="MSFT"),                  # left open
+]
+
+
+@pytest.fixture
+def events_file(tmp_path):
+    path = tmp_path / "1-order-events.json"
+    path.write_text(json.dumps(EVENTS, indent=2))
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_iter_json_array_across_chunk_boundaries(tmp_path, chunk_size):
+    data = [{"a": 1, "s": "x, ] {"}, [1, 2], 12345, -0.5, "text", None, True, {}]
+    path = tmp_path / "array.json"
+    path.write_text(" \n" + json.dumps(data, indent=1) + "\n")
+    assert list(iter_json_array(str(path), chunk_size=chunk_size)) == data
+
+
+def test_iter_json_array_rejects_invalid_input(tmp_path):
+    (tmp_path / "empty.json").write_text("[]")
+    assert list(iter_json_array(str(tmp_path / "empty.json"))) == []
+    (tmp_path / "object.json").write_text('{"a": 1}')
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(tmp_path / "object.json")))
+    (tmp_path / "truncated.json").write_text('[{"a": 1}, {"b": ')
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(tmp_path / "truncated.json"), chunk_size=4))
+
+
+def test_iter_order_events_selects_fields(events_file):
+    events = list(iter_order_events(str(events_file), fields=["status", "fillPrice"]))
+    assert events[1] == {"status": "filled", "fillPrice": 100.0}
+
+
+def test_trade_aggregates(events_file):
+    summary = summarize_order_events(str(events_file), include_trades=True)
+    assert summary["events"] == 8
+    assert summary["status_counts"] == {"submitted": 1, "filled": 6, "partiallyfilled": 1}
+    assert summary["fills"] == 7 and summary["fees"] == 6.0
+    assert summary["trades"] == 3 and summary["open_positions"] == 1
+    assert [trade["pnl"] for trade in summary["closed_trades"]] == pytest.approx([100.0, -50.0, -20.0])
+    assert [trade["side"] for trade in summary["closed_trades"]] == ["long", "long", "short"]
+    assert summary["wins"] == 1 and summary["losses"] == 2
+    assert summary["max_win_streak"] == 1 and summary["max_loss_streak"] == 2
+    assert summary["profit_factor"] == pytest.approx(100 / 70)
+    assert summary["holding_days"] == {"count": 3, "mean": pytest.approx(2.0), "min": 1.0, "max": 3.0}
+    # Limit buys at 100 and 102 against 99: about 101 and 303 bps worse
+    assert summary["slippage_bps"]["count"] == 2
+    assert summary["slippage_bps"]["mean"] == pytest.approx((100 / 99 - 1 + 102 / 99 - 1) / 2 * 10000)
+
+
+def test_trade_records_are_bounded():
+    aggregator = OrderEventAggregator(max_trades=1)
+    aggregator.feed_many(EVENTS)
+    assert len(aggregator.trades) == 1 and aggregator.trades_dropped == 2
+    assert aggregator.summary()["trades"] == 3
@@ -0,0 +1,177 @@
+import csv
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from agents.backtest_scheduler import BacktestScheduler
+from agents.backtester import BacktesterAgent
+from agents.parameter_sweep import ParameterSweep, apply_parameters, parameter_grid
+from tools.backtest_dedup import BacktestResultCache
+from tools.market_data import MarketDataCache
+from tools.vector_backtest import VectorBacktester
+
+MOMENTUM = """from AlgorithmImports import *
+
+class Momentum(QCAlgorithm):
+    def Initialize(self):
+        self.SetStartDate(2018, 1, 1)
+        self.symbol = self.AddEquity("AAPL", Resolution.Daily).Symbol
+        self.lookback = 90
+        self.momentum_threshold = 0.05  # 5%
+        self.tolerance = 0.002
+        self.fast = self.SMA(self.symbol, 10, Resolution.Daily)
+        self.slow = self.SMA(self.symbol, 30, Resolution.Daily)
+        self.closes = RollingWindow[float](self.lookback + 1)
+        self.window = int(self.GetParameter("window", 5))
+"""
+
+
+class FakeBacktester:
+    """Writes a Lean-style summary whose Sharpe ratio is the rewritten lookback / 100"""
+
+    def __init__(self):
+        self.config = {"tools": {"lean_cli": {"max_concurrent_backtests": 4}}}
+        self.calls = 0
+        self.failing_lookbacks = set()
+
+    async def run(self, strategy_path, mode="local", output_dir=None, **kwargs):
+        self.calls += 1
+        code = open(os.path.join(strategy_path, "main.py")).read()
+        parameters = json.load(open(os.path.join(strategy_path, "config.json")))["parameters"]
+        lookback = int(code.split("self.lookback = ")[1].split("\n")[0])
+        os.makedirs(output_dir)
+        with open(os.path.join(output_dir, "1234-summary.json"), "w") as f:
+            json.dump({"statistics": {"Sharpe Ratio": str(lookback / 100), "Drawdown": "12.5%",
+                                      "Total Orders": parameters["window"]}}, f)
+        if lookback in self.failing_lookbacks:
+            return {"folder_path": output_dir, "backtest_successful": False, "errors": ["Docker daemon not running"]}
+        return {"folder_path": output_dir, "backtest_successful": True, "errors": []}
+
+
+def test_parameter_grid():
+    assert parameter_grid({"a": [1, 2], "b": ["x"]}) == [{"a": 1, "b": "x"}, {"a": 2, "b": "x"}]
+
+
+def test_apply_parameters_rewrites_attribute_and_call_literals():
+    applied = apply_parameters(
+        MOMENTUM, {"lookback": 120, "tolerance": 0.01, "fast": 5, "slow": 50, "window": 3},
+        bindings={"fast": "SMA:1:0", "slow": "SMA:1:1"}
+    )
+    code = applied["code"]
+    assert "self.lookback = 120\n" in code
+    assert "self.momentum_threshold = 0.05  # 5%" in code
+    assert "self.tolerance = 0.01\n" in code
+    assert "self.SMA(self.symbol, 5, Resolution.Daily)" in code
+    assert "self.SMA(self.symbol, 50, Resolution.Daily)" in code
+    assert applied["unbound"] == ["window"]
+
+    with pytest.raises(ValueError):
+        apply_parameters(MOMENTUM, {"fast": 5}, bindings={"fast": "SMA"})
+
+
+@pytest.mark.asyncio
+async def test_sweep_ranks_results_and_reuses_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    (tmp_path / "config.json").write_text('{"parameters": {"other": "1"}, "local-id": 1}')
+    (tmp_path / "main.py").write_text(MOMENTUM)
+    backtester = FakeBacktester()
+    cache = BacktestResultCache(str(tmp_path / "cache" / "results.jsonl"))
+    sweep = ParameterSweep(BacktestScheduler(backtester, result_cache=cache))
+
+    table = tmp_path / "table.csv"
+    rows = await sweep.run(str(tmp_path), {"lookback": [60, 120, 90], "window": [2]}, table_path=str(table))
+    assert [row["lookback"] for row in rows] == [120, 90, 60]
+    assert rows[0]["Sharpe Ratio"] == 1.2 and rows[0]["Drawdown"] == 12.5 and rows[0]["Total Orders"] == 2
+    assert not any(row["cached"] for row in rows)
+    with open(table) as f:
+        assert [r["lookback"] for r in csv.DictReader(f)] == ["120", "90", "60"]
+
+    rows = await sweep.run(str(tmp_path), [{"lookback": 90, "window": 2}, {"lookback": 30, "window": 2}])
+    assert backtester.calls == 4
+    assert [(row["lookback"], row["cached"]) for row in rows] == [(90, True), (30, False)]
+    assert len([name for name in os.listdir(tmp_path / "sweeps") if name.endswith(".csv")]) == 1
+
+    with pytest.raises(ValueError, match="missing"):
+        await sweep.run(str(tmp_path), {"missing": [1]})
+
+
+@pytest.mark.asyncio
+async def test_sweep_reuses_only_successful_runs_that_still_apply(tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    (tmp_path / "config.json").write_text('{"parameters": {"other": "1"}}')
+    (tmp_path / "main.py").write_text(MOMENTUM)
+    backtester = FakeBacktester()
+    backtester.failing_lookbacks = {30}
+    cache = BacktestResultCache(str(tmp_path / "cache" / "results.jsonl"))
+    sweep = ParameterSweep(BacktestScheduler(backtester, result_cache=cache))
+    grid = {"lookback": [30, 60], "window": [2]}
+
+    rows = await sweep.run(str(tmp_path), grid)
+    assert [row["status"] for row in rows] == ["ok", "failed"]
+
+    # The failure is re-run; the success is reused
+    backtester.failing_lookbacks = set()
+    rows = await sweep.run(str(tmp_path), grid)
+    assert backtester.calls == 3
+    assert {row["lookback"]: row["cached"] for row in rows} == {30: False, 60: True}
+
+    # A deleted output folder is re-run
+    shutil.rmtree(next(row["folder_path"] for row in rows if row["lookback"] == 60))
+    await sweep.run(str(tmp_path), grid)
+    assert backtester.calls == 4
+
+    # So is everything after config.json changes outside the swept parameters
+    (tmp_path / "config.json").write_text('{"parameters": {"other": "2"}}')
+    rows = await sweep.run(str(tmp_path), grid)
+    assert backtester.calls == 6 and not any(row["cached"] for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_smoke_sweep_with_backtester_agent(tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    (tmp_path / "config.json").write_text('{"parameters": {}}')
+    (tmp_path / "main.py").write_text(MOMENTUM)
+    agent = BacktesterAgent()
+    agent.config["tools"]["smoke_backtest"]["use_market_data"] = False
+    sweep = ParameterSweep(BacktestScheduler(agent))
+    rows = await sweep.run(str(tmp_path), {"fast": [5, 40], "slow": [30]}, bindings={"fast": "SMA:1:0", "slow": "SMA:1:1"},
+                           mode="smoke")
+    assert [row["status"] for row in rows] == ["ok", "ok"]
+    assert os.listdir(tmp_path / ".jobs") == []
+
+
+@pytest.mark.asyncio
+async def test_prescreen_backtests_only_the_best_vectorized_parameter_sets(tmp_path):
+    (tmp_path / "config.json").write_text('{"parameters": {}}')
+    (tmp_path / "main.py").write_text(MOMENTUM)
+    closes = 100 * np.exp(np.cumsum(np.random.default_rng(3).normal(0.0005, 0.02, 300)))
+    market_data = MarketDataCache(str(tmp_path / "market_data"))
+    market_data.write("SPY", "daily", np.arange(300).astype("datetime64[D]"), closes, closes, closes, closes,
+                      np.ones(300))
+    backtester = FakeBacktester()
+    sweep = ParameterSweep(BacktestScheduler(backtester), market_data=market_data)
+
+    rows = await sweep.run(str(tmp_path), {"fast": [5, 10, 40], "slow": [20, 30], "window": [2]},
+                           bindings={"fast": "SMA:1:0", "slow": "SMA:1:1"},
+                           prescreen={"keep": 2, "model": "sma_crossover", "symbols": ["SPY"]})
+
+    screen = VectorBacktester().sma_crossover(closes, [5, 10, 40], [20, 30])
+    best = [(params["fast"], params["slow"]) for params in screen.top(2)]
+    assert backtester.calls == 2
+    assert sorted((row["fast"], row["slow"]) for row in rows if row["status"] == "ok") == sorted(best)
+    assert [row["status"] for row in rows].count("screened out") == 4
+    assert {(row["fast"], row["slow"]): row["screen_sharpe"] for row in rows}[(40, 20)] is None
+
+    with pytest.raises(ValueError, match="slow"):
+        await sweep.run(str(tmp_path), {"fast": [5]}, bindings={"fast": "SMA:1:0"},
+                        prescreen={"keep": 1, "model": "sma_crossover", "symbols": ["SPY"]})
+
+
+def test_sweep_ranks_lower_is_better_metrics_ascending():
+    sweep = ParameterSweep(BacktestScheduler(FakeBacktester()))
+    sweep.rank_by = "Drawdown"
+    rows = [{"status": "ok", "Drawdown": 20.0}, {"status": "failed", "Drawdown": 1.0}, {"status": "ok", "Drawdown": 5.0}]
+    assert [row["Drawdown"] for row in sorted(rows, key=sweep._rank_value, reverse=True)] == [5.0, 20.0, 1.0]
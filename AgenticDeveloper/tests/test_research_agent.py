@@ -1,6 +1,7 @@
 import asyncio
 import os
 import json
+import pytest
 from AgenticDeveloper.agents.research_agent import IdeaResearcherAgent
 
 async def main():
@@ -21,5 +22,77 @@ async def main():
         ideas = json.load(f)
     print(f"\n[Manual Test] Final saved research ideas:\n{json.dumps(ideas, indent=2)}")
 
+
+@pytest.fixture
+def research_agent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return IdeaResearcherAgent()
+
+
+@pytest.mark.asyncio
+async def test_analyze_resource_bounds_concurrency_and_keeps_chunk_order(research_agent):
+    research_agent.config["agents"]["researcher"]["chunk_concurrency"] = 2
+    in_flight = 0
+    peak = 0
+
+    async def fake_analyze_chunk(chunk, paper):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later chunks finish first to exercise ordering
+        await asyncio.sleep(0.01 * (10 - int(chunk[0])))
+        in_flight -= 1
+        return {"shared idea": (f"from chunk {chunk[0]}", ""), f"idea {chunk[0]}": ("", "")}
+
+    research_agent._analyze_chunk = fake_analyze_chunk
+    research_agent._chunk_text = lambda text: [str(i) * 10 for i in range(6)]
+    ideas = await research_agent._analyze_resource("text", {"title": "paper"})
+
+    assert peak == 2
+    assert ideas["shared idea"][0] == "from chunk 0"
+    assert list(ideas) == ["shared idea"] + [f"idea {i}" for i in range(6)]
+
+
+
+@pytest.mark.asyncio
+async def test_search_and_process_pipelines_papers(research_agent):
+    papers = [{"title": f"paper {i}", "authors": [], "pdf_url": f"http://x/{i}"} for i in range(4)]
+    papers.append(dict(papers[0]))
+    research_agent.idea_store.upsert("seen", {"source": {"url": "http://x/3"}})
+    events = []
+
+    async def search(query, max_results):
+        return papers
+
+    async def download_pdf(url, save_dir):
+        events.append(("download", url))
+        await asyncio.sleep(0.01)
+        return None if url.endswith("2") else f"{url}.pdf"
+
+    async def analyze_resource(text, paper):
+        events.append(("analyze", paper["pdf_url"]))
+        await asyncio.sleep(0.02)
+        if paper["pdf_url"].endswith("1"):
+            raise RuntimeError("boom")
+        return {f"idea from {paper['title']}": ("desc", "code")}
+
+    research_agent.arxiv_tool.search = search
+    research_agent.pdf_handler.download_pdf = download_pdf
+
+    async def aextract_text(path):
+        return f"text of {path}"
+
+    research_agent.pdf_handler.aextract_text = aextract_text
+    research_agent._analyze_resource = analyze_resource
+
+    await research_agent.search_and_process("momentum", max_results=5)
+
+    assert sorted(url for stage, url in events if stage == "download") == ["http://x/0", "http://x/1", "http://x/2"]
+    assert "idea from paper 0" in research_agent.idea_store
+    assert "idea from paper 2" in research_agent.idea_store
+    assert "idea from paper 1" not in research_agent.idea_store
+    with open(research_agent.ideas_dump_path) as f:
+        assert set(json.load(f)) == {"seen", "idea from paper 0", "idea from paper 2"}
+
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,131 @@
+import pytest
+
+from tools.smoke_backtest import SmokeBacktester
+
+SMA_STRATEGY = """
+from AlgorithmImports import *
+
+class SmaCross(QCAlgorithm):
+    def Initialize(self):
+        self.SetStartDate(2021, 1, 1)
+        self.SetCash(100000)
+        self.spy = self.AddEquity("SPY", Resolution.Daily).Symbol
+        self.fast = self.SMA(self.spy, 10, Resolution.Daily)
+        self.slow = self.SMA(self.spy, 30, Resolution.Daily)
+        self.closes = RollingWindow[float](5)
+        self.SetWarmUp(timedelta(days=40))
+
+    def OnData(self, data: Slice):
+        if not data.ContainsKey(self.spy):
+            return
+        self.closes.Add(data.Bars[self.spy].Close)
+        if self.IsWarmingUp or not self.slow.IsReady:
+            return
+        if self.fast.Current.Value > self.slow.Current.Value and not self.Portfolio[self.spy].Invested:
+            self.SetHoldings(self.spy, 1)
+        elif self.fast.Current.Value < self.slow.Current.Value and self.Portfolio[self.spy].Invested:
+            self.Liquidate(self.spy)
+"""
+
+SNAKE_CASE_STRATEGY = """
+from AlgorithmImports import *
+
+class Rebalance(QCAlgorithm):
+    def initialize(self):
+        self.set_start_date(2022, 1, 1)
+        self.symbols = [self.add_equity(t, data_normalization_mode=DataNormalizationMode.RAW).symbol
+                        for t in ["SPY", "TLT"]]
+        self.schedule.on(self.date_rules.week_start(), self.time_rules.at(9, 33), self.rebalance)
+        self.rebalances = 0
+
+    def rebalance(self):
+        closes = self.history(self.symbols, 60, Resolution.DAILY).close.unstack(0)
+        assert list(closes.columns) == self.symbols and len(closes) == 60
+        self.set_holdings([PortfolioTarget(s, 0.5) for s in self.symbols])
+        self.rebalances += 1
+        self.debug(f"rebalanced {self.rebalances}")
+"""
+
+
+def test_runs_pascal_case_strategy():
+    result = SmokeBacktester(bars=120).run_code(SMA_STRATEGY)
+    assert result["success"], result["errors"]
+    assert result["stats"]["bars"] == 120
+    assert result["stats"]["orders"] > 0
+    assert result["warnings"] == []
+
+
+def test_runs_snake_case_strategy_with_schedule_and_history():
+    result = SmokeBacktester(bars=60).run_code(SNAKE_CASE_STRATEGY)
+    assert result["success"], result["errors"]
+    assert 10 <= len(result["stats"]["messages"]) <= 14
+    assert result["stats"]["orders"] >= 2
+
+
+def test_reports_syntax_error():
+    result = SmokeBacktester().run_code("from AlgorithmImports import *\nclass A(QCAlgorithm)\n    pass\n")
+    assert not result["success"]
+    assert "SyntaxError" in result["errors"][0]
+
+
+def test_reports_missing_algorithm_and_initialize():
+    assert SmokeBacktester().run_code("x = 1")["errors"] == ["No QCAlgorithm subclass found in strategy code"]
+    result = SmokeBacktester().run_code("from AlgorithmImports import *\nclass A(QCAlgorithm):\n    pass\n")
+    assert result["errors"] == ["A does not define Initialize/initialize"]
+
+
+def test_unsupported_api_is_a_warning():
+    code = SMA_STRATEGY.replace("self.SetWarmUp(", "self.rsi = self.RSI(self.spy, 14)\n        self.SetWarmUp(")
+    result = SmokeBacktester(bars=50).run_code(code)
+    assert result["success"], result["errors"]
+    assert result["warnings"] == ["Unsupported API used: RSI"]
+
+
+def test_own_attribute_used_before_assignment_is_an_error():
+    code = SMA_STRATEGY.replace("self.SetCash(100000)", "self.SetCash(100000)\n        self.Debug(self.spy)")
+    result = SmokeBacktester(bars=50).run_code(code)
+    assert not result["success"]
+    assert "has no attribute 'spy'" in result["errors"][0]
+
+
+def test_rolling_window_index_error_is_reported():
+    code = SMA_STRATEGY.replace("self.closes.Add(data.Bars[self.spy].Close)", "self.closes[3]")
+    result = SmokeBacktester(bars=50).run_code(code, filename="main.py")
+    assert not result["success"]
+    assert 'File "main.py"' in result["errors"][0] and "IndexError" in result["errors"][0]
+
+
+def test_run_file(tmp_path):
+    path = tmp_path / "main.py"
+    path.write_text(SMA_STRATEGY)
+    assert SmokeBacktester(bars=80).run_file(str(path))["success"]
+
+
+def test_get_parameter_uses_project_parameters():
+    code = SMA_STRATEGY.replace("self.SetCash(100000)", "self.SetCash(100000)\n        self.Debug(self.GetParameter('fast', 3) + 1)")
+    result = SmokeBacktester(bars=40).run_code(code, parameters={"fast": "7"})
+    assert result["success"], result["errors"]
+    assert result["stats"]["messages"][0] == "8"
+
+
+def test_run_isolated_kills_endless_loop(tmp_path):
+    looping = tmp_path / "looping.py"
+    looping.write_text(
+        "from AlgorithmImports import *\n"
+        "class Loop(QCAlgorithm):\n"
+        "    def Initialize(self):\n"
+        "        while True:\n"
+        "            pass\n"
+    )
+    valid = tmp_path / "valid.py"
+    valid.write_text(SMA_STRATEGY)
+    tester = SmokeBacktester(bars=80)
+
+    result = tester.run_isolated(str(looping), timeout=1)
+    assert result["timed_out"] and not result["success"]
+    assert result["errors"] == ["Smoke test timed out after 1 seconds"]
+
+    # The killed run holds nothing a later run needs
+    result = tester.run_isolated(str(valid), timeout=30)
+    assert result["success"] and not result["timed_out"]
+    assert result["stats"]["bars"] == 80
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import json
 import pytest
@@ -8,6 +9,12 @@ from AgenticDeveloper.agents.strategy_developer import StrategyDeveloperAgent
 def agent():
     return StrategyDeveloperAgent()
 
+
+@pytest.fixture(scope="module")
+def api_cache(tmp_path_factory):
+    """Lean API surface cache outside the package tree, shared by the module (parsing the stubs takes seconds)"""
+    return {"api_cache": str(tmp_path_factory.mktemp("lean_api") / "api_surface.json")}
+
 def test_run_creates_strategy_file(agent):
     strategy_dir = "Strategies/AgenticDev/FirstAutoStrategy"
     os.makedirs("Strategies/AgenticDev", exist_ok=True)
@@ -26,4 +33,138 @@ def test_run_creates_strategy_file(agent):
         history = json.load(f)
     assert isinstance(history, list)
     assert len(history) >= 1
-    assert any("version" in entry and "file" in entry for entry in history)
\ No newline at end of file
+    assert any("version" in entry and "file" in entry for entry in history)
+
+CANDIDATE = """```python
+from AlgorithmImports import *
+
+class Candidate(QCAlgorithm):
+    def Initialize(self):
+        self.SetStartDate(2020, 1, 1)
+        self.AddEquity("SPY", Resolution.Daily)
+        self.sharpe = {sharpe}
+
+    def OnData(self, data):
+        {body}
+```"""
+
+
+class CandidateLLM:
+    """Returns the next canned response per call and records use_cache flags"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.use_cache = []
+
+    async def ainvoke(self, prompt, use_cache=True, validate=None):
+        self.use_cache.append(use_cache)
+        await asyncio.sleep(0)
+        return self.responses.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_develop_candidates_backtests_only_passing_candidates(tmp_path, monkeypatch, api_cache):
+    invested = 'if not self.Portfolio.Invested: self.SetHoldings("SPY", 1)'
+    llm = CandidateLLM([
+        CANDIDATE.format(sharpe=0.5, body=invested),
+        CANDIDATE.format(sharpe=0.1, body="self.undefined_thing.Run()"),
+        CANDIDATE.format(sharpe=1.5, body=invested),
+        CANDIDATE.format(sharpe=0.9, body="if (:"),
+    ])
+
+    agent = StrategyDeveloperAgent(config={"agents": {"strategy_developer": {"smoke_test": True}},
+                                           "tools": {"smoke_backtest": {"bars": 30, "use_market_data": False},
+                                                     "code_validator": api_cache}})
+    agent.llm = llm
+    smoke_run = agent.backtester.run
+    lean_runs = []
+
+    async def run(strategy_path, mode="local", **kwargs):
+        if mode == "smoke":
+            return await smoke_run(strategy_path, mode="smoke")
+        # The scheduler runs version files from a copy of the project with the file as main.py
+        with open(os.path.join(strategy_path, "main.py")) as f:
+            sharpe = f.read().split("self.sharpe = ")[1].split("\n")[0]
+        lean_runs.append(strategy_path)
+        folder = tmp_path / "results" / sharpe
+        folder.mkdir(parents=True)
+        (folder / "results.json").write_text(json.dumps({"metrics": {"Sharpe Ratio": sharpe}}))
+        return {"folder_path": str(folder), "backtest_successful": True, "errors": []}
+
+    monkeypatch.setattr(agent.backtester, "run", run)
+    strategy_dir = tmp_path / "Strategy"
+    strategy_dir.mkdir()
+
+    path, code, result = await agent.develop_candidates("momentum", str(strategy_dir), 4)
+
+    assert llm.use_cache == [True, False, False, False]
+    # Only the two candidates that passed the checks were saved and backtested
+    assert len(lean_runs) == 2
+    assert sorted(name for name in os.listdir(strategy_dir) if not name.startswith(".")) == ["strategy_v1_0_0.py", "strategy_v1_0_1.py", "version_history.jsonl"]
+    assert "self.sharpe = 1.5" in code and path.endswith("strategy_v1_0_1.py")
+    assert result["backtest_successful"]
+    assert not os.path.exists(strategy_dir / ".jobs") or not os.listdir(strategy_dir / ".jobs")
+
+
+@pytest.mark.asyncio
+async def test_develop_candidates_returns_check_errors_when_nothing_passes(tmp_path, api_cache):
+    agent = StrategyDeveloperAgent(config={"agents": {"strategy_developer": {"smoke_test": False}},
+                                           "tools": {"code_validator": api_cache}})
+    agent.llm = CandidateLLM([CANDIDATE.format(sharpe=1, body="if (:")] * 2)
+
+    path, code, result = await agent.develop_candidates("momentum", str(tmp_path), 2)
+
+    assert not result["backtest_successful"] and "SyntaxError" in result["errors"][0]
+    assert path.endswith("strategy_v1_0_0.py") and os.path.exists(path)
+
+
+@pytest.mark.asyncio
+async def test_arun_many_overlaps_strategies_in_one_event_loop(tmp_path, monkeypatch, api_cache):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    agent = StrategyDeveloperAgent(config={"agents": {"strategy_developer": {"smoke_test": False}},
+                                           "tools": {"lean_cli": {"max_concurrent_backtests": 2},
+                                                     "code_validator": api_cache}})
+    agent.llm = CandidateLLM([CANDIDATE.format(sharpe=1, body="pass")] * 2)
+    in_flight, peak = 0, 0
+
+    async def run(strategy_path, mode="local", **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return {"folder_path": None, "backtest_successful": True, "errors": []}
+
+    monkeypatch.setattr(agent.backtester, "run", run)
+    tasks = []
+    for name in ("First", "Second"):
+        strategy_dir = tmp_path / name
+        strategy_dir.mkdir()
+        (strategy_dir / "main.py").write_text("")
+        (strategy_dir / "config.json").write_text("{}")
+        tasks.append({"instructions": "momentum", "strategy_dir": str(strategy_dir)})
+
+    paths = await agent.arun_many(tasks)
+
+    assert [os.path.basename(path) for path in paths] == ["strategy_v1_0_0.py"] * 2
+    assert peak == 2
+    with open(os.path.join(tasks[0]["strategy_dir"], "version_history.json")) as f:
+        assert [entry["file"] for entry in json.load(f)] == ["strategy_v1_0_0.py"]
+
+
+@pytest.mark.asyncio
+async def test_validation_errors_skip_smoke_and_lean(tmp_path, monkeypatch, api_cache):
+    agent = StrategyDeveloperAgent(config={"agents": {"strategy_developer": {"smoke_test": True}},
+                                           "tools": {"code_validator": api_cache}})
+
+    async def run(*args, **kwargs):
+        raise AssertionError("invalid code must not reach a backtest")
+
+    monkeypatch.setattr(agent.backtester, "run", run)
+    path = tmp_path / "strategy_v1_0_0.py"
+    path.write_text(agent._extract_code(CANDIDATE.format(sharpe=1, body="self.SetHoldings(Symbol('SPY'), wieght)")))
+
+    result = await agent.atest_generated_code(str(path))
+
+    assert not result["backtest_successful"]
+    assert any("undefined name 'wieght'" in error for error in result["errors"])
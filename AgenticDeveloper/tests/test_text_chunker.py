@@ -0,0 +1,43 @@
+from tools.text_chunker import TextChunker
+
+
+def paragraph(word: str, sentences: int = 5) -> str:
+    return " ".join(f"{word} sentence number {i} ends here." for i in range(sentences))
+
+
+def test_short_text_is_a_single_chunk():
+    assert TextChunker(max_tokens=500).chunk("Hello.\n\nWorld.") == ["Hello.\n\nWorld."]
+
+
+def test_chunks_respect_budget_and_paragraphs():
+    chunker = TextChunker(max_tokens=100)
+    paragraphs = [paragraph(f"p{i}") for i in range(10)]
+    chunks = chunker.chunk("\n\n".join(paragraphs))
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunker.estimate_tokens(chunk) <= 100
+        for piece in chunk.split("\n\n"):
+            assert piece in paragraphs
+
+
+def test_section_heading_starts_new_chunk():
+    chunker = TextChunker(max_tokens=200)
+    text = "\n\n".join([paragraph("intro", 12), "2 Methodology", paragraph("method", 2)])
+    chunks = chunker.chunk(text)
+    assert chunks[-1].startswith("2 Methodology")
+
+
+def test_overlap_repeats_tail_of_previous_chunk():
+    chunker = TextChunker(max_tokens=100, overlap_tokens=40)
+    chunks = chunker.chunk("\n\n".join(paragraph(f"p{i}", 3) for i in range(6)))
+    assert len(chunks) > 1
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.split("\n\n")[0].split(" ")[0] in previous
+
+
+def test_oversized_paragraph_is_split_by_sentence():
+    chunker = TextChunker(max_tokens=50)
+    chunks = chunker.chunk(paragraph("long", 40))
+    assert len(chunks) > 1
+    assert all(chunker.estimate_tokens(chunk) <= 50 for chunk in chunks)
+    assert all(chunk.endswith("here.") for chunk in chunks)
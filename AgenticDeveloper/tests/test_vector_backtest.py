@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from tools.vector_backtest import VectorBacktester, rolling_mean
+
+
+@pytest.fixture
+def closes():
+    rng = np.random.default_rng(7)
+    return 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, (400, 2)), axis=0))
+
+
+def loop_sma_positions(closes, fast, slow):
+    """Bar-by-bar reference matching testSMAStrategy's OnData"""
+    positions = np.zeros(len(closes))
+    held = 0.0
+    for t in range(len(closes)):
+        if t >= slow - 1:
+            f = closes[t - fast + 1:t + 1].mean()
+            s = closes[t - slow + 1:t + 1].mean()
+            if f > s:
+                held = 1.0
+            elif f < s:
+                held = 0.0
+        positions[t] = held
+    return positions
+
+
+def loop_returns(closes, positions, fee_rate=0.0):
+    returns = []
+    previous = 0.0
+    for t in range(len(closes) - 1):
+        fee = fee_rate * abs(positions[t] - previous)
+        returns.append(positions[t] * (closes[t + 1] / closes[t] - 1) - fee)
+        previous = positions[t]
+    return np.array(returns)
+
+
+def test_rolling_mean(closes):
+    sma = rolling_mean(closes[:, 0], 5)
+    assert np.isnan(sma[:4]).all()
+    assert sma[10] == pytest.approx(closes[6:11, 0].mean())
+
+
+def test_sma_crossover_matches_bar_by_bar_loop(closes):
+    result = VectorBacktester(fee_rate=0.001).sma_crossover(closes[:, 0], [5, 10, 40], [20, 30])
+    assert [p for p in result.params] == [
+        {"fast": 5, "slow": 20}, {"fast": 5, "slow": 30}, {"fast": 10, "slow": 20}, {"fast": 10, "slow": 30}
+    ]
+    for k, params in enumerate(result.params):
+        expected = loop_returns(closes[:, 0], loop_sma_positions(closes[:, 0], params["fast"], params["slow"]), 0.001)
+        np.testing.assert_allclose(result.returns[k], expected)
+        equity = np.cumprod(1 + expected)
+        assert result.metrics["total_return"][k] == pytest.approx(equity[-1] - 1)
+        peak = np.maximum.accumulate(np.concatenate([[1.0], equity]))[1:]
+        assert result.metrics["max_drawdown"][k] == pytest.approx((1 - equity / peak).max())
+
+
+def test_momentum_uses_tolerance_band():
+    closes = np.array([100, 110, 110 * 1.048, 100], dtype=float)
+    # Enters on +10%; the following +4.8% is inside the 4.5%-5.5% band, so the position is held
+    banded = VectorBacktester().momentum(closes, lookbacks=[1], thresholds=[0.05], tolerance=0.1)
+    np.testing.assert_allclose(banded.returns[0], [0, 0.048, 100 / (110 * 1.048) - 1])
+    assert banded.metrics["trades"][0] == 1
+    # Without tolerance +4.8% is below the threshold and the position is closed
+    plain = VectorBacktester().momentum(closes, lookbacks=[1], thresholds=[0.05])
+    np.testing.assert_allclose(plain.returns[0], [0, 0.048, 0])
+    assert plain.metrics["trades"][0] == 2
+
+
+def test_multi_symbol_weights_and_ranking(closes):
+    tester = VectorBacktester()
+    result = tester.sma_crossover(closes, range(5, 30, 5), range(20, 80, 10), weight=0.33)
+    assert len(result) == len([(f, s) for f in range(5, 30, 5) for s in range(20, 80, 10) if f < s])
+    single = [tester.sma_crossover(closes[:, n], [10], [30], weight=0.33).returns[0] for n in range(2)]
+    k = result.params.index({"fast": 10, "slow": 30})
+    np.testing.assert_allclose(result.returns[k], single[0] + single[1])
+
+    top = result.top(3)
+    assert len(top) == 3
+    assert top[0]["sharpe"] >= top[1]["sharpe"] >= top[2]["sharpe"]
+    assert set(top[0]) >= {"fast", "slow", "sharpe", "sortino", "max_drawdown", "turnover"}
+
+
+def test_evaluate_rejects_mismatched_positions(closes):
+    with pytest.raises(ValueError):
+        VectorBacktester().evaluate(closes, np.ones((2, 10, 2)))
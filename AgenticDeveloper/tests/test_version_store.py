@@ -0,0 +1,74 @@
+import gzip
+import json
+import os
+
+from tools.version_store import VersionStore, get_version_store
+
+
+def test_versions_are_numbered_and_logged(tmp_path):
+    store = VersionStore(str(tmp_path))
+    assert store.next_version() == "1_0_0"
+    first = store.add("code 1", llm_response="```python\ncode 1\n```")
+    second = store.add("code 2")
+
+    assert first["path"] == str(tmp_path / "strategy_v1_0_0.py")
+    assert (tmp_path / "strategy_v1_0_1.py").read_text() == "code 2"
+    assert store.next_version() == "1_0_2" and store.latest()["version"] == "1_0_1"
+    assert store.response("1_0_0") == "```python\ncode 1\n```" and store.response("1_0_1") is None
+    lines = (tmp_path / "version_history.jsonl").read_text().splitlines()
+    assert [json.loads(line)["version"] for line in lines] == ["1_0_0", "1_0_1"]
+    assert "code 1" not in lines[0]
+
+
+def test_responses_are_compressed_and_deduplicated(tmp_path):
+    store = VersionStore(str(tmp_path))
+    response = "same response " * 500
+    store.add("a", llm_response=response)
+    store.add("b", llm_response=response)
+
+    blobs = os.listdir(tmp_path / ".responses")
+    assert len(blobs) == 1 and store.get("1_0_0")["response"] == store.get("1_0_1")["response"]
+    assert os.path.getsize(tmp_path / ".responses" / blobs[0]) < len(response) / 10
+    with gzip.open(tmp_path / ".responses" / blobs[0], "rt") as f:
+        assert f.read() == response
+
+
+def test_reopen_continues_numbering_and_tolerates_torn_line(tmp_path):
+    store = VersionStore(str(tmp_path))
+    store.add("a")
+    (tmp_path / "strategy_v1_0_7.py").write_text("saved by hand")
+    with open(tmp_path / "version_history.jsonl", "a") as f:
+        f.write('{"version": "1_0_')
+
+    reopened = VersionStore(str(tmp_path))
+    assert len(reopened) == 1 and "1_0_0" in reopened
+    assert reopened.next_version() == "1_0_8"
+
+
+def test_imports_and_exports_legacy_json(tmp_path):
+    legacy = [{"version": "1_0_0", "file": "strategy_v1_0_0.py", "timestamp": "t", "description": "d",
+               "llm_full_response": "old response"}]
+    (tmp_path / "version_history.json").write_text(json.dumps(legacy))
+
+    store = VersionStore(str(tmp_path))
+    assert store.response("1_0_0") == "old response" and store.next_version() == "1_0_1"
+    store.add("b")
+    exported = json.loads(open(store.export_json()).read())
+    assert [entry["version"] for entry in exported] == ["1_0_0", "1_0_1"]
+    assert "llm_full_response" not in exported[0]
+
+
+def test_get_version_store_is_shared(tmp_path):
+    assert get_version_store(str(tmp_path)) is get_version_store(str(tmp_path) + "/")
+
+
+def test_add_never_overwrites_a_file_saved_elsewhere(tmp_path):
+    store = VersionStore(str(tmp_path))
+    store.add("code 1")
+    # Another writer saves the next version after the store was opened
+    (tmp_path / "strategy_v1_0_1.py").write_text("external")
+    entry = store.add("code 2")
+    assert entry["version"] == "1_0_2"
+    assert (tmp_path / "strategy_v1_0_1.py").read_text() == "external"
+    assert (tmp_path / "strategy_v1_0_2.py").read_text() == "code 2"
+    assert store.next_version() == "1_0_3"
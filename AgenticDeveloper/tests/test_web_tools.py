@@ -0,0 +1,144 @@
+import json
+import os
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from tools.web_tools import PDFHandler
+
+PDF_BYTES = b"%PDF-1.4\n" + os.urandom(200_000)
+
+
+@pytest_asyncio.fixture
+async def pdf_server(tmp_path):
+    source = tmp_path / "source.pdf"
+    source.write_bytes(PDF_BYTES)
+    requests = []
+
+    async def serve(request):
+        requests.append((request.method, request.headers.get("Range")))
+        return web.FileResponse(source)
+
+    app = web.Application()
+    app.router.add_route("*", "/paper.pdf", serve)
+    server = TestServer(app)
+    await server.start_server()
+    yield server, requests
+    await server.close()
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "AgenticDeveloper" / "research_papers"
+
+
+@pytest.mark.asyncio
+async def test_download_streams_and_skips_unchanged(pdf_server, workdir):
+    server, requests = pdf_server
+    url = str(server.make_url("/paper.pdf"))
+    async with PDFHandler() as handler:
+        path = await handler.download_pdf(url, "")
+        assert open(path, "rb").read() == PDF_BYTES
+        assert await handler.download_pdf(url, "") == path
+    assert [method for method, _ in requests] == ["GET", "HEAD"]
+
+
+async def server_etag(url, requests):
+    import aiohttp
+    async with aiohttp.ClientSession() as session:
+        async with session.head(url) as resp:
+            etag = resp.headers["ETag"]
+    requests.clear()
+    return etag
+
+
+def write_part(workdir, data, etag):
+    workdir.mkdir(parents=True)
+    (workdir / "paper.pdf.part").write_bytes(data)
+    if etag is not None:
+        (workdir / "paper.pdf.meta.json").write_text(json.dumps({"url": "", "etag": etag, "size": None}))
+
+
+@pytest.mark.asyncio
+async def test_partial_download_is_resumed(pdf_server, workdir):
+    server, requests = pdf_server
+    url = str(server.make_url("/paper.pdf"))
+    write_part(workdir, PDF_BYTES[:50_000], await server_etag(url, requests))
+    async with PDFHandler() as handler:
+        path = await handler.download_pdf(url, "")
+    assert open(path, "rb").read() == PDF_BYTES
+    assert requests == [("GET", "bytes=50000-")]
+
+
+@pytest.mark.asyncio
+async def test_partial_download_without_etag_restarts(pdf_server, workdir):
+    server, requests = pdf_server
+    url = str(server.make_url("/paper.pdf"))
+    write_part(workdir, b"stale bytes of an older version", None)
+    async with PDFHandler() as handler:
+        path = await handler.download_pdf(url, "")
+    assert open(path, "rb").read() == PDF_BYTES
+    assert requests == [("GET", None)]
+
+
+@pytest.mark.asyncio
+async def test_complete_part_is_finalized_on_416(pdf_server, workdir):
+    server, requests = pdf_server
+    url = str(server.make_url("/paper.pdf"))
+    # Interrupted after the last chunk was written but before the rename
+    write_part(workdir, PDF_BYTES, await server_etag(url, requests))
+    async with PDFHandler() as handler:
+        path = await handler.download_pdf(url, "")
+    assert path is not None and open(path, "rb").read() == PDF_BYTES
+    assert not os.path.exists(workdir / "paper.pdf.part")
+    assert requests == [("GET", f"bytes={len(PDF_BYTES)}-")]
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    import fitz
+    doc = fitz.open()
+    for i in range(12):
+        doc.new_page().insert_text((72, 72), f"Page number {i}")
+    path = tmp_path / "sample.pdf"
+    doc.save(str(path))
+    return str(path)
+
+
+def expected_text(path):
+    import fitz
+    with fitz.open(path) as doc:
+        return "".join(page.get_text() for page in doc)
+
+
+def test_extract_text_in_parallel_and_cached(sample_pdf):
+    handler = PDFHandler(extract_workers=3)
+    assert len(handler._page_ranges(sample_pdf)) == 3
+    text = handler.extract_text(sample_pdf)
+    assert text == expected_text(sample_pdf)
+
+    cache_files = [f for f in os.listdir(os.path.dirname(sample_pdf)) if f.endswith(".txt")]
+    assert len(cache_files) == 1
+    with open(os.path.join(os.path.dirname(sample_pdf), cache_files[0]), "w") as f:
+        f.write("from cache")
+    assert handler.extract_text(sample_pdf) == "from cache"
+    PDFHandler.shutdown_extract_pool()
+
+
+@pytest.mark.asyncio
+async def test_aextract_text_matches_sync(sample_pdf):
+    async with PDFHandler(extract_workers=2) as handler:
+        assert await handler.aextract_text(sample_pdf) == expected_text(sample_pdf)
+
+
+@pytest.mark.asyncio
+async def test_close_shuts_down_extract_pool(sample_pdf):
+    handler = PDFHandler(extract_workers=2)
+    await handler.aextract_text(sample_pdf)
+    pool = PDFHandler._extract_pool
+    assert pool is not None
+    await handler.close()
+    assert PDFHandler._extract_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(len, "")
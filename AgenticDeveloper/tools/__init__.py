@@ -1,3 +1,20 @@
 from .web_tools import ArxivSearchTool, PDFHandler, HTMLHandler
+from .text_chunker import TextChunker
+from .idea_store import IdeaStore
+from .smoke_backtest import SmokeBacktester
+from .vector_backtest import VectorBacktester, ScreenResult
+from .market_data import MarketDataCache, LeanDataImporter, get_market_data_cache
+from .backtest_index import BacktestIndex, get_backtest_index, update_backtest_index
+from .order_events import OrderEventAggregator, iter_order_events, summarize_order_events
+from .code_validator import LeanApiSurface, get_lean_api_surface, validate_strategy_code
+from .version_store import VersionStore, get_version_store
+from .backtest_dedup import BacktestResultCache, get_backtest_result_cache, normalize_strategy_code, strategy_fingerprint
 
-__all__ = ['ArxivSearchTool', 'PDFHandler', 'HTMLHandler']
\ No newline at end of file
+__all__ = ['ArxivSearchTool', 'PDFHandler', 'HTMLHandler', 'TextChunker', 'IdeaStore',
+           'SmokeBacktester', 'VectorBacktester', 'ScreenResult',
+           'MarketDataCache', 'LeanDataImporter', 'get_market_data_cache',
+           'BacktestIndex', 'get_backtest_index', 'update_backtest_index',
+           'OrderEventAggregator', 'iter_order_events', 'summarize_order_events',
+           'LeanApiSurface', 'get_lean_api_surface', 'validate_strategy_code',
+           'VersionStore', 'get_version_store',
+           'BacktestResultCache', 'get_backtest_result_cache', 'normalize_strategy_code', 'strategy_fingerprint']
\ No newline at end of file
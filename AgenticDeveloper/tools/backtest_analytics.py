@@ -0,0 +1,264 @@
+"""
+Trade- and series-level analytics for a Lean backtest output folder.
+
+``compute_analytics`` derives drawdown periods, rolling drawdown, a monthly return
+table, trade duration buckets, exposure and turnover from the result charts and the
+order-event summary; ``format_analytics`` renders them as a compact text block for an
+LLM prompt that fits a token budget, dropping the least important detail first.
+"""
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .backtest_results import find_backtest_id
+from .text_chunker import TextChunker
+
+# Upper bounds (days) of the trade holding-period buckets
+DURATION_BUCKETS = [(1, "<1d"), (5, "1-5d"), (20, "5-20d"), (60, "20-60d"), (np.inf, ">60d")]
+ROLLING_DRAWDOWN_DAYS = 63
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def load_charts(folder_path: str) -> Dict[str, Dict[str, Any]]:
+    """Charts from the backtest's <id>.json (or results.json): {chart: {series: pandas Series}}"""
+    import pandas as pd
+    candidates = []
+    backtest_id = find_backtest_id(folder_path)
+    if backtest_id:
+        candidates.append(os.path.join(folder_path, f"{backtest_id}.json"))
+    candidates.append(os.path.join(folder_path, "results.json"))
+    for path in candidates:
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, "r") as f:
+                charts = json.load(f).get("charts")
+        except (json.JSONDecodeError, AttributeError):
+            continue
+        if not charts:
+            continue
+        parsed = {}
+        for chart_name, chart in charts.items():
+            parsed[chart_name] = {}
+            for series_name, series in (chart.get("series") or {}).items():
+                points = []
+                for value in series.get("values") or []:
+                    # {"x": t, "y": v} in older Lean versions, [t, v] or [t, open, high, low, close] in newer ones
+                    if isinstance(value, dict):
+                        points.append((value.get("x"), value.get("y")))
+                    elif isinstance(value, (list, tuple)) and len(value) >= 2:
+                        points.append((value[0], value[-1]))
+                points = [(x, y) for x, y in points if x is not None and y is not None]
+                if points:
+                    times, values = zip(*points)
+                    index = pd.to_datetime(np.asarray(times, dtype=float), unit="s")
+                    parsed[chart_name][series_name] = pd.Series(np.asarray(values, dtype=float), index=index).sort_index()
+        return parsed
+    return {}
+
+
+def _daily(series):
+    daily = series.groupby(series.index.normalize()).last()
+    return daily[daily > 0] if len(daily) else daily
+
+
+def _drawdown_analytics(daily) -> Dict[str, Any]:
+    drawdown = daily / daily.cummax() - 1
+    underwater = drawdown < 0
+    # Consecutive underwater days share the count of peaks seen so far
+    period_ids = (~underwater).cumsum()
+    periods = []
+    for _, period in drawdown[underwater].groupby(period_ids[underwater]):
+        trough = period.idxmin()
+        end = period.index[-1]
+        recovered = end != drawdown.index[-1]
+        periods.append({
+            "depth": float(period.min()),
+            "start": str(period.index[0].date()),
+            "trough": str(trough.date()),
+            "recovered": str((drawdown.index[drawdown.index.get_loc(end) + 1]).date()) if recovered else None,
+            "days": int((end - period.index[0]).days) + 1,
+        })
+    periods.sort(key=lambda p: p["depth"])
+
+    rolling = None
+    if len(daily) > ROLLING_DRAWDOWN_DAYS:
+        values = daily.values
+        windows = np.lib.stride_tricks.sliding_window_view(values, ROLLING_DRAWDOWN_DAYS)
+        rolling_dd = (windows / np.maximum.accumulate(windows, axis=1) - 1).min(axis=1)
+        rolling = {"window_days": ROLLING_DRAWDOWN_DAYS, "worst": float(rolling_dd.min()),
+                   "median": float(np.median(rolling_dd)), "latest": float(rolling_dd[-1])}
+    return {
+        "max": float(drawdown.min()),
+        "current": float(drawdown.iloc[-1]),
+        "time_underwater": float(underwater.mean()),
+        "worst_periods": periods[:3],
+        "rolling": rolling,
+    }
+
+
+def _monthly_returns(daily) -> Dict[str, Any]:
+    month_end = daily.groupby([daily.index.year, daily.index.month]).last()
+    previous = np.concatenate([[daily.iloc[0]], month_end.values[:-1]])
+    returns = month_end.values / previous - 1
+    table: Dict[int, List[Optional[float]]] = {}
+    for (year, month), value in zip(month_end.index, returns):
+        table.setdefault(int(year), [None] * 12)[int(month) - 1] = float(value)
+    best = int(np.argmax(returns))
+    worst = int(np.argmin(returns))
+    label = lambda i: f"{MONTHS[month_end.index[i][1] - 1]} {month_end.index[i][0]}"
+    return {
+        "table": table,
+        "positive_fraction": float((returns > 0).mean()),
+        "best": {"month": label(best), "return": float(returns[best])},
+        "worst": {"month": label(worst), "return": float(returns[worst])},
+    }
+
+
+def _trade_analytics(order_summary: Dict[str, Any], trades: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    analytics = {key: order_summary.get(key) for key in (
+        "trades", "win_rate", "profit_factor", "max_win_streak", "max_loss_streak", "fees", "open_positions"
+    )}
+    analytics["holding_days"] = order_summary.get("holding_days")
+    analytics["trade_pnl"] = order_summary.get("trade_pnl")
+    if (order_summary.get("slippage_bps") or {}).get("count"):
+        analytics["slippage_bps"] = order_summary["slippage_bps"]
+    if trades:
+        days = np.array([trade["holding_seconds"] for trade in trades]) / 86400
+        pnl = np.array([trade["pnl"] for trade in trades])
+        bucket = np.digitize(days, [upper for upper, _ in DURATION_BUCKETS[:-1]])
+        analytics["duration_buckets"] = [
+            {"bucket": name, "trades": int((bucket == i).sum()),
+             "win_rate": float((pnl[bucket == i] > 0).mean()) if (bucket == i).any() else None,
+             "avg_pnl": float(pnl[bucket == i].mean()) if (bucket == i).any() else None}
+            for i, (_, name) in enumerate(DURATION_BUCKETS)
+        ]
+        analytics["median_holding_days"] = float(np.median(days))
+    return analytics
+
+
+def _series_summary(series, invested_threshold: Optional[float] = None) -> Dict[str, float]:
+    summary = {"mean": float(series.mean()), "max": float(series.max()), "latest": float(series.iloc[-1])}
+    if invested_threshold is not None:
+        summary["invested_fraction"] = float((series > invested_threshold).mean())
+    return summary
+
+
+def compute_analytics(folder_path: str, order_summary: Optional[Dict[str, Any]] = None,
+                      trades: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Analytics for one backtest folder. order_summary / trades come from
+    tools.order_events.summarize_order_events(..., include_trades=True).
+    Sections whose inputs are missing are left out.
+    """
+    charts = load_charts(folder_path)
+    analytics: Dict[str, Any] = {}
+
+    equity = charts.get("Strategy Equity", {}).get("Equity")
+    if equity is not None:
+        daily = _daily(equity)
+        if len(daily) > 1:
+            analytics["drawdown"] = _drawdown_analytics(daily)
+            analytics["monthly_returns"] = _monthly_returns(daily)
+
+    if order_summary and order_summary.get("fills"):
+        analytics["trades"] = _trade_analytics(order_summary, trades)
+
+    exposure = charts.get("Exposure", {})
+    long_series = [s for name, s in exposure.items() if "long ratio" in name.lower()]
+    short_series = [s for name, s in exposure.items() if "short ratio" in name.lower()]
+    if long_series or short_series:
+        import pandas as pd
+        gross = pd.concat([series.abs() for series in long_series + short_series], axis=1).ffill().fillna(0).sum(axis=1)
+        analytics["exposure"] = _series_summary(gross, invested_threshold=0.01)
+
+    turnover = charts.get("Portfolio Turnover", {}).get("Portfolio Turnover")
+    if turnover is not None and len(turnover):
+        analytics["turnover"] = _series_summary(turnover)
+    return analytics
+
+
+def _pct(value: Optional[float], digits: int = 1) -> str:
+    return "n/a" if value is None else f"{value * 100:.{digits}f}%"
+
+
+def _num(value: Optional[float], digits: int = 2) -> str:
+    return "n/a" if value is None else f"{value:.{digits}f}"
+
+
+def format_analytics(analytics: Dict[str, Any], max_tokens: int = 600, chars_per_token: float = 4.0) -> str:
+    """
+    Render analytics as a compact text block within max_tokens (estimated). Monthly rows
+    are dropped oldest first, then whole sections from least to most important
+    (turnover, exposure, monthly returns, trades, drawdown).
+    """
+    estimator = TextChunker(chars_per_token=chars_per_token)
+    sections: List[List[str]] = []
+
+    drawdown = analytics.get("drawdown")
+    if drawdown:
+        lines = [f"Drawdown: max {_pct(drawdown['max'])}, current {_pct(drawdown['current'])}, "
+                 f"underwater {_pct(drawdown['time_underwater'], 0)} of days"]
+        for period in drawdown["worst_periods"]:
+            lines.append(f"- {_pct(period['depth'])} from {period['start']}, trough {period['trough']}, "
+                         f"{'recovered ' + period['recovered'] if period['recovered'] else 'not recovered'} ({period['days']}d)")
+        if drawdown.get("rolling"):
+            rolling = drawdown["rolling"]
+            lines.append(f"- rolling {rolling['window_days']}d drawdown: worst {_pct(rolling['worst'])}, "
+                         f"median {_pct(rolling['median'])}, latest {_pct(rolling['latest'])}")
+        sections.append(lines)
+
+    trades = analytics.get("trades")
+    if trades:
+        holding = trades.get("holding_days") or {}
+        pnl = trades.get("trade_pnl") or {}
+        lines = [f"Trades: {trades['trades']} closed ({trades['open_positions']} open), win rate {_pct(trades['win_rate'], 0)}, "
+                 f"profit factor {_num(trades['profit_factor'])}, avg P&L {_num(pnl.get('mean'))}, "
+                 f"streaks win {trades['max_win_streak']} / loss {trades['max_loss_streak']}, fees {_num(trades['fees'])}",
+                 f"- holding days: mean {_num(holding.get('mean'), 1)}, median {_num(trades.get('median_holding_days'), 1)}, "
+                 f"max {_num(holding.get('max'), 1)}"]
+        if trades.get("slippage_bps"):
+            slippage = trades["slippage_bps"]
+            lines.append(f"- limit/stop slippage: mean {_num(slippage['mean'], 1)} bps, worst {_num(slippage['max'], 1)} bps")
+        if trades.get("duration_buckets"):
+            lines.append("- by duration: " + "; ".join(
+                f"{b['bucket']} {b['trades']} trades, win {_pct(b['win_rate'], 0)}, avg {_num(b['avg_pnl'])}"
+                for b in trades["duration_buckets"] if b["trades"]
+            ))
+        sections.append(lines)
+
+    monthly = analytics.get("monthly_returns")
+    monthly_lines = None
+    if monthly:
+        lines = [f"Monthly returns (%): positive {_pct(monthly['positive_fraction'], 0)} of months, "
+                 f"best {monthly['best']['month']} {_pct(monthly['best']['return'])}, "
+                 f"worst {monthly['worst']['month']} {_pct(monthly['worst']['return'])}",
+                 "year " + " ".join(f"{m:>5}" for m in MONTHS)]
+        for year in sorted(monthly["table"], reverse=True):
+            lines.append((f"{year} " + " ".join(
+                f"{'' if v is None else f'{v * 100:.1f}':>5}" for v in monthly["table"][year]
+            )).rstrip())
+        monthly_lines = lines
+        sections.append(lines)
+
+    for key, title, invested in (("exposure", "Gross exposure", True), ("turnover", "Portfolio turnover", False)):
+        summary = analytics.get(key)
+        if summary:
+            line = f"{title}: mean {_pct(summary['mean'])}, max {_pct(summary['max'])}, latest {_pct(summary['latest'])}"
+            if invested:
+                line += f", invested {_pct(summary['invested_fraction'], 0)} of the time"
+            sections.append([line])
+
+    def render() -> str:
+        return "\n".join(line for section in sections for line in section)
+
+    text = render()
+    while sections and estimator.estimate_tokens(text) > max_tokens:
+        if monthly_lines is not None and len(monthly_lines) > 3:
+            monthly_lines.pop()
+        elif sections.pop() is monthly_lines:
+            monthly_lines = None
+        text = render()
+    return text
@@ -0,0 +1,103 @@
+"""
+Recognize semantically identical strategy versions so their backtests are run once.
+
+``normalize_strategy_code`` reduces code to its AST: comments, docstrings, blank lines
+and formatting do not change the result. ``strategy_fingerprint`` hashes that together
+with the project's config.json (parameters; ids dropped) and the backtest mode. The date
+range is part of the code (SetStartDate/SetEndDate) and so part of the fingerprint.
+``BacktestResultCache`` maps fingerprints to the successful backtest that produced them.
+"""
+import ast
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# config.json keys that identify the project rather than change what is backtested
+CONFIG_IGNORED_KEYS = {"cloud-id", "local-id", "organization-id", "description"}
+
+_caches: Dict[str, "BacktestResultCache"] = {}
+_caches_lock = threading.Lock()
+
+
+def normalize_strategy_code(code: str) -> str:
+    """Canonical form of the code: its AST unparsed without comments or docstrings (the code itself if it does not parse)"""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return code.strip()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) and node.body:
+            first = node.body[0]
+            if isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant) and isinstance(first.value.value, str):
+                node.body = node.body[1:] or [ast.Pass()]
+    return ast.unparse(tree)
+
+
+def strategy_fingerprint(code: str, config: Optional[Dict[str, Any]] = None, mode: str = "local") -> str:
+    """Hash of the normalized code, the project config and the backtest mode"""
+    config = {key: value for key, value in (config or {}).items() if key not in CONFIG_IGNORED_KEYS}
+    payload = json.dumps([normalize_strategy_code(code), config, mode], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BacktestResultCache:
+    """
+    Append-only JSONL log of successful backtests keyed by strategy fingerprint. An entry
+    is only served while its output folder still exists, so deleted results are re-run.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._entries[entry["key"]] = entry
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None or (entry.get("folder_path") and not os.path.isdir(entry["folder_path"])):
+            return None
+        return entry
+
+    def put(self, key: str, strategy_path: str, result: Dict[str, Any]) -> None:
+        entry = {
+            "key": key,
+            "strategy_path": strategy_path,
+            "timestamp": datetime.now().isoformat(),
+            "result": result,
+            "folder_path": result.get("folder_path"),
+        }
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+            self._entries[key] = entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def get_backtest_result_cache(config: Dict) -> BacktestResultCache:
+    """Return the process-wide ``BacktestResultCache`` for tools.lean_cli.result_cache.
+
+    Relative paths are resolved against the AgenticDeveloper package directory.
+    """
+    path = config.get("result_cache", "backtest_index/result_cache.jsonl")
+    if not os.path.isabs(path):
+        path = str(Path(__file__).parent.parent / path)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = BacktestResultCache(path)
+            _caches[path] = cache
+        return cache
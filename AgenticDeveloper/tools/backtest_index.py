@@ -0,0 +1,240 @@
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .backtest_results import find_backtest_id, load_statistics
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS backtests (
+    folder_path TEXT PRIMARY KEY,
+    strategy TEXT NOT NULL,
+    run_name TEXT NOT NULL,
+    backtest_id TEXT,
+    version TEXT,
+    code_hash TEXT,
+    has_results INTEGER NOT NULL,
+    signature REAL NOT NULL,
+    indexed_at REAL NOT NULL,
+    statistics TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    folder_path TEXT NOT NULL REFERENCES backtests(folder_path) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (folder_path, name)
+);
+CREATE INDEX IF NOT EXISTS metrics_by_name ON metrics (name, value);
+CREATE INDEX IF NOT EXISTS backtests_by_strategy ON backtests (strategy);
+"""
+
+_indexes: Dict[str, "BacktestIndex"] = {}
+_indexes_lock = threading.Lock()
+
+
+def _hash_file(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class BacktestIndex:
+    """
+    SQLite index of Lean backtest output folders and their statistics.
+
+    ``update`` scans ``<root>/**/backtests/*`` and only re-reads folders whose contents
+    changed since they were indexed (by modification time), dropping folders that no
+    longer exist. Each folder is linked to its strategy project and, when its
+    ``code/main.py`` matches one of the project's ``strategy_v*.py`` files, to that
+    version. Numeric statistics go into a ``metrics`` table indexed by name and value,
+    so queries such as ``top("Sharpe Ratio", 10)`` never touch the JSON files.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def _signature(folder_path: str) -> float:
+        """Latest modification time of the folder and the files Lean writes into it"""
+        paths = [folder_path] + glob.glob(os.path.join(folder_path, "*.json"))
+        return max(os.path.getmtime(path) for path in paths if os.path.exists(path))
+
+    @staticmethod
+    def _version_hashes(project_dir: str) -> Dict[str, str]:
+        return {
+            digest: os.path.basename(path)
+            for path in sorted(glob.glob(os.path.join(project_dir, "strategy_v*.py")))
+            if (digest := _hash_file(path))
+        }
+
+    def update(self, root: str) -> Dict[str, int]:
+        """Index new and changed backtest folders under root. Returns counts of added/updated/removed/unchanged."""
+        root = os.path.abspath(root)
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        folders = sorted(
+            path for path in glob.glob(os.path.join(root, "**", "backtests", "*"), recursive=True)
+            if os.path.isdir(path) and "/.jobs/" not in path
+        )
+        with self._lock:
+            known = {
+                row["folder_path"]: row["signature"]
+                for row in self._conn.execute(
+                    "SELECT folder_path, signature FROM backtests WHERE folder_path LIKE ?", (root + os.sep + "%",)
+                )
+            }
+        version_hashes: Dict[str, Dict[str, str]] = {}
+
+        for folder in folders:
+            signature = self._signature(folder)
+            if known.get(folder) == signature:
+                counts["unchanged"] += 1
+                continue
+            project_dir = os.path.dirname(os.path.dirname(folder))
+            if project_dir not in version_hashes:
+                version_hashes[project_dir] = self._version_hashes(project_dir)
+            self._index_folder(folder, root, project_dir, signature, version_hashes[project_dir])
+            counts["updated" if folder in known else "added"] += 1
+
+        removed = set(known) - set(folders)
+        if removed:
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM backtests WHERE folder_path = ?", [(path,) for path in removed])
+            counts["removed"] = len(removed)
+        return counts
+
+    def _index_folder(self, folder: str, root: str, project_dir: str, signature: float,
+                      version_hashes: Dict[str, str]) -> None:
+        statistics = load_statistics(folder)
+        code_hash = _hash_file(os.path.join(folder, "code", "main.py"))
+        row = (
+            folder,
+            os.path.relpath(project_dir, root),
+            os.path.basename(folder),
+            find_backtest_id(folder),
+            version_hashes.get(code_hash),
+            code_hash,
+            int(bool(statistics)),
+            signature,
+            time.time(),
+            json.dumps(statistics),
+        )
+        metrics = [(folder, name, float(value)) for name, value in statistics.items()
+                   if isinstance(value, (int, float)) and not isinstance(value, bool)]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM backtests WHERE folder_path = ?", (folder,))
+            self._conn.execute("INSERT INTO backtests VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+            self._conn.executemany("INSERT INTO metrics VALUES (?, ?, ?)", metrics)
+
+    def top(self, metric: str = "Sharpe Ratio", n: int = 10, strategy: Optional[str] = None,
+            ascending: bool = False, versions_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        The n backtests with the highest (or lowest) value of a metric, optionally for one
+        strategy. With versions_only, only runs of a known strategy_v*.py version are
+        considered and each version appears once, with its best run.
+        """
+        order = "ASC" if ascending else "DESC"
+        best = "MIN" if ascending else "MAX"
+        where = ["m.name = ?"]
+        params: List[Any] = [metric]
+        if strategy is not None:
+            where.append("b.strategy = ?")
+            params.append(strategy)
+        if versions_only:
+            where.append("b.version IS NOT NULL")
+            query = f"""
+                SELECT b.strategy, b.version, {best}(m.value) AS value, b.folder_path, b.run_name
+                FROM metrics m JOIN backtests b ON b.folder_path = m.folder_path
+                WHERE {' AND '.join(where)}
+                GROUP BY b.strategy, b.version ORDER BY value {order} LIMIT ?"""
+        else:
+            query = f"""
+                SELECT b.strategy, b.version, m.value AS value, b.folder_path, b.run_name
+                FROM metrics m JOIN backtests b ON b.folder_path = m.folder_path
+                WHERE {' AND '.join(where)} ORDER BY m.value {order} LIMIT ?"""
+        params.append(n)
+        return self.query(query, params)
+
+    def get(self, folder_path: str) -> Optional[Dict[str, Any]]:
+        rows = self.query("SELECT * FROM backtests WHERE folder_path = ?", [os.path.abspath(folder_path)])
+        if not rows:
+            return None
+        row = rows[0]
+        row["statistics"] = json.loads(row["statistics"])
+        return row
+
+    def runs(self, strategy: Optional[str] = None) -> List[Dict[str, Any]]:
+        if strategy is None:
+            return self.query("SELECT folder_path, strategy, run_name, version, has_results FROM backtests ORDER BY folder_path")
+        return self.query(
+            "SELECT folder_path, strategy, run_name, version, has_results FROM backtests WHERE strategy = ? ORDER BY folder_path",
+            [strategy]
+        )
+
+    def query(self, sql: str, params: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params or [])]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def get_backtest_index(config: Dict) -> BacktestIndex:
+    """Return the process-wide ``BacktestIndex`` for tools.backtest_index.path.
+
+    Relative paths are resolved against the AgenticDeveloper package directory.
+    """
+    path = config.get("path", "backtest_index/backtests.sqlite")
+    if not os.path.isabs(path):
+        path = str(Path(__file__).parent.parent / path)
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = BacktestIndex(path)
+            _indexes[path] = index
+        return index
+
+
+def update_backtest_index(config: Dict) -> Dict[str, int]:
+    """Update the index for tools.backtest_index from its strategies_root (relative to the package directory)"""
+    root = config.get("strategies_root", "../Strategies")
+    if not os.path.isabs(root):
+        root = str(Path(__file__).parent.parent / root)
+    return get_backtest_index(config).update(root)
+
+
+if __name__ == "__main__":
+    import argparse
+    import yaml
+
+    parser = argparse.ArgumentParser(description="Update the backtest index and list the top backtests by a metric")
+    parser.add_argument("--metric", default="Sharpe Ratio")
+    parser.add_argument("-n", type=int, default=10, help="Number of backtests to list")
+    parser.add_argument("--strategy", help="Only backtests of this strategy (path relative to strategies_root)")
+    parser.add_argument("--ascending", action="store_true", help="Lowest values first (e.g. for Drawdown)")
+    parser.add_argument("--versions-only", action="store_true", help="Best run of each strategy_v*.py version")
+    args = parser.parse_args()
+
+    with open(Path(__file__).parent.parent / "config" / "system_config.yaml", "r") as f:
+        index_config = yaml.safe_load(f).get("tools", {}).get("backtest_index", {})
+    counts = update_backtest_index(index_config)
+    print(", ".join(f"{count} {name}" for name, count in counts.items()))
+
+    rows = get_backtest_index(index_config).top(args.metric, args.n, strategy=args.strategy,
+                                                ascending=args.ascending, versions_only=args.versions_only)
+    for rank, row in enumerate(rows, 1):
+        print(f"{rank:>3}. {row['value']:>10.4g}  {row['strategy']}  {row['version'] or '-'}  {row['run_name']}")
@@ -0,0 +1,66 @@
+import glob
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+# Lean result files are named <backtest id>.json, <id>-summary.json, <id>-order-events.json, ...
+RESULT_FILE_PATTERN = re.compile(r"^(\d+)(-[a-z\-]+)?\.json$")
+NUMBER = re.compile(r"^[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?$")
+# Statistics where a lower value is better when ranking backtests
+LOWER_IS_BETTER = {"Drawdown", "Annual Standard Deviation", "Tracking Error", "Portfolio Turnover", "Loss Rate"}
+
+
+def parse_statistic(value: Any) -> Any:
+    """Convert a Lean statistic such as "12.5%", "$1,234.50" or "0.8" to a float; other values are returned as is"""
+    if not isinstance(value, str):
+        return value
+    text = value.strip().replace(",", "").replace("$", "").rstrip("%").strip()
+    return float(text) if NUMBER.match(text) else value
+
+
+def find_backtest_id(folder_path: str) -> Optional[str]:
+    for path in sorted(glob.glob(os.path.join(folder_path, "[0-9]*.json"))):
+        match = RESULT_FILE_PATTERN.match(os.path.basename(path))
+        if match:
+            return match.group(1)
+    return None
+
+
+def load_statistics(folder_path: str) -> Dict[str, Any]:
+    """
+    Backtest statistics of a Lean output folder, keyed by Lean's names ("Sharpe Ratio", "Drawdown", ...)
+    with numeric values parsed. Read from results.json ("metrics"), <id>-summary.json or
+    <id>.json ("statistics"), whichever exists first. Returns {} if there are none.
+    """
+    candidates = [(os.path.join(folder_path, "results.json"), "metrics")]
+    backtest_id = find_backtest_id(folder_path)
+    if backtest_id:
+        candidates += [
+            (os.path.join(folder_path, f"{backtest_id}-summary.json"), "statistics"),
+            (os.path.join(folder_path, f"{backtest_id}.json"), "statistics"),
+        ]
+    for path, key in candidates:
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, "r") as f:
+                statistics = json.load(f).get(key)
+        except (json.JSONDecodeError, AttributeError):
+            continue
+        if statistics:
+            return {name: parse_statistic(value) for name, value in statistics.items()}
+    return {}
+
+
+def format_table(rows: List[Dict[str, Any]], columns: Optional[List[str]] = None) -> str:
+    """Fixed-width text table of backtest rows for logs (default columns: all but folder_path)"""
+    columns = columns or [c for c in dict.fromkeys(c for row in rows for c in row) if c != "folder_path"]
+
+    def cell(value: Any) -> str:
+        return f"{value:.4g}" if isinstance(value, float) else ("" if value is None else str(value))
+
+    widths = {c: max([len(c)] + [len(cell(row.get(c))) for row in rows]) for c in columns}
+    lines = ["  ".join(c.ljust(widths[c]) for c in columns).rstrip()]
+    lines += ["  ".join(cell(row.get(c)).ljust(widths[c]) for c in columns).rstrip() for row in rows]
+    return "\n".join(lines)
@@ -0,0 +1,301 @@
+"""
+Static checks for generated Lean strategy code, run before any backtest.
+
+``validate_strategy_code`` parses and compiles the code, requires a ``QCAlgorithm``
+subclass that defines ``Initialize``/``initialize``, reports names and ``self.``
+attributes that exist neither in the code nor in the Lean API, and flags code that
+mixes the PascalCase and snake_case APIs. It takes milliseconds, so broken code is
+sent back to the LLM without a smoke or Lean run.
+
+The Lean API surface is read from the ``quantconnect-stubs`` package: the names
+``from AlgorithmImports import *`` provides and the members of ``QCAlgorithm``.
+Parsing the stubs takes seconds, so the surface is cached in a JSON file per stubs
+version. Without the stubs the name and attribute checks are skipped.
+"""
+import ast
+import builtins
+import importlib.util
+import json
+import os
+import threading
+import typing
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+ALGORITHM_BASES = {"QCAlgorithm", "QCAlgorithmFramework", "QCAlgorithmFrameworkBridge"}
+MODULE_NAMES = {"__name__", "__file__", "__doc__", "__builtins__", "__spec__", "__loader__", "__package__"}
+
+_surfaces: Dict[str, Optional["LeanApiSurface"]] = {}
+_surfaces_lock = threading.Lock()
+
+
+def _normalize(name: str) -> str:
+    """SetHoldings, set_holdings and setHoldings all normalize to setholdings"""
+    return name.replace("_", "").lower()
+
+
+def _stub_path(stubs_root: str, module: str) -> Optional[str]:
+    parts = module.split(".")
+    for path in (os.path.join(stubs_root, *parts, "__init__.pyi"), os.path.join(stubs_root, *parts) + ".pyi"):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _top_level_names(tree: ast.Module) -> Set[str]:
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.Assign):
+            names.update(target.id for target in node.targets if isinstance(target, ast.Name))
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            names.add(node.target.id)
+    return {name for name in names if not name.startswith("_")}
+
+
+def _class_members(node: ast.ClassDef) -> Set[str]:
+    members = set()
+    for item in node.body:
+        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            members.add(item.name)
+        elif isinstance(item, ast.Assign):
+            members.update(target.id for target in item.targets if isinstance(target, ast.Name))
+        elif isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
+            members.add(item.target.id)
+    return members
+
+
+class LeanApiSurface:
+    """
+    Names available to a Lean algorithm: ``modules`` maps each module star-imported by
+    AlgorithmImports (and AlgorithmImports itself) to the names it exports, and
+    ``algorithm_members`` holds the methods and properties of QCAlgorithm.
+    """
+
+    def __init__(self, modules: Dict[str, Set[str]], algorithm_members: Set[str], version: str = ""):
+        self.modules = modules
+        self.algorithm_members = algorithm_members
+        self.version = version
+        self._normalized_members = {_normalize(name) for name in algorithm_members}
+
+    def is_algorithm_member(self, name: str) -> bool:
+        """Whether name is a QCAlgorithm member in either naming style (the stubs only list snake_case)"""
+        return name in self.algorithm_members or _normalize(name) in self._normalized_members
+
+    @classmethod
+    def from_stubs(cls) -> Optional["LeanApiSurface"]:
+        """Build the surface from the installed quantconnect-stubs, or None if they are not installed"""
+        spec = importlib.util.find_spec("AlgorithmImports")
+        if spec is None or not spec.submodule_search_locations:
+            return None
+        init_path = os.path.join(list(spec.submodule_search_locations)[0], "__init__.pyi")
+        if not os.path.exists(init_path):
+            return None
+        stubs_root = os.path.dirname(os.path.dirname(init_path))
+        with open(init_path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+
+        modules: Dict[str, Set[str]] = {}
+        exported = _top_level_names(tree)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                if node.names[0].name == "*":
+                    if node.module == "typing":
+                        names = set(typing.__all__)
+                    else:
+                        path = _stub_path(stubs_root, node.module)
+                        if path is None:
+                            continue
+                        with open(path, "r", encoding="utf-8") as f:
+                            names = _top_level_names(ast.parse(f.read()))
+                    modules[node.module] = names
+                    exported |= names
+                else:
+                    exported.update(alias.asname or alias.name for alias in node.names)
+            elif isinstance(node, ast.Import):
+                exported.update(alias.asname or alias.name.split(".")[0] for alias in node.names)
+        modules["AlgorithmImports"] = exported
+
+        algorithm_path = _stub_path(stubs_root, "QuantConnect.Algorithm")
+        members = set()
+        if algorithm_path:
+            with open(algorithm_path, "r", encoding="utf-8") as f:
+                members = next((_class_members(node) for node in ast.parse(f.read()).body
+                                if isinstance(node, ast.ClassDef) and node.name == "QCAlgorithm"), set())
+        try:
+            version = metadata.version("quantconnect-stubs")
+        except metadata.PackageNotFoundError:
+            version = ""
+        return cls(modules, members, version)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "modules": {module: sorted(names) for module, names in self.modules.items()},
+            "algorithm_members": sorted(self.algorithm_members),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LeanApiSurface":
+        return cls({module: set(names) for module, names in data["modules"].items()},
+                   set(data["algorithm_members"]), data.get("version", ""))
+
+
+def _default_api_cache() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "AgenticDeveloper", "lean_api", "api_surface.json")
+
+
+def get_lean_api_surface(config: Optional[Dict] = None) -> Optional[LeanApiSurface]:
+    """Return the process-wide ``LeanApiSurface``, cached on disk at tools.code_validator.api_cache.
+
+    Relative paths are resolved against the AgenticDeveloper package directory; without an
+    api_cache the surface is cached in the user cache directory ($XDG_CACHE_HOME or ~/.cache).
+    The cache is rebuilt when the installed quantconnect-stubs version changes. None if the
+    stubs are missing.
+    """
+    path = (config or {}).get("api_cache") or _default_api_cache()
+    if not os.path.isabs(path):
+        path = str(Path(__file__).parent.parent / path)
+    with _surfaces_lock:
+        if path in _surfaces:
+            return _surfaces[path]
+        try:
+            version = metadata.version("quantconnect-stubs")
+        except metadata.PackageNotFoundError:
+            version = None
+        surface = None
+        if version is not None and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                if data.get("version") == version:
+                    surface = LeanApiSurface.from_dict(data)
+            except (json.JSONDecodeError, KeyError):
+                surface = None
+        if surface is None and version is not None:
+            surface = LeanApiSurface.from_stubs()
+            if surface is not None:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w") as f:
+                    json.dump(surface.to_dict(), f)
+        _surfaces[path] = surface
+        return surface
+
+
+def _bound_names(tree: ast.Module) -> Set[str]:
+    """Every name the code binds anywhere, ignoring scopes (so the check never reports a false positive for scoping)"""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, ast.alias):
+            if node.name != "*":
+                names.add(node.asname or node.name.split(".")[0])
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.update(node.names)
+        elif isinstance(node, (ast.MatchAs, ast.MatchStar)) and node.name:
+            names.add(node.name)
+    return names
+
+
+def _is_algorithm_class(node: ast.ClassDef) -> bool:
+    for base in node.bases:
+        name = base.id if isinstance(base, ast.Name) else base.attr if isinstance(base, ast.Attribute) else None
+        if name in ALGORITHM_BASES:
+            return True
+    return False
+
+
+def _self_attributes(tree: ast.Module) -> Set[str]:
+    """Attributes the code assigns on self/cls and members its classes define"""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and isinstance(node.ctx, (ast.Store, ast.Del)) \
+                and isinstance(node.value, ast.Name) and node.value.id in ("self", "cls"):
+            names.add(node.attr)
+        elif isinstance(node, ast.ClassDef):
+            names |= _class_members(node)
+    return names
+
+
+def validate_strategy_code(code: str, filename: str = "main.py",
+                           api: Optional[LeanApiSurface] = None) -> Dict[str, Any]:
+    """
+    Statically check Lean strategy code. Returns {"success", "errors", "warnings"}:
+    errors are syntax errors, a missing QCAlgorithm subclass or Initialize method, and
+    undefined names or self attributes; warnings are mixed PascalCase/snake_case API usage.
+    api defaults to get_lean_api_surface() (cached in the user cache directory).
+    """
+    errors: List[str] = []
+    warnings: List[str] = []
+    try:
+        tree = ast.parse(code, filename=filename)
+        compile(tree, filename, "exec")
+    except SyntaxError as e:
+        return {"success": False, "errors": [f"{filename}:{e.lineno}: SyntaxError: {e.msg}"], "warnings": []}
+
+    algorithm_classes = [node for node in ast.walk(tree) if isinstance(node, ast.ClassDef) and _is_algorithm_class(node)]
+    if not algorithm_classes:
+        errors.append(f"{filename}: no class derives from QCAlgorithm")
+    for node in algorithm_classes:
+        methods = {item.name for item in node.body if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))}
+        if not methods & {"Initialize", "initialize"}:
+            errors.append(f"{filename}:{node.lineno}: {node.name} does not define Initialize (or initialize)")
+
+    if api is None:
+        api = get_lean_api_surface()
+    if api is None:
+        warnings.append("quantconnect-stubs is not installed: undefined name and API style checks were skipped")
+        return {"success": not errors, "errors": errors, "warnings": warnings}
+
+    # Undefined names, unless a star import we cannot resolve could provide them
+    available = _bound_names(tree) | set(dir(builtins)) | MODULE_NAMES
+    resolvable = True
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.names[0].name == "*":
+            if node.module in api.modules:
+                available |= api.modules[node.module]
+            else:
+                resolvable = False
+    if resolvable:
+        reported = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load) \
+                    and node.id not in available and node.id not in reported:
+                reported.add(node.id)
+                errors.append(f"{filename}:{node.lineno}: undefined name '{node.id}'")
+
+    # self.<name> in the algorithm that is neither assigned nor a QCAlgorithm member
+    defined_attributes = _self_attributes(tree)
+    dynamic = any(isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "setattr"
+                  for node in ast.walk(tree))
+    pascal, snake = set(), set()
+    reported = set()
+    for cls in algorithm_classes:
+        for node in ast.walk(cls):
+            if not (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self"):
+                continue
+            name = node.attr
+            if name in defined_attributes:
+                continue
+            if api.is_algorithm_member(name):
+                (pascal if name[0].isupper() else snake).add(name)
+            elif not dynamic and not name.startswith("__") and name not in reported:
+                reported.add(name)
+                errors.append(f"{filename}:{node.lineno}: '{cls.name}' has no attribute '{name}' "
+                              f"(not assigned in the code and not a QCAlgorithm member)")
+    if pascal and snake:
+        warnings.append(
+            f"{filename}: mixes PascalCase ({', '.join(sorted(pascal)[:5])}) and snake_case "
+            f"({', '.join(sorted(snake)[:5])}) QCAlgorithm API; use one style"
+        )
+    return {"success": not errors, "errors": errors, "warnings": warnings}
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class IdeaStore:
+    """Append-only store of research ideas.
+
+    Ideas are appended as JSON lines (``{"name": ..., "idea": {...}}``) to ``log_path``;
+    the latest line for a name wins. An in-memory index by idea name and source URL is
+    built once when the store is opened, so upserts and duplicate checks never re-read
+    or rewrite the whole corpus. ``compact`` drops superseded lines and ``export_json``
+    writes the ``{idea_name: idea}`` format used by ``research_ideas.json``.
+
+    If the log does not exist yet but ``legacy_json_path`` does, its ideas are imported.
+    Otherwise ideas added or edited in that JSON file since it was last exported (e.g.
+    ``learnings_from_testing`` entries written by other tools) are merged into the log;
+    see ``merge_json``.
+    """
+
+    def __init__(self, log_path: str, legacy_json_path: Optional[str] = None):
+        self.log_path = log_path
+        self._ideas: Dict[str, Dict] = {}
+        self._names_by_url: Dict[str, set] = {}
+        self._lines = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+        if os.path.exists(log_path):
+            self._load()
+        elif legacy_json_path and os.path.exists(legacy_json_path):
+            try:
+                with open(legacy_json_path, "r") as f:
+                    legacy = json.load(f)
+            except json.JSONDecodeError:
+                legacy = {}
+            if legacy:
+                self.upsert_many(legacy.items())
+        if legacy_json_path and os.path.exists(log_path):
+            self.merge_json(legacy_json_path)
+
+    def _load(self) -> None:
+        with open(self.log_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Tolerate a torn final line from an interrupted write
+                    continue
+                self._index(record["name"], record["idea"])
+                self._lines += 1
+
+    def _index(self, name: str, idea: Dict) -> None:
+        previous = self._ideas.get(name)
+        if previous is not None:
+            old_url = previous.get("source", {}).get("url", "")
+            self._names_by_url.get(old_url, set()).discard(name)
+        self._ideas[name] = idea
+        url = idea.get("source", {}).get("url", "")
+        if url:
+            self._names_by_url.setdefault(url, set()).add(name)
+
+    def upsert_many(self, ideas: Iterable[Tuple[str, Dict]]) -> int:
+        """Append a batch of ideas in a single write. Returns the number written."""
+        ideas = list(ideas)
+        if not ideas:
+            return 0
+        lines = "".join(json.dumps({"name": name, "idea": idea}) + "\n" for name, idea in ideas)
+        with open(self.log_path, "a") as f:
+            f.write(lines)
+        for name, idea in ideas:
+            self._index(name, idea)
+        self._lines += len(ideas)
+        return len(ideas)
+
+    def upsert(self, name: str, idea: Dict) -> None:
+        self.upsert_many([(name, idea)])
+
+    def get(self, name: str) -> Optional[Dict]:
+        return self._ideas.get(name)
+
+    def has_url(self, url: str) -> bool:
+        return bool(self._names_by_url.get(url))
+
+    def find_by_url(self, url: str) -> List[str]:
+        return sorted(self._names_by_url.get(url, ()))
+
+    def all(self) -> Dict[str, Dict]:
+        return dict(self._ideas)
+
+    def __len__(self) -> int:
+        return len(self._ideas)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ideas
+
+    def compact(self) -> None:
+        """Rewrite the log with only the latest version of each idea"""
+        if self._lines == len(self._ideas):
+            return
+        tmp_path = self.log_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for name, idea in self._ideas.items():
+                f.write(json.dumps({"name": name, "idea": idea}) + "\n")
+        os.replace(tmp_path, self.log_path)
+        self._lines = len(self._ideas)
+
+    @staticmethod
+    def _digest(idea: Dict) -> str:
+        return hashlib.sha256(json.dumps(idea, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _digests_path(path: str) -> str:
+        return path + ".digests"
+
+    def merge_json(self, path: str) -> int:
+        """
+        Upsert the ideas of a ``{idea_name: idea}`` JSON file that were added or edited there
+        since export_json last wrote it (per-idea digests of that export are kept next to it,
+        in ``<path>.digests``). Ideas deleted from the file stay in the store.
+        Returns the number of ideas merged.
+        """
+        try:
+            with open(path, "r") as f:
+                ideas = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0
+        try:
+            with open(self._digests_path(path), "r") as f:
+                exported = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            exported = {}
+        changed = [
+            (name, idea) for name, idea in ideas.items()
+            if idea != self._ideas.get(name) and self._digest(idea) != exported.get(name)
+        ]
+        return self.upsert_many(changed)
+
+    def export_json(self, path: str) -> None:
+        """Atomically write all ideas as a single ``{idea_name: idea}`` JSON file (and its digests)"""
+        for target, data in ((path, self._ideas),
+                             (self._digests_path(path), {name: self._digest(idea) for name, idea in self._ideas.items()})):
+            tmp_path = target + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, indent=2 if target == path else None)
+            os.replace(tmp_path, target)
@@ -0,0 +1,132 @@
+import asyncio
+import os
+from typing import Callable, Iterable, List, Optional
+
+READ_BLOCK_SIZE = 1024 * 1024
+
+
+class ErrorBlockParser:
+    """Incremental parser that extracts multi-line error blocks from Lean output.
+
+    Lines are fed one at a time (or as raw text chunks via ``feed``) as Lean writes
+    them. A block starts at a line mentioning an error and continues over the
+    indented lines that follow it. Memory stays bounded: only the current block
+    (at most ``max_block_lines`` lines) and the first ``max_errors`` blocks are kept;
+    ``dropped_errors`` counts the rest.
+
+    ``mode`` selects the rules used by the original parsers:
+    - ``"console"``: Lean CLI stdout. Triggers on error/syntaxerror/traceback;
+      continuation lines are indented, start with ``***`` or are blank.
+    - ``"log"``: the backtest ``log.txt``. Triggers on ERROR; continuation lines
+      are indented.
+
+    ``on_error`` is called with each completed block as soon as it is closed.
+    """
+
+    def __init__(self, mode: str = "log", max_errors: int = 100, max_block_lines: int = 200,
+                 on_error: Optional[Callable[[str], None]] = None):
+        if mode not in ("console", "log"):
+            raise ValueError(f"Unsupported mode: {mode}")
+        self.mode = mode
+        self.max_errors = max_errors
+        self.max_block_lines = max_block_lines
+        self.on_error = on_error
+        self.errors: List[str] = []
+        self.dropped_errors = 0
+        self._block: Optional[List[str]] = None
+        self._partial = ""
+
+    def _is_error(self, line: str) -> bool:
+        lower = line.lower()
+        if self.mode == "console":
+            return "error" in lower or "traceback" in lower
+        return "error" in lower
+
+    def _is_continuation(self, line: str) -> bool:
+        if line.startswith(" ") or line.startswith("\t"):
+            return True
+        return self.mode == "console" and (line.startswith("***") or line.strip() == "")
+
+    @property
+    def in_error_block(self) -> bool:
+        return self._block is not None
+
+    def feed_line(self, line: str) -> None:
+        line = line.rstrip("\r\n")
+        if self._block is not None:
+            if self._is_continuation(line):
+                if len(self._block) < self.max_block_lines:
+                    self._block.append(line.rstrip())
+                return
+            self._close_block()
+        if self._is_error(line):
+            self._block = [line.rstrip()]
+
+    def feed_lines(self, lines: Iterable[str]) -> "ErrorBlockParser":
+        for line in lines:
+            self.feed_line(line)
+        return self
+
+    def feed(self, text: str) -> None:
+        """Feed a raw chunk of output; an incomplete trailing line is held until the next chunk"""
+        text = self._partial + text
+        lines = text.split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self.feed_line(line)
+
+    def close(self) -> List[str]:
+        """Flush any buffered partial line and open block, and return the errors"""
+        if self._partial:
+            self.feed_line(self._partial)
+            self._partial = ""
+        self._close_block()
+        return self.errors
+
+    def _close_block(self) -> None:
+        if self._block is None:
+            return
+        block = "\n".join(self._block)
+        self._block = None
+        if len(self.errors) < self.max_errors:
+            self.errors.append(block)
+        else:
+            self.dropped_errors += 1
+        if self.on_error is not None:
+            self.on_error(block)
+
+
+def parse_file(path: str, mode: str = "log", **kwargs) -> List[str]:
+    """Stream a log file through an ``ErrorBlockParser`` without loading it into memory"""
+    parser = ErrorBlockParser(mode=mode, **kwargs)
+    with open(path, "r", errors="replace") as f:
+        parser.feed_lines(f)
+    return parser.close()
+
+
+async def follow_file(path: str, parser: ErrorBlockParser, stop: asyncio.Event,
+                      poll_interval: float = 0.5) -> ErrorBlockParser:
+    """Tail ``path`` into ``parser`` as it is written, until ``stop`` is set.
+
+    Waits for the file to appear, then reads newly appended data every
+    ``poll_interval`` seconds. Remaining data is read once ``stop`` is set.
+    """
+    while not os.path.exists(path):
+        if stop.is_set():
+            return parser
+        await asyncio.sleep(poll_interval)
+
+    with open(path, "r", errors="replace") as f:
+        while True:
+            data = f.read(READ_BLOCK_SIZE)
+            if data:
+                parser.feed(data)
+            elif stop.is_set():
+                break
+            else:
+                try:
+                    await asyncio.wait_for(stop.wait(), poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+    parser.close()
+    return parser
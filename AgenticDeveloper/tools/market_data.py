@@ -0,0 +1,333 @@
+"""
+Local columnar market-data cache.
+
+Bars are stored per resolution and symbol as one ``.npy`` file per column
+(``<root>/<resolution>/<SYMBOL>/{time,open,high,low,close,volume}.npy``) and read back
+as read-only memory maps, so any number of backtests and screens in one or several
+processes share the same pages of the OS cache without copying or re-parsing data.
+``manifest.json`` indexes what is cached: bar count, first/last bar and the source it
+was imported from.
+
+``LeanDataImporter`` fills the cache from a Lean data folder (the ``data-folder`` of
+lean.json), skipping sources that have not changed since they were last imported.
+"""
+import glob
+import json
+import os
+import threading
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+# Lean stores equity and option prices as integers in units of 1/10000
+PRICE_SCALE = {"equity": 10000.0, "option": 10000.0}
+# Resolutions Lean stores as one zip per symbol; finer ones are one zip per symbol and day
+SINGLE_FILE_RESOLUTIONS = ("daily", "hour")
+
+_caches: Dict[str, "MarketDataCache"] = {}
+_caches_lock = threading.Lock()
+
+
+class BarData:
+    """Bars of one symbol: ``time`` (datetime64[ns]) plus the OHLCV columns, all NumPy arrays"""
+
+    def __init__(self, symbol: str, resolution: str, time: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.symbol = symbol
+        self.resolution = resolution
+        self.time = time
+        self.open = columns["open"]
+        self.high = columns["high"]
+        self.low = columns["low"]
+        self.close = columns["close"]
+        self.volume = columns["volume"]
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame({name: getattr(self, name) for name in COLUMNS}, index=pd.DatetimeIndex(self.time, name="time"))
+
+
+class MarketDataCache:
+    """
+    Tool for reading and writing the memory-mapped market-data cache rooted at ``root``.
+    Use ``get_market_data_cache`` to share one instance per path within a process.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self._lock = threading.RLock()
+        self._maps: Dict[Tuple[str, str], Tuple[float, Dict[str, np.ndarray]]] = {}
+        os.makedirs(root, exist_ok=True)
+        self._manifest = self._read_manifest()
+
+    def _read_manifest(self) -> Dict[str, Dict[str, Dict]]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return {}
+
+    def _write_manifest(self) -> None:
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _symbol_dir(self, symbol: str, resolution: str) -> str:
+        return os.path.join(self.root, resolution.lower(), symbol.upper())
+
+    def refresh(self) -> None:
+        """Re-read the manifest, e.g. after another process imported data"""
+        with self._lock:
+            self._manifest = self._read_manifest()
+
+    def coverage(self, resolution: Optional[str] = None) -> Dict:
+        """Manifest entries ({resolution: {symbol: entry}}, or {symbol: entry} for one resolution)"""
+        with self._lock:
+            if resolution is not None:
+                return dict(self._manifest.get(resolution.lower(), {}))
+            return {res: dict(entries) for res, entries in self._manifest.items()}
+
+    def symbols(self, resolution: str = "daily") -> List[str]:
+        return sorted(self.coverage(resolution))
+
+    def has(self, symbol: str, resolution: str = "daily") -> bool:
+        return symbol.upper() in self._manifest.get(resolution.lower(), {})
+
+    def write(self, symbol: str, resolution: str, time, open_, high, low, close, volume,
+              source: Optional[Dict] = None, merge: bool = True) -> int:
+        """
+        Store bars for a symbol, merged with what is already cached (new bars win on equal
+        timestamps) unless merge is False. Returns the number of bars stored.
+        """
+        symbol, resolution = symbol.upper(), resolution.lower()
+        time = np.asarray(time, dtype="datetime64[ns]")
+        columns = {name: np.asarray(values, dtype=float) for name, values in
+                   zip(COLUMNS, (open_, high, low, close, volume))}
+        if any(len(values) != len(time) for values in columns.values()):
+            raise ValueError("All columns must have the same length as time")
+
+        with self._lock:
+            if merge and self.has(symbol, resolution):
+                existing = self.load(symbol, resolution)
+                time = np.concatenate([existing.time, time])
+                columns = {name: np.concatenate([getattr(existing, name), values]) for name, values in columns.items()}
+            # Sort by time keeping the last occurrence of each timestamp
+            _, last = np.unique(time[::-1], return_index=True)
+            keep = len(time) - 1 - last
+            time = time[keep]
+            columns = {name: values[keep] for name, values in columns.items()}
+
+            directory = self._symbol_dir(symbol, resolution)
+            os.makedirs(directory, exist_ok=True)
+            self._maps.pop((symbol, resolution), None)
+            for name, values in [("time", time)] + list(columns.items()):
+                path = os.path.join(directory, f"{name}.npy")
+                with open(path + ".tmp", "wb") as f:
+                    np.save(f, values)
+                os.replace(path + ".tmp", path)
+
+            entry = {
+                "bars": int(len(time)),
+                "start": str(time[0]) if len(time) else None,
+                "end": str(time[-1]) if len(time) else None,
+                "updated": datetime.now().isoformat(timespec="seconds"),
+            }
+            if source is not None:
+                entry["source"] = source
+            elif "source" in self._manifest.get(resolution, {}).get(symbol, {}):
+                entry["source"] = self._manifest[resolution][symbol]["source"]
+            self._manifest.setdefault(resolution, {})[symbol] = entry
+            self._write_manifest()
+            return len(time)
+
+    def _columns(self, symbol: str, resolution: str) -> Optional[Dict[str, np.ndarray]]:
+        """Memory-mapped columns of a symbol, remapped when the files have been rewritten"""
+        directory = self._symbol_dir(symbol, resolution)
+        time_path = os.path.join(directory, "time.npy")
+        if not os.path.exists(time_path):
+            return None
+        mtime = os.path.getmtime(time_path)
+        cached = self._maps.get((symbol, resolution))
+        if cached is None or cached[0] != mtime:
+            columns = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+                       for name in ("time",) + COLUMNS}
+            cached = (mtime, columns)
+            self._maps[(symbol, resolution)] = cached
+        return cached[1]
+
+    def load(self, symbol: str, resolution: str = "daily", start=None, end=None) -> Optional[BarData]:
+        """Bars with start <= time <= end as zero-copy views, or None if the symbol is not cached"""
+        symbol, resolution = symbol.upper(), resolution.lower()
+        with self._lock:
+            columns = self._columns(symbol, resolution)
+        if columns is None:
+            return None
+        time = columns["time"]
+        lo = np.searchsorted(time, np.datetime64(start, "ns")) if start is not None else 0
+        hi = np.searchsorted(time, np.datetime64(end, "ns"), side="right") if end is not None else len(time)
+        return BarData(symbol, resolution, time[lo:hi], {name: columns[name][lo:hi] for name in COLUMNS})
+
+    def closes(self, symbols: Iterable[str], resolution: str = "daily", start=None, end=None,
+               field: str = "close") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        A (T, N) matrix of one price field for several symbols on the timestamps they all
+        share, e.g. as input for VectorBacktester. Returns (times, matrix).
+        """
+        bars = []
+        for symbol in symbols:
+            data = self.load(symbol, resolution, start, end)
+            if data is None:
+                raise KeyError(f"{symbol} ({resolution}) is not in the market data cache")
+            bars.append(data)
+        if not bars:
+            return np.array([], dtype="datetime64[ns]"), np.empty((0, 0))
+        times = bars[0].time
+        for data in bars[1:]:
+            times = np.intersect1d(times, data.time, assume_unique=True)
+        matrix = np.column_stack([
+            np.asarray(getattr(data, field))[np.searchsorted(data.time, times)] for data in bars
+        ])
+        return np.asarray(times), matrix
+
+
+class LeanDataImporter:
+    """
+    Imports trade bars from a Lean data folder into a MarketDataCache.
+
+    Daily and hour data are read from ``<security_type>/<market>/<resolution>/<symbol>.zip``,
+    minute and second data from the per-day zips in ``<security_type>/<market>/<resolution>/<symbol>/``.
+    A symbol whose source files have not changed since its last import is skipped, and for
+    per-day data only days after the last cached bar are read.
+    """
+
+    def __init__(self, cache: MarketDataCache, data_folder: str):
+        self.cache = cache
+        self.data_folder = data_folder
+
+    def _resolution_dir(self, security_type: str, market: str, resolution: str) -> str:
+        return os.path.join(self.data_folder, security_type, market, resolution)
+
+    def available_symbols(self, resolution: str = "daily", security_type: str = "equity",
+                          market: str = "usa") -> List[str]:
+        directory = self._resolution_dir(security_type, market, resolution)
+        if not os.path.isdir(directory):
+            return []
+        if resolution in SINGLE_FILE_RESOLUTIONS:
+            return sorted(name[:-4].upper() for name in os.listdir(directory) if name.endswith(".zip"))
+        return sorted(name.upper() for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name)))
+
+    def _source_files(self, symbol: str, resolution: str, security_type: str, market: str) -> List[str]:
+        directory = self._resolution_dir(security_type, market, resolution)
+        if resolution in SINGLE_FILE_RESOLUTIONS:
+            path = os.path.join(directory, f"{symbol.lower()}.zip")
+            return [path] if os.path.exists(path) else []
+        return sorted(glob.glob(os.path.join(directory, symbol.lower(), "*_trade.zip")))
+
+    def import_symbol(self, symbol: str, resolution: str = "daily", security_type: str = "equity",
+                      market: str = "usa") -> int:
+        """Import one symbol. Returns the number of bars read (0 if nothing changed)."""
+        symbol, resolution = symbol.upper(), resolution.lower()
+        files = self._source_files(symbol, resolution, security_type, market)
+        if not files:
+            raise FileNotFoundError(f"No {resolution} {security_type} data for {symbol} in {self.data_folder}")
+        signature = {
+            "files": len(files),
+            "size": sum(os.path.getsize(path) for path in files),
+            "mtime": max(os.path.getmtime(path) for path in files),
+        }
+        entry = self.cache.coverage(resolution).get(symbol)
+        if entry and entry.get("source", {}).get("signature") == signature:
+            return 0
+
+        if resolution not in SINGLE_FILE_RESOLUTIONS and entry and entry.get("end"):
+            # Per-day files are named YYYYMMDD_trade.zip: only read days not cached yet
+            last_day = entry["end"][:10].replace("-", "")
+            files = [path for path in files if os.path.basename(path)[:8] >= last_day]
+
+        scale = PRICE_SCALE.get(security_type, 1.0)
+        frames = [self._read_zip(path, resolution) for path in files]
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return 0
+        import pandas as pd
+        data = pd.concat(frames, ignore_index=True)
+        self.cache.write(
+            symbol, resolution, data["time"].values,
+            *(data[name].values / (scale if name != "volume" else 1.0) for name in COLUMNS),
+            source={"path": os.path.relpath(files[0], self.data_folder), "signature": signature},
+        )
+        return len(data)
+
+    def import_all(self, resolution: str = "daily", security_type: str = "equity", market: str = "usa",
+                   symbols: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Import every symbol found in the data folder (or the given ones). Returns {symbol: bars read}."""
+        symbols = symbols or self.available_symbols(resolution, security_type, market)
+        return {symbol.upper(): self.import_symbol(symbol, resolution, security_type, market) for symbol in symbols}
+
+    @staticmethod
+    def _read_zip(path: str, resolution: str):
+        import pandas as pd
+        frames = []
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                if not name.endswith(".csv"):
+                    continue
+                with archive.open(name) as f:
+                    frame = pd.read_csv(f, header=None, names=["time"] + list(COLUMNS), usecols=range(6))
+                if resolution in SINGLE_FILE_RESOLUTIONS:
+                    frame["time"] = pd.to_datetime(frame["time"], format="%Y%m%d %H:%M")
+                else:
+                    # Milliseconds since midnight of the day in the file name
+                    day = pd.Timestamp(os.path.basename(path)[:8])
+                    frame["time"] = day + pd.to_timedelta(frame["time"], unit="ms")
+                frames.append(frame)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["time"] + list(COLUMNS))
+
+
+def get_market_data_cache(config: Dict) -> MarketDataCache:
+    """Return the process-wide ``MarketDataCache`` for tools.market_data.path.
+
+    Relative paths are resolved against the AgenticDeveloper package directory.
+    """
+    path = config.get("path", "market_data")
+    if not os.path.isabs(path):
+        path = str(Path(__file__).parent.parent / path)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = MarketDataCache(path)
+            _caches[path] = cache
+        return cache
+
+
+if __name__ == "__main__":
+    import argparse
+    import yaml
+
+    parser = argparse.ArgumentParser(description="Import Lean data into the local market data cache")
+    parser.add_argument("symbols", nargs="*", help="Symbols to import (default: all in the data folder)")
+    parser.add_argument("--resolution", default="daily")
+    parser.add_argument("--security-type", default="equity")
+    parser.add_argument("--market", default="usa")
+    args = parser.parse_args()
+
+    package_dir = Path(__file__).parent.parent
+    with open(package_dir / "config" / "system_config.yaml", "r") as f:
+        market_data_config = yaml.safe_load(f).get("tools", {}).get("market_data", {})
+    data_folder = market_data_config.get("lean_data_folder", "../data")
+    if not os.path.isabs(data_folder):
+        data_folder = str(package_dir / data_folder)
+
+    importer = LeanDataImporter(get_market_data_cache(market_data_config), data_folder)
+    for symbol, bars in importer.import_all(args.resolution, args.security_type, args.market, args.symbols).items():
+        print(f"{symbol}: {bars} bars imported" if bars else f"{symbol}: up to date")
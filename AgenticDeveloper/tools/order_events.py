@@ -0,0 +1,254 @@
+"""
+Streaming loader and one-pass aggregates for Lean ``<id>-order-events.json`` files.
+
+The file is a JSON array of order events that can run to hundreds of MB for
+high-turnover strategies. ``iter_json_array`` yields its elements one at a time while
+holding at most one chunk plus one element in memory, and ``OrderEventAggregator``
+turns the event stream into per-trade statistics without keeping the events.
+"""
+import json
+import math
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+READ_CHUNK_SIZE = 1024 * 1024
+FILL_STATUSES = ("filled", "partiallyfilled")
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(path: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one by one without loading the whole file"""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+        started = False
+
+        def fill() -> bool:
+            nonlocal buffer, pos, eof
+            data = f.read(chunk_size)
+            if not data:
+                eof = True
+                return False
+            buffer = buffer[pos:] + data
+            pos = 0
+            return True
+
+        while True:
+            # Skip whitespace, the opening bracket and separators
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    break
+            if pos >= len(buffer):
+                if not started:
+                    return
+                raise ValueError(f"Unexpected end of file in {path}")
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise ValueError(f"{path} does not contain a JSON array")
+                started = True
+                pos += 1
+                continue
+            if char == "]":
+                return
+            if char == ",":
+                pos += 1
+                continue
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+                # A number cut off by the chunk boundary ("-0." of "-0.5") decodes "successfully",
+                # so only accept an element once the separator after it has been read
+                following = end
+                while following < len(buffer) and buffer[following] in _WHITESPACE:
+                    following += 1
+                if following == len(buffer) or buffer[following] not in ",]":
+                    raise json.JSONDecodeError("Expecting ',' or ']' after element", buffer, following)
+            except json.JSONDecodeError:
+                if eof or not fill():
+                    raise ValueError(f"Invalid JSON array in {path}")
+                continue
+            pos = end
+            yield element
+
+
+def iter_order_events(path: str, fields: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Stream order events, keeping only the given fields of each event if fields is set"""
+    fields = set(fields) if fields is not None else None
+    for event in iter_json_array(path):
+        if fields is not None:
+            event = {key: value for key, value in event.items() if key in fields}
+        yield event
+
+
+class _RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        if not self.count:
+            return {"count": 0, "mean": None, "min": None, "max": None}
+        return {"count": self.count, "mean": self.total / self.count, "min": self.min, "max": self.max}
+
+
+class OrderEventAggregator:
+    """
+    One-pass per-trade statistics from a stream of Lean order events.
+
+    A trade opens when a symbol's position leaves zero and closes when it returns to zero
+    (a fill that flips the position closes one trade and opens the next). P&L is realized
+    against the average entry price. Only open positions, running totals and at most
+    ``max_trades`` closed-trade records are kept; ``trades_dropped`` counts the rest.
+
+    Slippage is measured for fills of limit/stop orders against their limit or stop
+    price, in basis points, positive when the fill was worse than the order price.
+    """
+
+    def __init__(self, max_trades: int = 10000):
+        self.max_trades = max_trades
+        self.events = 0
+        self.status_counts: Dict[str, int] = {}
+        self.fills = 0
+        self.fees = 0.0
+        self.traded_notional = 0.0
+        self.slippage_bps = _RunningStats()
+        self.holding_seconds = _RunningStats()
+        self.trade_pnl = _RunningStats()
+        self.wins = 0
+        self.losses = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.max_win_streak = 0
+        self.max_loss_streak = 0
+        self._streak = 0
+        self.trades: List[Dict[str, Any]] = []
+        self.trades_dropped = 0
+        self.first_time: Optional[float] = None
+        self.last_time: Optional[float] = None
+        self._positions: Dict[str, Dict[str, float]] = {}
+
+    def feed(self, event: Dict[str, Any]) -> None:
+        self.events += 1
+        status = str(event.get("status", "")).lower()
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if status not in FILL_STATUSES:
+            return
+        quantity = abs(float(event.get("fillQuantity") or 0))
+        price = float(event.get("fillPrice") or 0)
+        if not quantity or not price:
+            return
+        direction = str(event.get("direction", "")).lower()
+        signed = -quantity if direction == "sell" or float(event.get("fillQuantity") or 0) < 0 else quantity
+        timestamp = float(event.get("time") or 0)
+        symbol = event.get("symbolValue") or event.get("symbol") or ""
+
+        self.fills += 1
+        self.fees += float(event.get("orderFeeAmount") or 0)
+        self.traded_notional += quantity * price
+        self.first_time = timestamp if self.first_time is None else min(self.first_time, timestamp)
+        self.last_time = timestamp if self.last_time is None else max(self.last_time, timestamp)
+
+        reference = event.get("limitPrice") or event.get("stopPrice")
+        if reference:
+            reference = float(reference)
+            self.slippage_bps.add((price - reference) / reference * 10000 * (1 if signed > 0 else -1))
+
+        self._apply_fill(symbol, signed, price, timestamp)
+
+    def feed_many(self, events: Iterable[Dict[str, Any]]) -> "OrderEventAggregator":
+        for event in events:
+            self.feed(event)
+        return self
+
+    def _apply_fill(self, symbol: str, quantity: float, price: float, timestamp: float) -> None:
+        position = self._positions.get(symbol)
+        if position is None:
+            self._positions[symbol] = {"quantity": quantity, "avg_price": price, "opened": timestamp, "pnl": 0.0}
+            return
+        held = position["quantity"]
+        if held * quantity > 0:
+            # Adding to the position
+            total = held + quantity
+            position["avg_price"] = (position["avg_price"] * held + price * quantity) / total
+            position["quantity"] = total
+            return
+        closing = min(abs(quantity), abs(held)) * (1 if held > 0 else -1)
+        position["pnl"] += closing * (price - position["avg_price"])
+        remaining = held + quantity
+        if abs(remaining) > 1e-9 and remaining * held > 0:
+            position["quantity"] = remaining
+            return
+        self._close_trade(symbol, position, timestamp)
+        del self._positions[symbol]
+        if abs(remaining) > 1e-9:
+            # The fill flipped the position: the remainder opens a new trade
+            self._positions[symbol] = {"quantity": remaining, "avg_price": price, "opened": timestamp, "pnl": 0.0}
+
+    def _close_trade(self, symbol: str, position: Dict[str, float], timestamp: float) -> None:
+        pnl = position["pnl"]
+        holding = timestamp - position["opened"]
+        self.trade_pnl.add(pnl)
+        self.holding_seconds.add(holding)
+        if pnl > 0:
+            self.wins += 1
+            self.gross_profit += pnl
+            self._streak = self._streak + 1 if self._streak > 0 else 1
+            self.max_win_streak = max(self.max_win_streak, self._streak)
+        elif pnl < 0:
+            self.losses += 1
+            self.gross_loss += -pnl
+            self._streak = self._streak - 1 if self._streak < 0 else -1
+            self.max_loss_streak = max(self.max_loss_streak, -self._streak)
+        if len(self.trades) < self.max_trades:
+            self.trades.append({
+                "symbol": symbol, "opened": position["opened"], "closed": timestamp,
+                "side": "long" if position["quantity"] > 0 else "short", "pnl": pnl, "holding_seconds": holding,
+            })
+        else:
+            self.trades_dropped += 1
+
+    def summary(self) -> Dict[str, Any]:
+        closed = self.wins + self.losses
+        return {
+            "events": self.events,
+            "status_counts": dict(self.status_counts),
+            "fills": self.fills,
+            "fees": self.fees,
+            "traded_notional": self.traded_notional,
+            "first_fill_time": self.first_time,
+            "last_fill_time": self.last_time,
+            "trades": self.trade_pnl.count,
+            "open_positions": len(self._positions),
+            "wins": self.wins,
+            "losses": self.losses,
+            "win_rate": self.wins / closed if closed else None,
+            "profit_factor": self.gross_profit / self.gross_loss if self.gross_loss else None,
+            "trade_pnl": self.trade_pnl.to_dict(),
+            "holding_days": {key: (value / 86400 if isinstance(value, float) else value)
+                             for key, value in self.holding_seconds.to_dict().items()},
+            "max_win_streak": self.max_win_streak,
+            "max_loss_streak": self.max_loss_streak,
+            "slippage_bps": self.slippage_bps.to_dict(),
+        }
+
+
+def summarize_order_events(path: str, max_trades: int = 10000, include_trades: bool = False) -> Dict[str, Any]:
+    """Stream an order-events file into an OrderEventAggregator summary (plus the trade records if asked)"""
+    aggregator = OrderEventAggregator(max_trades=max_trades if include_trades else 0)
+    aggregator.feed_many(iter_order_events(path))
+    summary = aggregator.summary()
+    if include_trades:
+        summary["closed_trades"] = aggregator.trades
+        summary["trades_dropped"] = aggregator.trades_dropped
+    return summary
@@ -0,0 +1,893 @@
+"""
+Smoke-test engine for QuantConnect Lean strategies.
+
+Runs a strategy file against a stub of the ``QCAlgorithm`` API and synthetic,
+NumPy-generated daily bars, so syntax errors, missing methods and runtime
+exceptions in generated code surface in well under a second instead of after a
+full Lean CLI backtest. It checks that the code runs, not how it performs.
+
+Both the PascalCase (``SetHoldings``) and snake_case (``set_holdings``) APIs are
+stubbed. Calls to parts of the API that are not stubbed do not fail the test;
+they return a permissive placeholder and are reported as warnings.
+
+``SmokeBacktester.run_isolated`` runs the strategy in a child process that is killed
+when it exceeds its timeout, so an endless loop in generated code cannot hang the agent.
+"""
+import builtins
+import math
+import multiprocessing
+import threading
+import time as time_module
+import traceback
+import types
+from datetime import date, datetime, timedelta
+from datetime import time as dt_time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+_process_context = None
+_process_context_lock = threading.Lock()
+
+# snake_case Lean API that is not stubbed; PascalCase names are always treated as Lean API
+UNSUPPORTED_SNAKE_CASE_API = {
+    "rsi", "macd", "bb", "atr", "roc", "rocp", "momp", "mom", "adx", "std", "max", "min", "lwma", "kama",
+    "add_universe", "add_option", "add_future", "add_data", "set_time_zone", "set_security_initializer",
+    "set_universe_selection", "set_alpha", "set_portfolio_construction", "set_execution", "set_risk_management",
+    "register_indicator", "warm_up_indicator", "consolidate", "limit_order", "stop_market_order",
+    "stop_limit_order", "market_on_open_order", "market_on_close_order", "transactions", "notify",
+    "object_store", "universe_settings", "settings", "is_market_open", "set_runtime_statistic",
+}
+
+
+class _Unsupported:
+    """Placeholder returned for API members the engine does not implement"""
+
+    def __init__(self, name: str, report: Optional[Callable[[str], None]] = None):
+        self._name = name
+        self._report = report
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _Unsupported(f"{self._name}.{name}", self._report)
+
+    def __getitem__(self, key):
+        return self
+
+    def __iter__(self):
+        return iter(())
+
+    def __bool__(self):
+        return False
+
+    def __float__(self):
+        return 0.0
+
+    def __int__(self):
+        return 0
+
+    def __eq__(self, other):
+        return other is self
+
+    def __hash__(self):
+        return id(self)
+
+    def __lt__(self, other):
+        return False
+
+    __le__ = __gt__ = __ge__ = __lt__
+
+    def _same(self, *args):
+        return self
+
+    __add__ = __radd__ = __sub__ = __rsub__ = __mul__ = __rmul__ = _same
+    __truediv__ = __rtruediv__ = __neg__ = __abs__ = _same
+
+    def __repr__(self):
+        return f"<unsupported {self._name}>"
+
+
+class _Enum:
+    """Enum-like namespace exposing each member under PascalCase and UPPER_CASE names"""
+
+    def __init__(self, name: str, members: List[str]):
+        self._name = name
+        for member in members:
+            value = f"{name}.{member}"
+            setattr(self, member, value)
+            setattr(self, member.upper(), value)
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return f"{self._name}.{name}"
+
+
+Resolution = _Enum("Resolution", ["Tick", "Second", "Minute", "Hour", "Daily"])
+DataNormalizationMode = _Enum("DataNormalizationMode", ["Raw", "Adjusted", "SplitAdjusted", "TotalReturn"])
+Market = _Enum("Market", ["USA", "Oanda", "GDAX", "Binance"])
+OrderStatus = _Enum("OrderStatus", ["New", "Submitted", "PartiallyFilled", "Filled", "Canceled", "Invalid"])
+OrderDirection = _Enum("OrderDirection", ["Buy", "Sell", "Hold"])
+SecurityType = _Enum("SecurityType", ["Equity", "Forex", "Crypto", "Future", "Option"])
+
+
+class Symbol:
+    def __init__(self, value: str):
+        self.value = value
+        self.Value = value
+
+    def __str__(self):
+        return self.value
+
+    __repr__ = __str__
+
+    def __eq__(self, other):
+        if isinstance(other, Symbol):
+            return self.value == other.value
+        return isinstance(other, str) and self.value == other.upper()
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __lt__(self, other):
+        return str(self) < str(other)
+
+
+class TradeBar:
+    def __init__(self, symbol: Symbol, time: datetime, open_: float, high: float, low: float, close: float, volume: float):
+        self.symbol = self.Symbol = symbol
+        self.time = self.Time = self.end_time = self.EndTime = time
+        self.open = self.Open = open_
+        self.high = self.High = high
+        self.low = self.Low = low
+        self.close = self.Close = self.price = self.Price = self.value = self.Value = close
+        self.volume = self.Volume = volume
+
+
+class Slice(dict):
+    """Bars for one time step, keyed by Symbol (ticker strings also work)"""
+
+    def __init__(self, time: datetime, bars: Dict[Symbol, TradeBar]):
+        super().__init__(bars)
+        self.time = self.Time = time
+        self.bars = self.Bars = self
+        self.quote_bars = self.QuoteBars = {}
+
+    def contains_key(self, symbol) -> bool:
+        return symbol in self
+
+    ContainsKey = contains_key
+
+    def get(self, symbol, default=None):
+        return super().get(symbol, default)
+
+    Get = get
+
+
+class IndicatorDataPoint:
+    def __init__(self, value: float = 0.0, time: Optional[datetime] = None):
+        self.value = self.Value = value
+        self.time = self.Time = time
+
+    def __float__(self):
+        return float(self.value)
+
+
+class _Indicator:
+    def __init__(self, period: int):
+        self.period = self.Period = period
+        self.samples = self.Samples = 0
+        self.current = self.Current = IndicatorDataPoint()
+        self.window = RollingWindow(max(period, 1))
+
+    @property
+    def is_ready(self) -> bool:
+        return self.samples >= self.period
+
+    IsReady = is_ready
+
+    def update(self, time: datetime, value: float) -> bool:
+        self.samples += 1
+        self.Samples = self.samples
+        self.window.add(value)
+        self.current = self.Current = IndicatorDataPoint(self._compute(value), time)
+        return self.is_ready
+
+    Update = update
+
+    def reset(self):
+        self.__init__(self.period)
+
+    Reset = reset
+
+    def _compute(self, value: float) -> float:
+        raise NotImplementedError
+
+    def __float__(self):
+        return float(self.current.value)
+
+
+class SimpleMovingAverage(_Indicator):
+    def _compute(self, value: float) -> float:
+        count = min(self.samples, self.period)
+        return sum(self.window[i] for i in range(count)) / count
+
+
+class ExponentialMovingAverage(_Indicator):
+    def _compute(self, value: float) -> float:
+        if self.samples == 1:
+            return value
+        k = 2.0 / (self.period + 1)
+        return value * k + self.current.value * (1 - k)
+
+
+class RollingWindow:
+    """Fixed-size window where index 0 is the most recent item"""
+
+    def __class_getitem__(cls, item):
+        return cls
+
+    def __init__(self, size: int):
+        self.size = self.Size = size
+        self._items: List[Any] = []
+        self.samples = self.Samples = 0
+
+    def add(self, item):
+        self._items.insert(0, item)
+        del self._items[self.size:]
+        self.samples += 1
+        self.Samples = self.samples
+
+    Add = add
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+    Count = count
+
+    @property
+    def is_ready(self) -> bool:
+        return len(self._items) >= self.size
+
+    IsReady = is_ready
+
+    def __getitem__(self, index: int):
+        if index >= len(self._items):
+            raise IndexError(f"RollingWindow index {index} out of range (count {len(self._items)})")
+        return self._items[index]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def reset(self):
+        self._items = []
+
+    Reset = reset
+
+
+class PortfolioTarget:
+    def __init__(self, symbol, quantity: float):
+        self.symbol = self.Symbol = symbol
+        self.quantity = self.Quantity = quantity
+
+
+class SecurityHolding:
+    def __init__(self, symbol: Symbol, engine: "_Engine"):
+        self.symbol = self.Symbol = symbol
+        self._engine = engine
+        self.quantity = 0.0
+        self.average_price = 0.0
+
+    @property
+    def price(self) -> float:
+        return self._engine.price(self.symbol)
+
+    @property
+    def invested(self) -> bool:
+        return self.quantity != 0
+
+    @property
+    def holdings_value(self) -> float:
+        return self.quantity * self.price
+
+    @property
+    def unrealized_profit(self) -> float:
+        return self.quantity * (self.price - self.average_price)
+
+    @property
+    def is_long(self) -> bool:
+        return self.quantity > 0
+
+    @property
+    def is_short(self) -> bool:
+        return self.quantity < 0
+
+    Quantity = property(lambda self: self.quantity)
+    AveragePrice = property(lambda self: self.average_price)
+    Price = price
+    Invested = invested
+    HoldingsValue = holdings_value
+    UnrealizedProfit = unrealized_profit
+    IsLong = is_long
+    IsShort = is_short
+
+
+class _Portfolio(dict):
+    def __init__(self, engine: "_Engine"):
+        super().__init__()
+        self._engine = engine
+        self.cash = 0.0
+
+    def __missing__(self, symbol):
+        holding = SecurityHolding(self._engine.symbol(symbol), self._engine)
+        self[holding.symbol] = holding
+        return holding
+
+    @property
+    def invested(self) -> bool:
+        return any(holding.invested for holding in self.values())
+
+    @property
+    def total_portfolio_value(self) -> float:
+        return self.cash + sum(holding.holdings_value for holding in self.values())
+
+    @property
+    def total_holdings_value(self) -> float:
+        return sum(abs(holding.holdings_value) for holding in self.values())
+
+    Invested = invested
+    TotalPortfolioValue = total_portfolio_value
+    TotalHoldingsValue = total_holdings_value
+    Cash = property(lambda self: self.cash)
+
+
+class Security:
+    def __init__(self, symbol: Symbol, engine: "_Engine"):
+        self.symbol = self.Symbol = symbol
+        self._engine = engine
+
+    @property
+    def price(self) -> float:
+        return self._engine.price(self.symbol)
+
+    Price = price
+    Close = price
+
+    def set_data_normalization_mode(self, mode):
+        pass
+
+    SetDataNormalizationMode = set_data_normalization_mode
+
+    def set_leverage(self, leverage):
+        pass
+
+    SetLeverage = set_leverage
+
+
+class _DateRule:
+    def __init__(self, kind: str):
+        self.kind = kind
+
+    def matches(self, today: date, previous: Optional[date]) -> bool:
+        if self.kind == "week_start":
+            return previous is None or today.isocalendar()[:2] != previous.isocalendar()[:2]
+        if self.kind == "month_start":
+            return previous is None or (today.year, today.month) != (previous.year, previous.month)
+        if self.kind == "month_end":
+            return (today + timedelta(days=1)).month != today.month or today.weekday() == 4 and (today + timedelta(days=3)).month != today.month
+        return True
+
+
+class _DateRules:
+    def every_day(self, *args, **kwargs):
+        return _DateRule("every_day")
+
+    def week_start(self, *args, **kwargs):
+        return _DateRule("week_start")
+
+    def month_start(self, *args, **kwargs):
+        return _DateRule("month_start")
+
+    def month_end(self, *args, **kwargs):
+        return _DateRule("month_end")
+
+    EveryDay = every_day
+    WeekStart = week_start
+    MonthStart = month_start
+    MonthEnd = month_end
+
+
+class _TimeRules:
+    """Time rules are accepted but ignored: scheduled events fire once per daily bar"""
+
+    def _rule(self, *args, **kwargs):
+        return None
+
+    at = after_market_open = before_market_close = every = noon = midnight = _rule
+    At = AfterMarketOpen = BeforeMarketClose = Every = Noon = Midnight = _rule
+
+
+class _Schedule:
+    def __init__(self):
+        self.events: List[tuple] = []
+
+    def on(self, date_rule, time_rule, action: Callable):
+        self.events.append((date_rule if isinstance(date_rule, _DateRule) else _DateRule("every_day"), action))
+
+    On = on
+
+
+class QCAlgorithm:
+    """Stub of the Lean algorithm base class used by the smoke-test engine"""
+
+    def __init__(self):
+        self._engine: Optional["_Engine"] = None
+        self.portfolio = self.Portfolio = None
+        self.securities = self.Securities = {}
+        self.schedule = self.Schedule = _Schedule()
+        self.date_rules = self.DateRules = _DateRules()
+        self.time_rules = self.TimeRules = _TimeRules()
+        self.time = self.Time = datetime(2020, 1, 1)
+        self._start_date = None
+        self._end_date = None
+        self._cash = 100000.0
+        self._warm_up = 0
+
+    def __getattr__(self, name: str):
+        # Only names that look like Lean API get a placeholder: an unknown snake_case name is
+        # far more likely to be one of the strategy's own attributes, used before it was set
+        if name.startswith("_") or not (name[0].isupper() or name in UNSUPPORTED_SNAKE_CASE_API):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        engine = self.__dict__.get("_engine")
+        if engine is not None:
+            engine.warn(f"Unsupported API used: {name}")
+        return _Unsupported(name)
+
+    # Setup
+    def set_start_date(self, year, month=None, day=None):
+        self._start_date = year if isinstance(year, (date, datetime)) else date(year, month, day)
+
+    def set_end_date(self, year, month=None, day=None):
+        self._end_date = year if isinstance(year, (date, datetime)) else date(year, month, day)
+
+    def set_cash(self, cash, *args):
+        self._cash = float(cash)
+
+    def set_warm_up(self, period, resolution=None):
+        if isinstance(period, timedelta):
+            # Calendar days to trading days
+            self._warm_up = int(period.days * 5 / 7)
+        else:
+            self._warm_up = int(period)
+
+    def set_benchmark(self, *args, **kwargs):
+        pass
+
+    def set_brokerage_model(self, *args, **kwargs):
+        pass
+
+    @property
+    def is_warming_up(self) -> bool:
+        return self._engine is not None and self._engine.warming_up
+
+    def add_equity(self, ticker, resolution=None, *args, **kwargs) -> Security:
+        return self._engine.add_security(ticker)
+
+    add_crypto = add_forex = add_cfd = add_index = add_equity
+
+    def sma(self, symbol, period, resolution=None, *args, **kwargs) -> SimpleMovingAverage:
+        return self._engine.register_indicator(symbol, SimpleMovingAverage(period))
+
+    def ema(self, symbol, period, resolution=None, *args, **kwargs) -> ExponentialMovingAverage:
+        return self._engine.register_indicator(symbol, ExponentialMovingAverage(period))
+
+    def get_parameter(self, name: str, default_value=None):
+        value = self._engine.parameters.get(name)
+        if value is None:
+            return default_value
+        return type(default_value)(value) if default_value is not None else value
+
+    def history(self, symbols, periods, resolution=None, *args, **kwargs):
+        return self._engine.history(symbols, periods)
+
+    # Trading
+    def set_holdings(self, symbol, percentage=None, liquidate_existing_holdings=False, *args, **kwargs):
+        targets = symbol if isinstance(symbol, (list, tuple)) else [PortfolioTarget(symbol, percentage)]
+        if liquidate_existing_holdings:
+            target_symbols = {self._engine.symbol(t.symbol) for t in targets}
+            for held in list(self.portfolio.values()):
+                if held.symbol not in target_symbols:
+                    self.liquidate(held.symbol)
+        for target in targets:
+            self._engine.order_target_percent(target.symbol, float(target.quantity))
+
+    def liquidate(self, symbol=None, *args, **kwargs):
+        symbols = [symbol] if symbol is not None else list(self.portfolio.keys())
+        for sym in symbols:
+            holding = self.portfolio[sym]
+            if holding.quantity:
+                self._engine.market_order(holding.symbol, -holding.quantity)
+
+    def market_order(self, symbol, quantity, *args, **kwargs):
+        return self._engine.market_order(symbol, float(quantity))
+
+    def calculate_order_quantity(self, symbol, target):
+        return self._engine.target_quantity(symbol, float(target)) - self.portfolio[symbol].quantity
+
+    # Logging
+    def debug(self, message):
+        self._engine.log(str(message))
+
+    log = error = debug
+
+    def plot(self, *args, **kwargs):
+        pass
+
+    # PascalCase API
+    SetStartDate = set_start_date
+    SetEndDate = set_end_date
+    SetCash = set_cash
+    SetWarmUp = set_warm_up
+    SetWarmup = set_warm_up
+    SetBenchmark = set_benchmark
+    SetBrokerageModel = set_brokerage_model
+    IsWarmingUp = is_warming_up
+    AddEquity = add_equity
+    AddCrypto = AddForex = AddCfd = AddIndex = add_equity
+    SMA = sma
+    EMA = ema
+    History = history
+    GetParameter = get_parameter
+    SetHoldings = set_holdings
+    Liquidate = liquidate
+    MarketOrder = market_order
+    Order = market_order
+    order = market_order
+    CalculateOrderQuantity = calculate_order_quantity
+    Debug = debug
+    Log = Error = debug
+    Plot = plot
+
+
+class _Engine:
+    def __init__(self, algorithm: QCAlgorithm, bars: int, history_bars: int, seed: int, max_messages: int = 50,
+                 market_data=None, parameters: Optional[Dict[str, str]] = None):
+        self.algorithm = algorithm
+        self.market_data = market_data
+        self.parameters = parameters or {}
+        self.bars = bars
+        self.history_bars = history_bars
+        self.rng = np.random.default_rng(seed)
+        self.max_messages = max_messages
+        self.symbols: Dict[str, Symbol] = {}
+        self.prices: Dict[Symbol, np.ndarray] = {}
+        self.indicators: List[tuple] = []
+        self.dates: Optional[List[datetime]] = None
+        self.step = 0
+        self.warming_up = False
+        self.orders = 0
+        self.messages: List[str] = []
+        self.warnings: List[str] = []
+
+    def warn(self, message: str):
+        if message not in self.warnings:
+            self.warnings.append(message)
+
+    def log(self, message: str):
+        if len(self.messages) < self.max_messages:
+            self.messages.append(message)
+
+    def symbol(self, ticker) -> Symbol:
+        if isinstance(ticker, Symbol):
+            return ticker
+        ticker = str(ticker).upper()
+        if ticker not in self.symbols:
+            self.symbols[ticker] = Symbol(ticker)
+        return self.symbols[ticker]
+
+    def add_security(self, ticker) -> Security:
+        symbol = self.symbol(ticker)
+        if symbol not in self.prices:
+            self.prices[symbol] = self._cached_closes(symbol)
+        if self.prices[symbol] is None:
+            # Geometric random walk covering the history window and the simulated period
+            returns = self.rng.normal(0.0003, 0.015, self.history_bars + self.bars)
+            start = self.rng.uniform(20, 500)
+            self.prices[symbol] = start * np.exp(np.cumsum(returns))
+        security = Security(symbol, self)
+        self.algorithm.securities[symbol] = security
+        self.algorithm.portfolio[symbol]
+        return security
+
+    def _cached_closes(self, symbol: Symbol) -> Optional[np.ndarray]:
+        """Daily closes from the market data cache around the start date, if it covers the whole window"""
+        if self.market_data is None or not self.market_data.has(symbol.value, "daily"):
+            return None
+        data = self.market_data.load(symbol.value, "daily")
+        start = self.algorithm._start_date or date(2020, 1, 1)
+        first = int(np.searchsorted(data.time, np.datetime64(start, "ns")))
+        if first < self.history_bars or first + self.bars > len(data):
+            self.warn(f"Cached data for {symbol} does not cover the test window; using synthetic bars")
+            return None
+        return data.close[first - self.history_bars:first + self.bars]
+
+    def register_indicator(self, symbol, indicator: _Indicator) -> _Indicator:
+        self.indicators.append((self.symbol(symbol), indicator))
+        return indicator
+
+    def price(self, symbol) -> float:
+        symbol = self.symbol(symbol)
+        if symbol not in self.prices:
+            self.add_security(symbol)
+        return float(self.prices[symbol][self.history_bars + self.step])
+
+    def target_quantity(self, symbol, percentage: float) -> float:
+        return math.floor(percentage * self.algorithm.portfolio.total_portfolio_value / self.price(symbol))
+
+    def order_target_percent(self, symbol, percentage: float):
+        holding = self.algorithm.portfolio[symbol]
+        self.market_order(holding.symbol, self.target_quantity(symbol, percentage) - holding.quantity)
+
+    def market_order(self, symbol, quantity: float):
+        if self.warming_up:
+            self.warn("Order placed during warm up was ignored")
+            return None
+        if not quantity:
+            return None
+        holding = self.algorithm.portfolio[symbol]
+        fill = self.price(holding.symbol)
+        new_quantity = holding.quantity + quantity
+        if new_quantity and (holding.quantity == 0 or (holding.quantity > 0) == (quantity > 0)):
+            holding.average_price = (holding.average_price * holding.quantity + fill * quantity) / new_quantity
+        elif not new_quantity:
+            holding.average_price = 0.0
+        holding.quantity = new_quantity
+        self.algorithm.portfolio.cash -= quantity * fill
+        self.orders += 1
+        return self.orders
+
+    def history(self, symbols, periods):
+        import pandas as pd
+        if isinstance(symbols, (str, Symbol)):
+            symbols = [symbols]
+        periods = periods.days if isinstance(periods, timedelta) else int(periods)
+        end = self.history_bars + self.step
+        frames = []
+        for symbol in symbols:
+            symbol = self.symbol(symbol)
+            if symbol not in self.prices:
+                self.add_security(symbol)
+            closes = self.prices[symbol][max(0, end - periods):end]
+            times = pd.bdate_range(end=self.dates[self.step] - timedelta(days=1), periods=len(closes))
+            index = pd.MultiIndex.from_arrays([[symbol] * len(closes), times], names=["symbol", "time"])
+            frames.append(pd.DataFrame(
+                {"open": closes, "high": closes * 1.01, "low": closes * 0.99, "close": closes, "volume": 1e6},
+                index=index
+            ))
+        return pd.concat(frames) if frames else pd.DataFrame()
+
+    def run(self, on_data: Optional[Callable], warm_up: int):
+        start = self.algorithm._start_date or date(2020, 1, 1)
+        start = datetime(start.year, start.month, start.day)
+        self.dates = []
+        current = start
+        while len(self.dates) < self.bars:
+            if current.weekday() < 5:
+                self.dates.append(current.replace(hour=16))
+            current += timedelta(days=1)
+
+        previous = None
+        for self.step, now in enumerate(self.dates):
+            self.warming_up = self.step < warm_up
+            self.algorithm.time = self.algorithm.Time = now
+            bars = {}
+            for symbol, prices in self.prices.items():
+                close = float(prices[self.history_bars + self.step])
+                bars[symbol] = TradeBar(symbol, now, close, close * 1.01, close * 0.99, close, 1e6)
+            for symbol, indicator in self.indicators:
+                if symbol in bars:
+                    indicator.update(now, bars[symbol].close)
+            for date_rule, action in self.algorithm.schedule.events:
+                if date_rule.matches(now.date(), previous) and not self.warming_up:
+                    action()
+            if on_data is not None:
+                on_data(Slice(now, bars))
+            previous = now.date()
+
+
+def _first_method(obj, *names) -> Optional[Callable]:
+    for name in names:
+        if name in type(obj).__dict__ or any(name in cls.__dict__ for cls in type(obj).__mro__[:-2]):
+            return getattr(obj, name)
+    return None
+
+
+def _algorithm_imports() -> types.ModuleType:
+    module = types.ModuleType("AlgorithmImports")
+    exported = {
+        "QCAlgorithm": QCAlgorithm, "Resolution": Resolution, "DataNormalizationMode": DataNormalizationMode,
+        "Market": Market, "OrderStatus": OrderStatus, "OrderDirection": OrderDirection,
+        "SecurityType": SecurityType, "Symbol": Symbol, "Slice": Slice, "TradeBar": TradeBar,
+        "RollingWindow": RollingWindow, "SimpleMovingAverage": SimpleMovingAverage,
+        "ExponentialMovingAverage": ExponentialMovingAverage, "IndicatorDataPoint": IndicatorDataPoint,
+        "PortfolioTarget": PortfolioTarget, "datetime": datetime, "timedelta": timedelta, "date": date,
+        "time": dt_time, "np": np, "math": math,
+    }
+    for name in ["OrderEvent", "OrderType", "BrokerageName", "AccountType", "Chart", "Series", "SeriesType",
+                 "Color", "InsightDirection", "Insight", "QuoteBar", "Field", "MovingAverageType",
+                 "RelativeStrengthIndex", "BollingerBands", "AverageTrueRange", "Universe"]:
+        exported[name] = _Unsupported(name)
+    try:
+        import pandas as pd
+        exported["pd"] = pd
+    except ImportError:
+        pass
+    module.__dict__.update(exported)
+    module.__all__ = list(exported)
+    return module
+
+
+def _strategy_builtins(algorithm_imports: types.ModuleType) -> Dict[str, Any]:
+    """Builtins for the strategy namespace whose import serves the stub AlgorithmImports,
+    leaving sys.modules untouched so concurrent runs need no lock"""
+    def _import(name, globals=None, locals=None, fromlist=(), level=0):
+        if name == "AlgorithmImports" and level == 0:
+            return algorithm_imports
+        return builtins.__import__(name, globals, locals, fromlist, level)
+
+    namespace = dict(builtins.__dict__)
+    namespace["__import__"] = _import
+    return namespace
+
+
+def _get_process_context():
+    """forkserver (preloaded with this module, so each run forks in milliseconds) or spawn"""
+    global _process_context
+    with _process_context_lock:
+        if _process_context is None:
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                _process_context = multiprocessing.get_context("forkserver")
+                _process_context.set_forkserver_preload([__name__])
+            else:
+                _process_context = multiprocessing.get_context("spawn")
+        return _process_context
+
+
+def _run_in_child(connection, settings: Dict[str, Any], market_data_root: Optional[str],
+                  strategy_path: str, parameters: Optional[Dict[str, str]]) -> None:
+    market_data = None
+    if market_data_root is not None:
+        from .market_data import MarketDataCache
+        market_data = MarketDataCache(market_data_root)
+    try:
+        connection.send(SmokeBacktester(market_data=market_data, **settings).run_file(strategy_path, parameters))
+    finally:
+        connection.close()
+
+
+def _format_exception(exc: BaseException, filename: str) -> str:
+    """Format an exception keeping only the traceback frames inside the strategy file"""
+    frames = [frame for frame in traceback.extract_tb(exc.__traceback__) if frame.filename == filename]
+    lines = traceback.format_list(frames) + traceback.format_exception_only(type(exc), exc)
+    return "Traceback (most recent call last):\n" + "".join(lines).rstrip()
+
+
+class SmokeBacktester:
+    """
+    Tool that runs a strategy file against the stub API and synthetic bars, in-process
+    (``run_file``/``run_code``) or in a killable child process (``run_isolated``).
+
+    ``bars`` daily bars are simulated from the algorithm's start date (not its full date
+    range), preceded by ``history_bars`` of synthetic history for ``history`` calls.
+    If a MarketDataCache is given, symbols whose cached daily closes cover that window
+    replay the real closes instead (bar dates remain synthetic business days).
+    """
+
+    def __init__(self, bars: int = 300, history_bars: int = 300, seed: int = 0, market_data=None):
+        self.bars = bars
+        self.history_bars = history_bars
+        self.seed = seed
+        self.market_data = market_data
+
+    def run_file(self, strategy_path: str, parameters: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        with open(strategy_path, "r") as f:
+            code = f.read()
+        return self.run_code(code, filename=strategy_path, parameters=parameters)
+
+    def run_isolated(self, strategy_path: str, parameters: Optional[Dict[str, str]] = None,
+                     timeout: float = 30) -> Dict[str, Any]:
+        """
+        run_file in a child process, killed if it has not finished after timeout seconds.
+        Blocks until then. Returns run_code's dict plus 'timed_out'.
+        """
+        settings = {"bars": self.bars, "history_bars": self.history_bars, "seed": self.seed}
+        market_data_root = getattr(self.market_data, "root", None)
+        context = _get_process_context()
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_run_in_child, daemon=True,
+                                  args=(sender, settings, market_data_root, strategy_path, parameters))
+        started = time_module.perf_counter()
+        process.start()
+        sender.close()
+        try:
+            if receiver.poll(timeout):
+                result = receiver.recv()
+                result["timed_out"] = False
+                return result
+            return {"success": False, "errors": [f"Smoke test timed out after {timeout} seconds"], "warnings": [],
+                    "stats": {"duration_seconds": round(time_module.perf_counter() - started, 4)}, "timed_out": True}
+        except EOFError:
+            process.join(5)
+            return {"success": False, "errors": [f"Smoke test process exited with code {process.exitcode}"],
+                    "warnings": [], "stats": {}, "timed_out": False}
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.kill()
+            process.join()
+
+    def run_code(self, code: str, filename: str = "<strategy>", parameters: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        parameters: Lean project parameters returned by GetParameter/get_parameter.
+        Returns a dict with 'success', 'errors', 'warnings' and 'stats'
+        ('bars', 'orders', 'final_value', 'messages', 'duration_seconds').
+        """
+        started = time_module.perf_counter()
+        result = {"success": False, "errors": [], "warnings": [], "stats": {}}
+        engine = None
+        try:
+            namespace = {"__name__": "__smoke_test__", "__file__": filename,
+                         "__builtins__": _strategy_builtins(_algorithm_imports())}
+            exec(compile(code, filename, "exec"), namespace)
+
+            algorithm_classes = [
+                obj for obj in namespace.values()
+                if isinstance(obj, type) and issubclass(obj, QCAlgorithm) and obj is not QCAlgorithm
+            ]
+            if not algorithm_classes:
+                result["errors"].append("No QCAlgorithm subclass found in strategy code")
+                return result
+
+            algorithm = algorithm_classes[-1]()
+            engine = _Engine(algorithm, self.bars, self.history_bars, self.seed,
+                             market_data=self.market_data, parameters=parameters)
+            algorithm._engine = engine
+            algorithm.portfolio = algorithm.Portfolio = _Portfolio(engine)
+
+            initialize = _first_method(algorithm, "initialize", "Initialize")
+            if initialize is None:
+                result["errors"].append(f"{type(algorithm).__name__} does not define Initialize/initialize")
+                return result
+            initialize()
+            algorithm.portfolio.cash = algorithm._cash
+            if not engine.prices:
+                engine.warn("No securities were added in Initialize")
+
+            engine.run(_first_method(algorithm, "on_data", "OnData"), algorithm._warm_up)
+            on_end = _first_method(algorithm, "on_end_of_algorithm", "OnEndOfAlgorithm")
+            if on_end is not None:
+                on_end()
+            result["success"] = True
+        except SyntaxError as e:
+            result["errors"].append("".join(traceback.format_exception_only(type(e), e)).rstrip())
+        except Exception as e:
+            result["errors"].append(_format_exception(e, filename))
+        finally:
+            if engine is not None:
+                result["warnings"] = engine.warnings
+                result["stats"] = {
+                    "bars": engine.step + 1 if engine.dates else 0,
+                    "orders": engine.orders,
+                    "final_value": engine.algorithm.portfolio.total_portfolio_value,
+                    "messages": engine.messages,
+                }
+            result["stats"]["duration_seconds"] = round(time_module.perf_counter() - started, 4)
+        return result
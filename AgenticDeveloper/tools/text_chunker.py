@@ -0,0 +1,108 @@
+import re
+from typing import List
+
+# Numbered headings ("3 Data", "4.2 Results") or short all-caps headings ("ABSTRACT")
+SECTION_HEADING = re.compile(r"^\s*(?:\d+(?:\.\d+)*\.?\s+[A-Z][^\n]{0,80}|[A-Z][A-Z0-9 \-:]{3,60})\s*$")
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n|\f")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+class TextChunker:
+    """Tool for packing long documents into LLM-sized chunks.
+
+    Text is split on paragraph boundaries (blank lines and page breaks) and packed
+    greedily up to ``max_tokens``. A new chunk is started at section headings once the
+    current chunk is at least half full, paragraphs that do not fit on their own are
+    split by sentence, and the last ``overlap_tokens`` worth of paragraphs/sentences is
+    repeated at the start of the next chunk. Token counts are estimated from character
+    length (``chars_per_token``).
+    """
+
+    def __init__(self, max_tokens: int = 2000, overlap_tokens: int = 0, chars_per_token: float = 4.0):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+        self.chars_per_token = chars_per_token
+
+    def estimate_tokens(self, text: str) -> int:
+        return int(len(text) / self.chars_per_token) + 1
+
+    def chunk(self, text: str) -> List[str]:
+        chunks = []
+        current: List[str] = []
+        current_tokens = 0
+
+        for piece, is_heading in self._pieces(text):
+            tokens = self.estimate_tokens(piece)
+            section_break = is_heading and current_tokens >= self.max_tokens // 2
+            if current and (section_break or current_tokens + tokens > self.max_tokens):
+                chunks.append("\n\n".join(current))
+                current = [] if section_break else self._overlap(current)
+                current_tokens = sum(self.estimate_tokens(p) for p in current)
+                if current_tokens + tokens > self.max_tokens:
+                    current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += tokens
+
+        if current:
+            chunks.append("\n\n".join(current))
+        return chunks
+
+    def _pieces(self, text: str):
+        """Yield (piece, starts_section) pairs, each piece fitting within max_tokens"""
+        for paragraph in PARAGRAPH_BREAK.split(text):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            is_heading = bool(SECTION_HEADING.match(paragraph.split("\n", 1)[0]))
+            if self.estimate_tokens(paragraph) <= self.max_tokens:
+                yield paragraph, is_heading
+                continue
+            for piece in self._split_oversized(paragraph):
+                yield piece, is_heading
+                is_heading = False
+
+    def _split_oversized(self, paragraph: str) -> List[str]:
+        max_chars = int(self.max_tokens * self.chars_per_token) - 1
+        pieces = []
+        current = ""
+        for sentence in SENTENCE_END.split(paragraph):
+            while len(sentence) > max_chars:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.append(sentence[:max_chars])
+                sentence = sentence[max_chars:]
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                pieces.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            pieces.append(current)
+        return pieces
+
+    def _overlap(self, pieces: List[str]) -> List[str]:
+        overlap = []
+        tokens = 0
+        for piece in reversed(pieces):
+            piece_tokens = self.estimate_tokens(piece)
+            if tokens + piece_tokens > self.overlap_tokens:
+                if not overlap:
+                    tail = self._tail_sentences(piece)
+                    if tail:
+                        overlap.insert(0, tail)
+                break
+            overlap.insert(0, piece)
+            tokens += piece_tokens
+        return overlap
+
+    def _tail_sentences(self, piece: str) -> str:
+        tail = ""
+        for sentence in reversed(SENTENCE_END.split(piece)):
+            candidate = f"{sentence} {tail}" if tail else sentence
+            if self.estimate_tokens(candidate) > self.overlap_tokens:
+                break
+            tail = candidate
+        return tail
@@ -0,0 +1,180 @@
+"""
+Vectorized NumPy backtester for screening simple signal strategies.
+
+Whole parameter grids are evaluated at once as array operations over a close-price
+matrix, so hundreds of variants of a strategy can be ranked in milliseconds before the
+best ones are sent to Lean. It models the same rules as our Lean strategies (long/flat
+positions entered and exited on the daily close) but not fills, slippage or sizing
+beyond a fixed weight per symbol, so results are for ranking, not reporting.
+
+Positions decided on bar t are held over bar t + 1; there is no lookahead.
+"""
+import itertools
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+METRICS = ["total_return", "cagr", "volatility", "sharpe", "sortino", "max_drawdown", "turnover", "trades"]
+# Metrics where a smaller value ranks higher
+LOWER_IS_BETTER = {"volatility", "max_drawdown", "turnover"}
+
+
+class ScreenResult:
+    """Metrics for every parameter set of a screen; ``metrics[name][k]`` belongs to ``params[k]``"""
+
+    def __init__(self, params: List[Dict[str, Any]], metrics: Dict[str, np.ndarray], returns: np.ndarray):
+        self.params = params
+        self.metrics = metrics
+        self.returns = returns
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    def records(self) -> List[Dict[str, Any]]:
+        return [
+            {**params, **{name: float(values[k]) for name, values in self.metrics.items()}}
+            for k, params in enumerate(self.params)
+        ]
+
+    def top(self, n: int = 10, by: str = "sharpe", ascending: bool = False) -> List[Dict[str, Any]]:
+        """The n best parameter sets by the given metric (NaN metrics sort last)"""
+        values = np.nan_to_num(self.metrics[by], nan=np.inf if ascending else -np.inf)
+        order = np.argsort(values if ascending else -values, kind="stable")[:n]
+        records = self.records()
+        return [records[k] for k in order]
+
+
+def _hold_states(enter: np.ndarray, exit_: np.ndarray) -> np.ndarray:
+    """
+    Long/flat states (1.0/0.0) from entry and exit conditions along the time axis (axis 1):
+    enter goes long, exit goes flat, otherwise the previous state is held.
+    """
+    changed = enter | exit_
+    time_index = np.arange(enter.shape[1]).reshape((1, -1) + (1,) * (enter.ndim - 2))
+    last_change = np.maximum.accumulate(np.where(changed, time_index, -1), axis=1)
+    states = np.take_along_axis(enter, np.maximum(last_change, 0), axis=1)
+    return np.where(last_change >= 0, states, False).astype(float)
+
+
+def rolling_mean(closes: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average along axis 0; the first period - 1 values are NaN"""
+    result = np.full(closes.shape, np.nan)
+    if period > closes.shape[0]:
+        return result
+    cumsum = np.cumsum(np.insert(closes, 0, 0.0, axis=0), axis=0)
+    result[period - 1:] = (cumsum[period:] - cumsum[:-period]) / period
+    return result
+
+
+class VectorBacktester:
+    """
+    Tool that screens parameter grids of long/flat strategies over a close-price matrix.
+
+    ``closes`` is a (T,) array for one symbol or a (T, N) array / DataFrame for N symbols,
+    each traded independently with ``weight`` of the portfolio (e.g. 0.33 in
+    testSMAStrategy). ``fee_rate`` is charged on traded notional as a fraction of equity.
+    """
+
+    def __init__(self, periods_per_year: int = 252, fee_rate: float = 0.0, risk_free_rate: float = 0.0):
+        self.periods_per_year = periods_per_year
+        self.fee_rate = fee_rate
+        self.risk_free_rate = risk_free_rate
+
+    @staticmethod
+    def _as_matrix(closes) -> np.ndarray:
+        closes = np.asarray(getattr(closes, "values", closes), dtype=float)
+        if closes.ndim == 1:
+            closes = closes[:, None]
+        if closes.ndim != 2 or closes.shape[0] < 2:
+            raise ValueError("closes must be a (T,) or (T, N) array with at least two bars")
+        return closes
+
+    def sma_crossover(self, closes, fast_periods: Iterable[int], slow_periods: Iterable[int],
+                      weight: float = 1.0) -> ScreenResult:
+        """
+        Long while the fast SMA is above the slow SMA, flat once it is below
+        (testSMAStrategy). Pairs with fast >= slow are skipped.
+        """
+        closes = self._as_matrix(closes)
+        params = [
+            {"fast": int(fast), "slow": int(slow)}
+            for fast, slow in itertools.product(sorted(set(fast_periods)), sorted(set(slow_periods)))
+            if fast < slow
+        ]
+        if not params:
+            raise ValueError("No parameter sets with fast < slow")
+        # Each distinct period is computed once and shared across the grid
+        smas = {p: rolling_mean(closes, p) for p in {v for ps in params for v in ps.values()}}
+        fast = np.stack([smas[p["fast"]] for p in params])
+        slow = np.stack([smas[p["slow"]] for p in params])
+        with np.errstate(invalid="ignore"):
+            positions = _hold_states(fast > slow, fast < slow)
+        return self.evaluate(closes, positions * weight, params)
+
+    def momentum(self, closes, lookbacks: Iterable[int], thresholds: Iterable[float],
+                 tolerance: float = 0.0, weight: float = 1.0) -> ScreenResult:
+        """
+        Long once the lookback-bar return exceeds threshold * (1 + tolerance), flat once it
+        falls below threshold * (1 - tolerance) (FirstAutoStrategy/strategy_v1_0_1.py).
+        """
+        closes = self._as_matrix(closes)
+        lookbacks = sorted(set(int(n) for n in lookbacks))
+        thresholds = sorted(set(float(t) for t in thresholds))
+        params = [{"lookback": n, "threshold": t} for n, t in itertools.product(lookbacks, thresholds)]
+
+        returns = {}
+        for n in lookbacks:
+            ret = np.full(closes.shape, np.nan)
+            if n < closes.shape[0]:
+                ret[n:] = closes[n:] / closes[:-n] - 1
+            returns[n] = ret
+        momentum = np.stack([returns[p["lookback"]] for p in params])
+        threshold = np.array([p["threshold"] for p in params]).reshape(-1, 1, 1)
+        with np.errstate(invalid="ignore"):
+            positions = _hold_states(momentum > threshold * (1 + tolerance), momentum < threshold * (1 - tolerance))
+        return self.evaluate(closes, positions * weight, params)
+
+    def evaluate(self, closes, positions: np.ndarray, params: Optional[Sequence[Dict[str, Any]]] = None) -> ScreenResult:
+        """
+        Score arbitrary target weights. ``positions`` has shape (K, T, N) (or (K, T) for one
+        symbol); positions[k, t] is the weight held from the close of bar t to bar t + 1.
+        """
+        closes = self._as_matrix(closes)
+        positions = np.nan_to_num(np.asarray(positions, dtype=float))
+        if positions.ndim == 2:
+            positions = positions[:, :, None]
+        if positions.shape[1:] != closes.shape:
+            raise ValueError(f"positions shape {positions.shape} does not match closes {closes.shape}")
+        params = list(params) if params is not None else [{"index": k} for k in range(positions.shape[0])]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            asset_returns = np.nan_to_num(closes[1:] / closes[:-1] - 1)
+        held = positions[:, :-1]
+        trades = np.abs(np.diff(positions, axis=1, prepend=0.0))[:, :-1]
+        returns = (held * asset_returns).sum(axis=2) - self.fee_rate * trades.sum(axis=2)
+        return ScreenResult(params, self._metrics(returns, trades), returns)
+
+    def _metrics(self, returns: np.ndarray, trades: np.ndarray) -> Dict[str, np.ndarray]:
+        periods = returns.shape[1]
+        years = periods / self.periods_per_year
+        equity = np.cumprod(1 + returns, axis=1)
+        excess = returns - self.risk_free_rate / self.periods_per_year
+        mean = excess.mean(axis=1)
+        std = returns.std(axis=1)
+        downside = np.sqrt((np.minimum(excess, 0) ** 2).mean(axis=1))
+        scale = np.sqrt(self.periods_per_year)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std > 0, mean / std * scale, 0.0)
+            sortino = np.where(downside > 0, mean / downside * scale, 0.0)
+            drawdown = 1 - equity / np.maximum.accumulate(np.maximum(equity, 1.0), axis=1)
+        return {
+            "total_return": equity[:, -1] - 1,
+            "cagr": np.sign(equity[:, -1]) * np.abs(equity[:, -1]) ** (1 / years) - 1,
+            "volatility": std * scale,
+            "sharpe": sharpe,
+            "sortino": sortino,
+            "max_drawdown": drawdown.max(axis=1),
+            # Annualized traded notional as a fraction of equity
+            "turnover": trades.sum(axis=(1, 2)) / years,
+            "trades": np.count_nonzero(trades, axis=(1, 2)).astype(float),
+        }
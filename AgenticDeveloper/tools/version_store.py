@@ -0,0 +1,189 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+LOG_NAME = "version_history.jsonl"
+LEGACY_NAME = "version_history.json"
+RESPONSES_DIR = ".responses"
+
+_stores: Dict[str, "VersionStore"] = {}
+_stores_lock = threading.Lock()
+
+
+def _parse_version(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in version.split("_"))
+
+
+class VersionStore:
+    """Append-only history of the strategy versions in a strategy folder.
+
+    Each saved version is written as ``strategy_v<major>_<minor>_<patch>.py`` and one JSON
+    line is appended to ``version_history.jsonl``. LLM responses are not stored inline: they
+    are gzip-compressed under ``.responses/<sha256>.gz`` and entries refer to them by hash,
+    so identical responses are stored once. The log is read once when the store is opened,
+    after which the next version number and lookups by version are O(1).
+
+    If the log does not exist yet but ``version_history.json`` does, its entries are
+    imported (moving their ``llm_full_response`` out of line). ``export_json`` writes that
+    file back, without the responses, for readers of the old format.
+    """
+
+    def __init__(self, strategy_dir: str):
+        self.strategy_dir = strategy_dir
+        self.log_path = os.path.join(strategy_dir, LOG_NAME)
+        self.responses_dir = os.path.join(strategy_dir, RESPONSES_DIR)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._latest: Optional[Tuple[int, ...]] = None
+        self._lock = threading.Lock()
+
+        os.makedirs(strategy_dir, exist_ok=True)
+        legacy_path = os.path.join(strategy_dir, LEGACY_NAME)
+        if os.path.exists(self.log_path):
+            self._load()
+        elif os.path.exists(legacy_path):
+            self._import_legacy(legacy_path)
+        # Version files saved outside the store still count when numbering new versions
+        for name in os.listdir(strategy_dir):
+            if name.startswith("strategy_v") and name.endswith(".py"):
+                try:
+                    self._track(_parse_version(name[len("strategy_v"):-3]))
+                except ValueError:
+                    continue
+
+    def _load(self) -> None:
+        with open(self.log_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Tolerate a torn final line from an interrupted write
+                    continue
+                self._index(entry)
+
+    def _import_legacy(self, legacy_path: str) -> None:
+        try:
+            with open(legacy_path, "r") as f:
+                legacy = json.load(f)
+        except json.JSONDecodeError:
+            legacy = []
+        entries = []
+        for entry in legacy:
+            entry = dict(entry)
+            response = entry.pop("llm_full_response", None)
+            entry["response"] = self.put_response(response) if response else entry.get("response")
+            entries.append(entry)
+        self._append(entries)
+
+    def _index(self, entry: Dict[str, Any]) -> None:
+        self._entries[entry["version"]] = entry
+        self._track(_parse_version(entry["version"]))
+
+    def _track(self, version: Tuple[int, ...]) -> None:
+        if self._latest is None or version > self._latest:
+            self._latest = version
+
+    def _append(self, entries: List[Dict[str, Any]]) -> None:
+        if not entries:
+            return
+        with open(self.log_path, "a") as f:
+            f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+        for entry in entries:
+            self._index(entry)
+
+    def next_version(self) -> str:
+        """The version number the next add() will use: the latest one with its patch number incremented"""
+        if self._latest is None:
+            return "1_0_0"
+        major, minor, patch = self._latest
+        return f"{major}_{minor}_{patch + 1}"
+
+    def put_response(self, text: str) -> str:
+        """Store an LLM response (once per distinct content) and return its hash"""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        path = os.path.join(self.responses_dir, f"{digest}.gz")
+        if not os.path.exists(path):
+            os.makedirs(self.responses_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        return digest
+
+    def add(self, code: str, description: str = "Generated by StrategyDeveloperAgent",
+            llm_response: Optional[str] = None, **metadata: Any) -> Dict[str, Any]:
+        """Write the code as the next version and record it. Returns the new entry (with its 'path')."""
+        response = self.put_response(llm_response) if llm_response else None
+        with self._lock:
+            while True:
+                version = self.next_version()
+                filename = f"strategy_v{version}.py"
+                try:
+                    # "x": never overwrite a version file saved outside the store since it was opened
+                    with open(os.path.join(self.strategy_dir, filename), "x") as f:
+                        f.write(code)
+                    break
+                except FileExistsError:
+                    self._track(_parse_version(version))
+            entry = {
+                "version": version,
+                "file": filename,
+                "timestamp": datetime.now().isoformat(),
+                "description": description,
+                "response": response,
+                **metadata,
+            }
+            self._append([entry])
+        return {**entry, "path": os.path.join(self.strategy_dir, filename)}
+
+    def get(self, version: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(version)
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        if self._latest is None:
+            return None
+        return self._entries.get("_".join(str(part) for part in self._latest))
+
+    def response(self, version: str) -> Optional[str]:
+        """The full LLM response a version was extracted from, if one was stored"""
+        entry = self._entries.get(version)
+        if not entry or not entry.get("response"):
+            return None
+        with gzip.open(os.path.join(self.responses_dir, f"{entry['response']}.gz"), "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """All entries, oldest version first"""
+        return sorted(self._entries.values(), key=lambda entry: _parse_version(entry["version"]))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, version: str) -> bool:
+        return version in self._entries
+
+    def export_json(self, path: Optional[str] = None) -> str:
+        """Atomically write all entries as a ``version_history.json`` list (responses stay out of line)"""
+        path = path or os.path.join(self.strategy_dir, LEGACY_NAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries(), f, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+
+def get_version_store(strategy_dir: str) -> VersionStore:
+    """Return the process-wide ``VersionStore`` for a strategy folder, so concurrent saves share one counter"""
+    path = os.path.abspath(strategy_dir)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = VersionStore(path)
+            _stores[path] = store
+        return store
@@ -1,7 +1,12 @@
 import aiohttp
 import asyncio
+import atexit
+import glob
+import hashlib
+import json
 import os
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 import fitz  # PyMuPDF
@@ -30,8 +35,66 @@ class ArxivSearchTool:
             })
         return results
 
-class PDFHandler:
-    """Tool for downloading PDFs and extracting their text."""
+class HTTPTool:
+    """Base for tools that share one pooled aiohttp session for their lifetime.
+
+    The session is created on first use and reused for every request; call
+    ``close`` (or use the tool as an async context manager) when done.
+    """
+
+    def __init__(self, max_connections: int = 10, max_connections_per_host: int = 4, timeout: int = 60):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session_loop = loop
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.max_connections_per_host
+                ),
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout)
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+class PDFHandler(HTTPTool):
+    """Tool for downloading PDFs and extracting their text.
+
+    Downloads are streamed to a ``.part`` file in chunks and resumed with an HTTP
+    Range request if interrupted, provided the server gave an ETag to check that the
+    file has not changed (otherwise the download restarts). The server's ETag and size
+    are recorded in a ``.meta.json`` file next to the PDF so an unchanged paper is never
+    re-downloaded.
+
+    Text extraction splits the document into page ranges parsed in parallel in a
+    shared process pool, and caches the result next to the PDF keyed by file hash.
+    The pool is shut down by ``close`` (a later extraction starts a new one) and at exit.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    MIN_PAGES_PER_WORKER = 4
+    _extract_pool: Optional[ProcessPoolExecutor] = None
+
+    def __init__(self, extract_workers: Optional[int] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.extract_workers = extract_workers or os.cpu_count() or 1
 
     async def download_pdf(self, url: str, save_dir: str) -> Optional[str]:
         # Override save_dir to always use research_papers folder
@@ -42,36 +105,192 @@ class PDFHandler:
         if not filename_base.endswith(".pdf"):
             filename_base += ".pdf"
         save_path = os.path.join(save_dir, filename_base)
+        part_path = save_path + ".part"
+        meta_path = save_path + ".meta.json"
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as resp:
-                    if resp.status == 200:
-                        with open(save_path, "wb") as f:
-                            f.write(await resp.read())
+            session = await self._get_session()
+            meta = self._read_meta(meta_path)
+
+            if os.path.exists(save_path):
+                async with session.head(url, allow_redirects=True) as resp:
+                    if resp.status == 200 and self._is_current(save_path, meta, resp.headers):
                         return save_path
+
+            for _ in range(2):
+                offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+                if offset and not meta.get("etag"):
+                    # Without an ETag a file that changed on the server could be appended to the old part
+                    os.remove(part_path)
+                    offset = 0
+                headers = {"Range": f"bytes={offset}-", "If-Range": meta["etag"]} if offset else {}
+
+                async with session.get(url, headers=headers) as resp:
+                    if resp.status == 416:
+                        # The part may already be complete (interrupted before it was renamed)
+                        if self._part_is_complete(offset, meta, resp.headers):
+                            etag = meta["etag"]
+                            break
+                        os.remove(part_path)
+                        continue
+                    if resp.status not in (200, 206):
+                        return None
+                    etag = resp.headers.get("ETag") or (meta.get("etag") if resp.status == 206 else None)
+                    meta = {"url": url, "etag": etag, "size": None}
+                    self._write_meta(meta_path, meta)
+                    mode = "ab" if resp.status == 206 else "wb"
+                    with open(part_path, mode) as f:
+                        async for chunk in resp.content.iter_chunked(self.CHUNK_SIZE):
+                            f.write(chunk)
+                    break
+            else:
+                return None
+
+            os.replace(part_path, save_path)
+            self._write_meta(meta_path, {"url": url, "etag": etag, "size": os.path.getsize(save_path)})
+            return save_path
         except Exception as e:
             print(f"Error downloading PDF: {e}")
         return None
 
+    @staticmethod
+    def _part_is_complete(offset: int, meta: Dict, headers) -> bool:
+        """True if a 416 response says the server's file is exactly the part already downloaded"""
+        etag = headers.get("ETag")
+        if etag and etag != meta.get("etag"):
+            return False
+        total = headers.get("Content-Range", "").rpartition("/")[2]
+        return total.isdigit() and int(total) == offset
+
+    @staticmethod
+    def _is_current(save_path: str, meta: Dict, headers) -> bool:
+        """True if the local file matches the server's ETag, or failing that its size"""
+        etag = headers.get("ETag")
+        if etag and meta.get("etag"):
+            return etag == meta["etag"]
+        length = headers.get("Content-Length")
+        return length is not None and int(length) == os.path.getsize(save_path)
+
+    @staticmethod
+    def _read_meta(meta_path: str) -> Dict:
+        try:
+            with open(meta_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def _write_meta(meta_path: str, meta: Dict):
+        with open(meta_path, "w") as f:
+            json.dump(meta, f)
+
     def extract_text(self, file_path: str) -> str:
-        text = ""
+        """Extract text from a PDF, reusing the cached text when the file is unchanged"""
         try:
-            doc = fitz.open(file_path)
-            for page in doc:
-                text += page.get_text()
+            cached, cache_path = self._read_text_cache(file_path)
+            if cached is not None:
+                return cached
+            ranges = self._page_ranges(file_path)
+            if len(ranges) == 1:
+                text = _extract_page_range(file_path, *ranges[0])
+            else:
+                parts = self._get_extract_pool().map(_extract_page_range, *zip(*[(file_path, a, b) for a, b in ranges]))
+                text = "".join(parts)
+            self._write_text_cache(file_path, cache_path, text)
+            return text
         except Exception as e:
             print(f"Error extracting PDF text: {e}")
-        return text
+        return ""
+
+    async def aextract_text(self, file_path: str) -> str:
+        """Async variant of ``extract_text`` that keeps parsing off the event loop.
+
+        Page ranges are parsed in parallel in a shared process pool.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            cached, cache_path = await loop.run_in_executor(None, self._read_text_cache, file_path)
+            if cached is not None:
+                return cached
+            ranges = await loop.run_in_executor(None, self._page_ranges, file_path)
+            pool = self._get_extract_pool()
+            parts = await asyncio.gather(*(
+                loop.run_in_executor(pool, _extract_page_range, file_path, start, stop)
+                for start, stop in ranges
+            ))
+            text = "".join(parts)
+            await loop.run_in_executor(None, self._write_text_cache, file_path, cache_path, text)
+            return text
+        except Exception as e:
+            print(f"Error extracting PDF text: {e}")
+        return ""
+
+    def _page_ranges(self, file_path: str) -> List[tuple]:
+        """Split the document into at most ``extract_workers`` contiguous page ranges"""
+        with fitz.open(file_path) as doc:
+            page_count = doc.page_count
+        workers = max(1, min(self.extract_workers, page_count // self.MIN_PAGES_PER_WORKER))
+        step = -(-page_count // workers) if page_count else 1
+        return [(start, min(start + step, page_count)) for start in range(0, max(page_count, 1), step)]
+
+    @classmethod
+    def _get_extract_pool(cls) -> ProcessPoolExecutor:
+        if cls._extract_pool is None:
+            cls._extract_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        return cls._extract_pool
+
+    @classmethod
+    def shutdown_extract_pool(cls):
+        """Stop the shared extraction workers; extractions already running still finish"""
+        pool, cls._extract_pool = cls._extract_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    async def close(self):
+        await super().close()
+        self.shutdown_extract_pool()
+
+    @staticmethod
+    def _read_text_cache(file_path: str) -> tuple:
+        """Return (cached_text or None, cache_path) for the file's current content hash"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        cache_path = f"{file_path}.{digest.hexdigest()[:16]}.txt"
+        if os.path.exists(cache_path):
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return f.read(), cache_path
+        return None, cache_path
+
+    @staticmethod
+    def _write_text_cache(file_path: str, cache_path: str, text: str):
+        # Drop caches for earlier versions of the file
+        for stale in glob.glob(glob.escape(file_path) + ".*.txt"):
+            os.remove(stale)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, cache_path)
+
+
+atexit.register(PDFHandler.shutdown_extract_pool)
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> str:
+    """Extract text from pages [start, stop); module-level so it can run in a process pool"""
+    with fitz.open(file_path) as doc:
+        return "".join(doc[i].get_text() for i in range(start, stop))
+
 
-class HTMLHandler:
+class HTMLHandler(HTTPTool):
     """Tool for downloading HTML pages and extracting their text."""
 
     async def download_html(self, url: str) -> Optional[str]:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as resp:
-                    if resp.status == 200:
-                        return await resp.text()
+            session = await self._get_session()
+            async with session.get(url) as resp:
+                if resp.status == 200:
+                    return await resp.text()
         except Exception as e:
             print(f"Error downloading HTML: {e}")
         return None